@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from claw_demo.agent.planner import FileDigestPlan, plan_workflow, tool_subset
+from claw_demo.agent.turns import AssistantTurn, StreamState, TurnAssembler, parse_tool_args, turn_from_message
+from claw_demo.agent.workflow_runner import WorkflowRunResult, _WorkflowRunnerBase
+from claw_demo.config.schema import Config
+from claw_demo.llm.resilience import Deadline
+from claw_demo.skills.async_toolbox import AsyncToolExecutor
+from claw_demo.skills.models import SkillContext
+from claw_demo.skills.tool_cache import ToolResultCache
+from claw_demo.skills.toolbox import ToolCallOutcome
+
+
+class AsyncWorkflowAgentRunner(_WorkflowRunnerBase):
+    def __init__(self, config: Config, project_root: Path, tool_cache: ToolResultCache | None = None) -> None:
+        super().__init__(config, project_root, tool_cache)
+        self.tool_executor = AsyncToolExecutor(
+            max_workers=config.skills.max_parallel_tools,
+            tool_concurrency=config.skills.tool_concurrency,
+            result_cache=self.tool_cache,
+        )
+        self._client: Any | None = None
+
+    async def run(
+        self,
+        user_input: str,
+        recent_messages: list[dict[str, str]] | None = None,
+        memory_snippets: list[str] | None = None,
+        stream_writer: Callable[[str], None] | None = None,
+    ) -> WorkflowRunResult:
+        required_tools = self._required_tools(user_input)
+        called_tools_set: set[str] = set()
+        trace_lines: list[str] = []
+        stream = StreamState(stream_writer, time.perf_counter())
+        deadline = Deadline.after(self.config.skills.timeout_sec)
+        ctx = SkillContext(config=self.config, project_root=self.project_root, workspace_root=self.workspace_root)
+        steps = self._run_steps(
+            user_input,
+            recent_messages,
+            memory_snippets,
+            required_tools,
+            called_tools_set,
+            trace_lines,
+            stream,
+            ctx,
+            deadline,
+        )
+        try:
+            # Cancelling the coroutine cancels its in-flight request and tool tasks; the trace
+            # collected so far is kept for the partial result.
+            return await asyncio.wait_for(steps, timeout=deadline.remaining())
+        except asyncio.TimeoutError:
+            return self._deadline_result(deadline, called_tools_set, trace_lines, stream)
+
+    async def _run_steps(
+        self,
+        user_input: str,
+        recent_messages: list[dict[str, str]] | None,
+        memory_snippets: list[str] | None,
+        required_tools: list[str],
+        called_tools_set: set[str],
+        trace_lines: list[str],
+        stream: StreamState,
+        ctx: SkillContext,
+        deadline: Deadline,
+    ) -> WorkflowRunResult:
+        direct_call = self._direct_call(user_input, required_tools)
+        outcome = (await self.tool_executor.execute_many([direct_call], ctx))[0] if direct_call is not None else None
+        direct = self._direct_answer(outcome, trace_lines, stream)
+        if direct is not None:
+            return direct
+
+        if not self._route.api_key and self._client is None:
+            return WorkflowRunResult(
+                ok=False,
+                text="LLM 不可用，无法执行工作流任务。请配置 llm.api_key。",
+                tool_trace=[],
+            )
+
+        messages = self._initial_messages(user_input, recent_messages, memory_snippets)
+
+        plan = plan_workflow(user_input, required_tools) if self.config.skills.fast_path else None
+        if plan is not None:
+            await self._run_plan(plan, ctx, messages, called_tools_set, trace_lines)
+
+        tools = self._tool_schemas(tool_subset(user_input, required_tools))
+        max_steps = max(2, int(self.config.skills.max_steps))
+        for _ in range(max_steps):
+            can_finish = all(name in called_tools_set for name in required_tools)
+            self._fit_context(messages, stream, tools)
+            try:
+                turn = await self._create_completion(messages, tools, stream if can_finish else None, deadline)
+            except Exception as exc:
+                if deadline.expired:
+                    return self._deadline_result(deadline, called_tools_set, trace_lines, stream)
+                trace_lines.append(f"llm-error: {exc}")
+                return self._finish(False, f"LLM 调用失败: {exc}", trace_lines, stream)
+
+            if turn.tool_calls:
+                outcomes = await self.tool_executor.execute_many(
+                    [(tc.name, parse_tool_args(tc.arguments)) for tc in turn.tool_calls],
+                    ctx,
+                )
+                self._record_tool_step(turn, outcomes, messages, called_tools_set, trace_lines)
+                continue
+
+            answer = turn.content.strip()
+            if answer:
+                if self._accept_answer(answer, required_tools, called_tools_set, messages, trace_lines):
+                    return self._finish(True, answer, trace_lines, stream)
+                tools = self._tool_schemas([])
+                continue
+
+            messages.append({"role": "user", "content": "请继续执行并给出最终答复。"})
+
+        return self._finish(False, "工作流执行超出最大步骤，请重试或拆分任务。", trace_lines, stream)
+
+    async def _run_plan(
+        self,
+        plan: FileDigestPlan,
+        ctx: SkillContext,
+        messages: list[dict[str, Any]],
+        called_tools_set: set[str],
+        trace_lines: list[str],
+    ) -> None:
+        outcomes: list[ToolCallOutcome] = []
+        while (turn := self._plan_turn(plan, outcomes)) is not None:
+            tc = turn.tool_calls[0]
+            outcomes.extend(await self.tool_executor.execute_many([(tc.name, parse_tool_args(tc.arguments))], ctx))
+            self._record_tool_step(turn, outcomes[-1:], messages, called_tools_set, trace_lines)
+        trace_lines.append(f"fast-path: {plan.name} {len(outcomes)}/{len(plan.tools)} steps")
+
+    async def _create_completion(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]],
+        stream: StreamState | None = None,
+        deadline: Deadline | None = None,
+    ) -> AssistantTurn:
+        route = self.router.select("workflow")
+        if self._client is not None and route.name == self._route.name:
+            client = self._client
+        else:
+            # AsyncOpenAI clients are pooled per event loop, so they are looked up on each call.
+            client = self.router.async_client(route)
+        key, turn = self._cache_lookup(route, messages, tools, stream)
+        if turn is not None:
+            return turn
+
+        kwargs = self._completion_kwargs(messages, tools)
+        if stream is not None and stream.writer is not None:
+            assembler = TurnAssembler(stream)
+            async for chunk in await self.router.acomplete(route, client, deadline, stream=True, **kwargs):
+                assembler.feed(chunk)
+            turn = assembler.turn()
+        else:
+            response = await self.router.acomplete(route, client, deadline, **kwargs)
+            turn = turn_from_message(response.choices[0].message)
+        self._cache_store(key, turn)
+        return turn
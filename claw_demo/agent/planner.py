@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from pathlib import PurePosixPath
+from typing import Any
+
+from claw_demo.skills.toolbox import ToolCallOutcome
+
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+", re.ASCII)
+_FILENAME_RE = re.compile(r"[\w.\-/]*[\w\-]\.[A-Za-z0-9]{1,8}\b", re.ASCII)
+_SEARCH_TARGET_RE = re.compile(r"(?:搜索|查找|找)(?:到|一下)?\s*(\S+?)\s*文件")
+_SCORE_SUFFIX_RE = re.compile(r"\s+\(score -?\d+\)$")
+_NO_MATCH_TEXT = "未找到匹配文件"
+
+COMPOUND_FILE_EMAIL = ("file_search", "file_read", "summarize", "email")
+
+
+# search -> read -> summarize -> email, each step fed by the previous tool result.
+@dataclass
+class FileDigestPlan:
+    query: str
+    recipient: str
+    name: str = "file-digest"
+    tools: tuple[str, ...] = COMPOUND_FILE_EMAIL
+    _path: str = field(default="", init=False)
+
+    def next_call(self, outcomes: list[ToolCallOutcome]) -> tuple[str, dict[str, Any]] | None:
+        if outcomes and not outcomes[-1].result.ok:
+            return None
+        step = len(outcomes)
+        if step == 0:
+            return "file_search", {"query": self.query, "path": "./"}
+        if step == 1:
+            self._path = self._pick_match(outcomes[0].result.text)
+            return ("file_read", {"path": self._path}) if self._path else None
+        if step == 2:
+            return "summarize", {"text": outcomes[1].result.text}
+        if step == 3:
+            subject = f"{PurePosixPath(self._path).name} 摘要"
+            return "email", {"to": self.recipient, "subject": subject, "body": outcomes[2].result.text}
+        return None
+
+    def _pick_match(self, search_text: str) -> str:
+        lines = [_SCORE_SUFFIX_RE.sub("", ln.strip()) for ln in search_text.splitlines() if ln.strip()]
+        if not lines or lines[0] == _NO_MATCH_TEXT:
+            return ""
+        # The plan ends in an email that cannot be taken back, so it only goes on with a file the
+        # request clearly names; a fuzzy near-miss is left to the model-driven loop.
+        query = self.query.lower()
+        names = [PurePosixPath(line).name.lower() for line in lines]
+        for line, name in zip(lines, names):
+            if query in (name, PurePosixPath(name).stem):
+                return line
+        partial = [line for line, name in zip(lines, names) if query in name]
+        return partial[0] if len(partial) == 1 else ""
+
+
+def _search_query(user_input: str) -> str:
+    rest = _EMAIL_RE.sub(" ", user_input)
+    target = _FILENAME_RE.search(rest) or _SEARCH_TARGET_RE.search(rest)
+    if target is None:
+        return ""
+    return target.group(target.lastindex or 0).strip("，,。.：: ")
+
+
+def plan_workflow(user_input: str, required_tools: list[str]) -> FileDigestPlan | None:
+    # Only intents whose arguments can all be read off the request are compiled;
+    # anything else goes through the model-driven loop unchanged.
+    if tuple(required_tools) != COMPOUND_FILE_EMAIL:
+        return None
+    email = _EMAIL_RE.search(user_input)
+    if email is None:
+        return None
+    query = _search_query(user_input)
+    if not query:
+        return None
+    return FileDigestPlan(query=query, recipient=email.group(0))
+
+
+_DIRECT_MAX_CHARS = 32
+_SECOND_ASK_RE = re.compile(r"[，,；;]|然后|顺便|并且|另外|再帮|\band\b|\balso\b", re.IGNORECASE)
+# The hints behind required_tools are plain substrings ("时间", "time"), so a direct answer
+# also needs the request itself to read as a time or weather question.
+_TIME_INTENT_RE = re.compile(
+    r"几点(?:了|钟)?\s*[?？!！。.]*$|(?:现在|当前|目前)(?:的)?时间|what time|current time|time is it",
+    re.IGNORECASE,
+)
+_WEATHER_INTENT_RE = re.compile(r"天气|\bweather\b", re.IGNORECASE)
+_FORECAST_WORDS = ("明天", "后天", "下周", "未来", "预报", "tomorrow", "forecast")
+_TIMEZONE_ALIASES = {
+    "北京": "Asia/Shanghai",
+    "上海": "Asia/Shanghai",
+    "中国": "Asia/Shanghai",
+    "香港": "Asia/Hong_Kong",
+    "东京": "Asia/Tokyo",
+    "日本": "Asia/Tokyo",
+    "首尔": "Asia/Seoul",
+    "新加坡": "Asia/Singapore",
+    "伦敦": "Europe/London",
+    "巴黎": "Europe/Paris",
+    "纽约": "America/New_York",
+    "洛杉矶": "America/Los_Angeles",
+    "旧金山": "America/Los_Angeles",
+    "悉尼": "Australia/Sydney",
+    "utc": "UTC",
+}
+_IANA_TZ_RE = re.compile(r"\b[A-Z][A-Za-z_]+/[A-Za-z_]+\b")
+_CITY_ZH_RE = re.compile(r"([\u4e00-\u9fff]{1,10}?)(?:市)?(?:的)?天气")
+_CITY_EN_RE = re.compile(r"weather\s+(?:in|for|at)\s+([A-Za-z][A-Za-z .'-]{1,40}?)\s*[?？!。.]*$", re.IGNORECASE)
+_CITY_NOISE = ("帮我", "请问", "查询", "查一下", "查查", "看看", "一下", "今天", "今日", "现在", "当前", "的")
+
+
+def _local_timezone(user_input: str) -> dict[str, Any]:
+    explicit = _IANA_TZ_RE.search(user_input)
+    if explicit:
+        return {"timezone": explicit.group(0)}
+    lowered = user_input.lower()
+    for alias, tz_name in _TIMEZONE_ALIASES.items():
+        if alias in lowered:
+            return {"timezone": tz_name}
+    return {}
+
+
+def _local_city(user_input: str) -> dict[str, Any]:
+    match = _CITY_EN_RE.search(user_input.strip())
+    if match:
+        return {"city": match.group(1).strip()}
+    match = _CITY_ZH_RE.search(user_input)
+    city = match.group(1) if match else ""
+    for noise in _CITY_NOISE:
+        city = city.replace(noise, "")
+    # No city in the request means the tool's default city, which is what the agent would pick too.
+    return {"city": city} if len(city) >= 2 else {}
+
+
+def direct_tool_call(user_input: str, required_tools: list[str]) -> tuple[str, dict[str, Any]] | None:
+    # Short single-tool questions are answered straight from the tool; longer requests
+    # usually carry a second ask that only the model can handle.
+    if len(required_tools) != 1 or len(user_input.strip()) > _DIRECT_MAX_CHARS:
+        return None
+    if _SECOND_ASK_RE.search(user_input):
+        return None
+    tool = required_tools[0]
+    if tool == "time" and _TIME_INTENT_RE.search(user_input.strip()):
+        return "time", _local_timezone(user_input)
+    if tool != "weather" or not _WEATHER_INTENT_RE.search(user_input):
+        return None
+    if any(word in user_input.lower() for word in _FORECAST_WORDS):
+        return None
+    return "weather", _local_city(user_input)
+
+
+def tool_subset(user_input: str, required_tools: list[str]) -> list[str]:
+    # The subset offered on the first turn leaves out every other tool, so a time or weather
+    # hint narrows it only when the request reads as that question; "runtime.log" or
+    # "weather_report.csv" keep the full set.
+    if "time" in required_tools and not _TIME_INTENT_RE.search(user_input.strip()):
+        return []
+    if "weather" in required_tools and not _WEATHER_INTENT_RE.search(user_input):
+        return []
+    return required_tools
+
+
+def speculative_calls(user_input: str, required_tools: list[str]) -> list[tuple[str, dict[str, Any]]]:
+    # Read-only tools whose arguments the model will most likely pick the same way.
+    calls: list[tuple[str, dict[str, Any]]] = []
+    if "time" in required_tools:
+        calls.append(("time", _local_timezone(user_input)))
+    if "weather" in required_tools and not any(word in user_input.lower() for word in _FORECAST_WORDS):
+        calls.append(("weather", _local_city(user_input)))
+    if "file_search" in required_tools:
+        query = _search_query(user_input)
+        if query:
+            calls.append(("file_search", {"query": query, "path": "./"}))
+    return calls
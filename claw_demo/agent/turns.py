@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+# Assistant turns and the streaming state shared by the sync and async workflow runners.
+
+
+def parse_tool_args(raw: str) -> dict[str, Any]:
+    try:
+        args = json.loads(raw or "{}")
+    except json.JSONDecodeError:
+        return {}
+    return args if isinstance(args, dict) else {}
+
+
+@dataclass
+class ToolCall:
+    id: str
+    name: str
+    arguments: str
+
+
+@dataclass
+class AssistantTurn:
+    content: str
+    tool_calls: list[ToolCall]
+
+    def to_payload(self) -> dict[str, Any]:
+        return {
+            "content": self.content,
+            "tool_calls": [{"id": tc.id, "name": tc.name, "arguments": tc.arguments} for tc in self.tool_calls],
+        }
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> AssistantTurn:
+        return cls(
+            content=payload.get("content") or "",
+            tool_calls=[ToolCall(**tc) for tc in payload.get("tool_calls") or []],
+        )
+
+
+class StreamState:
+    def __init__(self, writer: Callable[[str], None] | None, started_at: float) -> None:
+        self.writer = writer
+        self.started_at = started_at
+        self.first_token_at: float | None = None
+        self.prompt_bytes: list[int] = []
+        self.tools_offered: list[int] = []
+        self.emitted: list[str] = []
+
+    def emit(self, text: str) -> None:
+        if self.writer is None or not text:
+            return
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+        self.emitted.append(text)
+        self.writer(text)
+
+    @property
+    def streamed(self) -> bool:
+        return self.first_token_at is not None
+
+
+# Models often write a short preamble ("我先看一下文件。") before calling a tool. Content is
+# held back until it is longer than such a preamble or the turn ends without tool calls, so a
+# preamble followed by tool calls is dropped instead of being glued onto the final answer.
+_STREAM_HOLDBACK_CHARS = 80
+
+
+class TurnAssembler:
+    def __init__(self, stream: StreamState) -> None:
+        self.stream = stream
+        self.content_parts: list[str] = []
+        self.calls: dict[int, dict[str, str]] = {}
+        self._held: list[str] = []
+        self._released = False
+
+    def feed(self, chunk: Any) -> None:
+        if not chunk.choices:
+            return
+        delta = chunk.choices[0].delta
+        for tc_delta in delta.tool_calls or []:
+            slot = self.calls.setdefault(tc_delta.index, {"id": "", "name": "", "arguments": ""})
+            if tc_delta.id:
+                slot["id"] = tc_delta.id
+            fn = tc_delta.function
+            if fn is not None:
+                slot["name"] += fn.name or ""
+                slot["arguments"] += fn.arguments or ""
+        if delta.content:
+            self.content_parts.append(delta.content)
+            # Text arriving after a tool call starts belongs to a tool step, not the answer.
+            if not self.calls:
+                self._held.append(delta.content)
+                if self._released or sum(len(part) for part in self._held) > _STREAM_HOLDBACK_CHARS:
+                    self._release()
+
+    def _release(self) -> None:
+        self._released = True
+        for part in self._held:
+            self.stream.emit(part)
+        self._held.clear()
+
+    def turn(self) -> AssistantTurn:
+        if not self.calls:
+            self._release()
+        elif self._released:
+            # A preamble too long to hold back was already shown; keep the answer off its line.
+            self.stream.emit("\n\n")
+        return AssistantTurn(
+            content="".join(self.content_parts),
+            tool_calls=[ToolCall(**self.calls[index]) for index in sorted(self.calls)],
+        )
+
+
+def turn_from_message(msg: Any) -> AssistantTurn:
+    return AssistantTurn(
+        content=msg.content or "",
+        tool_calls=[
+            ToolCall(id=tc.id, name=tc.function.name, arguments=tc.function.arguments or "")
+            for tc in msg.tool_calls or []
+        ],
+    )
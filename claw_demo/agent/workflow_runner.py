@@ -2,14 +2,36 @@ from __future__ import annotations
 
 import json
 import re
+import time
+from collections.abc import Callable
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+from claw_demo.agent.planner import FileDigestPlan, direct_tool_call, plan_workflow, speculative_calls, tool_subset
+from claw_demo.agent.turns import (
+    AssistantTurn,
+    StreamState,
+    ToolCall,
+    TurnAssembler,
+    parse_tool_args,
+    turn_from_message,
+)
 from claw_demo.config.schema import Config
 from claw_demo.config.workspace import resolve_workspace_dir
+from claw_demo.llm.cache import CacheStats, build_response_cache, completion_cache_key
+from claw_demo.llm.context_budget import ContextBudget, prompt_bytes
+from claw_demo.llm.resilience import Deadline
+from claw_demo.llm.routing import LLMRouter, ResolvedRoute
 from claw_demo.skills.models import SkillContext, SkillResult
-from claw_demo.skills.toolbox import TOOL_SCHEMAS, ToolExecutor
+from claw_demo.skills.tool_cache import ToolResultCache, build_tool_cache
+from claw_demo.skills.toolbox import (
+    SpeculationStats,
+    SpeculativeCalls,
+    ToolCallOutcome,
+    ToolExecutor,
+    select_tool_schemas,
+)
 
 
 @dataclass
@@ -17,138 +39,247 @@ class WorkflowRunResult:
     ok: bool
     text: str
     tool_trace: list[str]
+    streamed: bool = False
+    streamed_text: str = ""
+    ttft_ms: float | None = None
+    total_ms: float | None = None
 
 
-class WorkflowAgentRunner:
-    def __init__(self, config: Config, project_root: Path) -> None:
+class _WorkflowRunnerBase:
+    def __init__(self, config: Config, project_root: Path, tool_cache: ToolResultCache | None = None) -> None:
         self.config = config
         self.project_root = project_root
         self.workspace_root = resolve_workspace_dir(config, project_root)
-        self.tool_executor = ToolExecutor()
-        self._client = None
-        if config.llm.api_key:
-            from openai import OpenAI
-
-            self._client = OpenAI(
-                base_url=config.llm.base_url,
-                api_key=config.llm.api_key,
-                timeout=config.llm.timeout_sec,
-            )
+        self.response_cache = build_response_cache(config, project_root)
+        self.tool_cache = tool_cache if tool_cache is not None else build_tool_cache(config)
+        self.router = LLMRouter(config)
+        self._route = self.router.resolve("workflow")
+        self.budget = ContextBudget.from_config(config)
+        self.direct_stats = CacheStats()
+        self.speculation_stats = SpeculationStats()
 
-    def run(
+    def _initial_messages(
         self,
         user_input: str,
-        recent_messages: list[dict[str, str]] | None = None,
-        memory_snippets: list[str] | None = None,
-    ) -> WorkflowRunResult:
-        if self._client is None:
-            return WorkflowRunResult(
-                ok=False,
-                text="LLM 不可用，无法执行工作流任务。请配置 llm.api_key。",
-                tool_trace=[],
-            )
-
-        recent_messages = recent_messages or []
-        memory_snippets = memory_snippets or []
-        required_tools = self._required_tools(user_input)
-        called_tools_set: set[str] = set()
-        trace_lines: list[str] = []
-
-        ctx = SkillContext(config=self.config, project_root=self.project_root, workspace_root=self.workspace_root)
-        system = self._build_system_prompt(memory_snippets, recent_messages)
-        messages: list[dict[str, Any]] = [
+        recent_messages: list[dict[str, str]] | None,
+        memory_snippets: list[str] | None,
+    ) -> list[dict[str, Any]]:
+        system = self._build_system_prompt(
+            self.budget.cap_memory(memory_snippets or []),
+            self.budget.cap_history(recent_messages or []),
+        )
+        return [
             {"role": "system", "content": system},
             {"role": "user", "content": user_input},
         ]
 
-        max_steps = max(2, int(self.config.skills.max_steps))
-        for _ in range(max_steps):
-            resp = self._client.chat.completions.create(
-                model=self.config.llm.model,
-                messages=messages,
-                temperature=self.config.llm.temperature,
-                tools=TOOL_SCHEMAS,
-                tool_choice="auto",
-            )
-            msg = resp.choices[0].message
-            tool_calls = msg.tool_calls or []
+    def _tool_schemas(self, wanted: list[str]) -> list[dict[str, Any]]:
+        return select_tool_schemas(self.config.skills.enabled, wanted)
+
+    def _fit_context(self, messages: list[dict[str, Any]], stream: StreamState, tools: list[dict[str, Any]]) -> None:
+        self.budget.fit(messages)
+        stream.prompt_bytes.append(prompt_bytes(messages) + prompt_bytes(tools))
+        stream.tools_offered.append(len(tools))
+
+    def _completion_kwargs(self, messages: list[dict[str, Any]], tools: list[dict[str, Any]]) -> dict[str, Any]:
+        return {
+            "messages": messages,
+            "temperature": self.config.llm.temperature,
+            "tools": tools,
+            "tool_choice": "auto",
+        }
 
-            if tool_calls:
-                messages.append(
+    def _cache_lookup(
+        self,
+        route: ResolvedRoute,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]],
+        stream: StreamState | None,
+    ) -> tuple[str, AssistantTurn | None]:
+        cache = self.response_cache if self.config.llm.cache.include_workflow else None
+        if cache is None:
+            return "", None
+        key = completion_cache_key(route.model, messages, tools, self.config.llm.temperature)
+        hit = cache.get(key)
+        if hit is None:
+            return key, None
+        turn = AssistantTurn.from_payload(hit)
+        if stream is not None and not turn.tool_calls:
+            stream.emit(turn.content)
+        return key, turn
+
+    def _cache_store(self, key: str, turn: AssistantTurn) -> None:
+        if key and self.response_cache is not None:
+            self.response_cache.put(key, turn.to_payload())
+
+    def _record_tool_step(
+        self,
+        turn: AssistantTurn,
+        outcomes: list[ToolCallOutcome],
+        messages: list[dict[str, Any]],
+        called_tools_set: set[str],
+        trace_lines: list[str],
+    ) -> None:
+        messages.append(
+            {
+                "role": "assistant",
+                "content": turn.content,
+                "tool_calls": [
                     {
-                        "role": "assistant",
-                        "content": msg.content or "",
-                        "tool_calls": [
-                            {
-                                "id": tc.id,
-                                "type": "function",
-                                "function": {
-                                    "name": tc.function.name,
-                                    "arguments": tc.function.arguments,
-                                },
-                            }
-                            for tc in tool_calls
-                        ],
+                        "id": tc.id,
+                        "type": "function",
+                        "function": {
+                            "name": tc.name,
+                            "arguments": tc.arguments,
+                        },
                     }
-                )
+                    for tc in turn.tool_calls
+                ],
+            }
+        )
+        for tc, outcome in zip(turn.tool_calls, outcomes):
+            called_tools_set.add(outcome.tool_name)
+            trace_lines.append(self._outcome_line(outcome))
+            messages.append(
+                {
+                    "role": "tool",
+                    "tool_call_id": tc.id,
+                    "content": outcome.result.text,
+                }
+            )
 
-                for tc in tool_calls:
-                    tool_name = tc.function.name
-                    try:
-                        tool_args = json.loads(tc.function.arguments or "{}")
-                    except json.JSONDecodeError:
-                        tool_args = {}
-                    res = self.tool_executor.execute(tool_name, tool_args, ctx)
-                    called_tools_set.add(tool_name)
-                    trace_lines.append(self._trace_line(tool_name, tool_args, res))
-                    messages.append(
-                        {
-                            "role": "tool",
-                            "tool_call_id": tc.id,
-                            "content": res.text,
-                        }
-                    )
-                continue
+    def _direct_call(self, user_input: str, required_tools: list[str]) -> tuple[str, dict[str, Any]] | None:
+        if not self.config.skills.direct_answer:
+            return None
+        return direct_tool_call(user_input, required_tools)
 
-            answer = (msg.content or "").strip()
-            if answer:
-                missing = [name for name in required_tools if name not in called_tools_set]
-                if missing:
-                    trace_lines.append(f"missing-required-tools: {', '.join(missing)}")
-                    messages.append(
-                        {
-                            "role": "assistant",
-                            "content": answer,
-                        }
-                    )
-                    messages.append(
-                        {
-                            "role": "user",
-                            "content": (
-                                "你尚未完成全部用户目标。缺少步骤: "
-                                + ", ".join(missing)
-                                + "。请继续调用必要工具，最后再给最终答复。"
-                            ),
-                        }
-                    )
-                    continue
-                return WorkflowRunResult(ok=True, text=answer, tool_trace=trace_lines)
+    def _direct_answer(
+        self,
+        outcome: ToolCallOutcome | None,
+        trace_lines: list[str],
+        stream: StreamState,
+    ) -> WorkflowRunResult | None:
+        if not self.config.skills.direct_answer:
+            return None
+        if outcome is not None:
+            trace_lines.append(self._outcome_line(outcome))
+        if outcome is None or not outcome.result.ok:
+            # A failed direct call falls through to the agent loop, which may recover from a bad local guess.
+            self.direct_stats.misses += 1
+            return None
+        self.direct_stats.hits += 1
+        stream.emit(outcome.result.text)
+        return self._finish(True, outcome.result.text, trace_lines, stream)
 
-            messages.append({"role": "user", "content": "请继续执行并给出最终答复。"})
+    def _deadline_result(
+        self,
+        deadline: Deadline,
+        called_tools_set: set[str],
+        trace_lines: list[str],
+        stream: StreamState,
+    ) -> WorkflowRunResult:
+        trace_lines.append(f"deadline: exceeded {deadline.budget_sec:.0f}s")
+        done = "、".join(sorted(called_tools_set)) or "无"
+        text = f"工作流超过 {deadline.budget_sec:.0f} 秒时限，已停止。已完成的工具: {done}。"
+        return self._finish(False, text, trace_lines, stream)
+
+    def _settle_speculation(self, stats: SpeculationStats, trace_lines: list[str]) -> None:
+        self.speculation_stats.started += stats.started
+        self.speculation_stats.used += stats.used
+        self.speculation_stats.discarded += stats.discarded
+        # The result already holds trace_lines, so this line still reaches the caller.
+        trace_lines.append(f"speculation: {stats.summary()}")
 
+    def _plan_turn(self, plan: FileDigestPlan, outcomes: list[ToolCallOutcome]) -> AssistantTurn | None:
+        call = plan.next_call(outcomes)
+        if call is None:
+            return None
+        name, args = call
+        tool_call = ToolCall(id=f"plan-{len(outcomes) + 1}", name=name, arguments=json.dumps(args, ensure_ascii=False))
+        return AssistantTurn(content="", tool_calls=[tool_call])
+
+    def _accept_answer(
+        self,
+        answer: str,
+        required_tools: list[str],
+        called_tools_set: set[str],
+        messages: list[dict[str, Any]],
+        trace_lines: list[str],
+    ) -> bool:
+        missing = [name for name in required_tools if name not in called_tools_set]
+        if not missing:
+            return True
+        trace_lines.append(f"missing-required-tools: {', '.join(missing)}")
+        messages.append(
+            {
+                "role": "assistant",
+                "content": answer,
+            }
+        )
+        messages.append(
+            {
+                "role": "user",
+                "content": (
+                    "你尚未完成全部用户目标。缺少步骤: "
+                    + ", ".join(missing)
+                    + "。请继续调用必要工具，最后再给最终答复。"
+                ),
+            }
+        )
+        return False
+
+    def _finish(self, ok: bool, text: str, trace_lines: list[str], stream: StreamState) -> WorkflowRunResult:
+        self._append_cache_stats(trace_lines)
+        if stream.prompt_bytes:
+            sizes = ",".join(str(size) for size in stream.prompt_bytes)
+            offered = ",".join(str(count) for count in stream.tools_offered)
+            trace_lines.append(f"prompt-bytes: {sizes} (total={sum(stream.prompt_bytes)}) tools={offered}")
+        total_ms = (time.perf_counter() - stream.started_at) * 1000
+        ttft_ms = None
+        if stream.first_token_at is not None:
+            ttft_ms = (stream.first_token_at - stream.started_at) * 1000
+            trace_lines.append(f"latency: ttft={ttft_ms:.0f}ms total={total_ms:.0f}ms")
+        else:
+            trace_lines.append(f"latency: total={total_ms:.0f}ms")
         return WorkflowRunResult(
-            ok=False,
-            text="工作流执行超出最大步骤，请重试或拆分任务。",
+            ok=ok,
+            text=text,
             tool_trace=trace_lines,
+            streamed=stream.streamed,
+            streamed_text="".join(stream.emitted),
+            ttft_ms=ttft_ms,
+            total_ms=total_ms,
         )
 
-    def _trace_line(self, tool_name: str, tool_args: dict[str, Any], result: SkillResult) -> str:
+    def _append_cache_stats(self, trace_lines: list[str]) -> None:
+        if self.response_cache is not None:
+            trace_lines.append(f"llm-cache: {self.response_cache.stats.summary()}")
+        if self.tool_cache is not None:
+            trace_lines.append(f"tool-cache: {self.tool_cache.stats.summary()}")
+        if self.config.skills.direct_answer:
+            trace_lines.append(f"direct-answer: {self.direct_stats.summary()}")
+
+    def _outcome_line(self, outcome: ToolCallOutcome) -> str:
+        source = "speculative" if outcome.speculative else ("cached" if outcome.cached else "")
+        return self._trace_line(outcome.tool_name, outcome.tool_args, outcome.result, outcome.elapsed_ms, source)
+
+    def _trace_line(
+        self,
+        tool_name: str,
+        tool_args: dict[str, Any],
+        result: SkillResult,
+        elapsed_ms: float | None = None,
+        source: str = "",
+    ) -> str:
         args_preview = json.dumps(tool_args, ensure_ascii=False)
         text_preview = (result.text or "").replace("\n", " ")
         if len(text_preview) > 120:
             text_preview = text_preview[:120] + "..."
         status = "ok" if result.ok else "error"
-        return f"{tool_name} args={args_preview} -> {status}: {text_preview}"
+        timing = f" ({elapsed_ms:.0f}ms)" if elapsed_ms is not None else ""
+        if source:
+            timing = f" ({source})"
+        return f"{tool_name} args={args_preview} -> {status}{timing}: {text_preview}"
 
     def _required_tools(self, user_input: str) -> list[str]:
         text = user_input.lower()
@@ -191,3 +322,166 @@ class WorkflowAgentRunner:
             f"\n长期记忆:\n{memory_text}"
             f"\n最近对话:\n{recent_text if recent_text else '(empty)'}"
         )
+
+
+class WorkflowAgentRunner(_WorkflowRunnerBase):
+    def __init__(self, config: Config, project_root: Path, tool_cache: ToolResultCache | None = None) -> None:
+        super().__init__(config, project_root, tool_cache)
+        self.tool_executor = ToolExecutor(
+            max_workers=config.skills.max_parallel_tools,
+            tool_concurrency=config.skills.tool_concurrency,
+            result_cache=self.tool_cache,
+        )
+        self._client = self.router.client(self._route)
+
+    def run(
+        self,
+        user_input: str,
+        recent_messages: list[dict[str, str]] | None = None,
+        memory_snippets: list[str] | None = None,
+        stream_writer: Callable[[str], None] | None = None,
+    ) -> WorkflowRunResult:
+        required_tools = self._required_tools(user_input)
+        called_tools_set: set[str] = set()
+        trace_lines: list[str] = []
+        stream = StreamState(stream_writer, time.perf_counter())
+        deadline = Deadline.after(self.config.skills.timeout_sec)
+        ctx = SkillContext(config=self.config, project_root=self.project_root, workspace_root=self.workspace_root)
+
+        direct_call = self._direct_call(user_input, required_tools)
+        outcome = None
+        if direct_call is not None:
+            outcome = self.tool_executor.execute_many([direct_call], ctx, deadline=deadline)[0]
+        direct = self._direct_answer(outcome, trace_lines, stream)
+        if direct is not None:
+            return direct
+
+        if self._client is None:
+            return WorkflowRunResult(
+                ok=False,
+                text="LLM 不可用，无法执行工作流任务。请配置 llm.api_key。",
+                tool_trace=[],
+            )
+
+        messages = self._initial_messages(user_input, recent_messages, memory_snippets)
+
+        plan = plan_workflow(user_input, required_tools) if self.config.skills.fast_path else None
+        speculative: SpeculativeCalls | None = None
+        if plan is not None:
+            self._run_plan(plan, ctx, messages, called_tools_set, trace_lines, deadline)
+        elif self.config.skills.speculate:
+            predicted = speculative_calls(user_input, required_tools)
+            if predicted:
+                # Read-only tools start now and overlap with the first completion.
+                speculative = SpeculativeCalls(self.tool_executor, predicted, ctx)
+
+        try:
+            return self._run_loop(
+                messages,
+                required_tools,
+                tool_subset(user_input, required_tools),
+                called_tools_set,
+                trace_lines,
+                stream,
+                ctx,
+                speculative,
+                deadline,
+            )
+        finally:
+            if speculative is not None:
+                self._settle_speculation(speculative.discard(), trace_lines)
+
+    def _run_loop(
+        self,
+        messages: list[dict[str, Any]],
+        required_tools: list[str],
+        offered_tools: list[str],
+        called_tools_set: set[str],
+        trace_lines: list[str],
+        stream: StreamState,
+        ctx: SkillContext,
+        speculative: SpeculativeCalls | None,
+        deadline: Deadline,
+    ) -> WorkflowRunResult:
+        tools = self._tool_schemas(offered_tools)
+        max_steps = max(2, int(self.config.skills.max_steps))
+        for _ in range(max_steps):
+            if deadline.expired:
+                return self._deadline_result(deadline, called_tools_set, trace_lines, stream)
+            # Only a turn that can be accepted as the final answer is streamed to the user.
+            can_finish = all(name in called_tools_set for name in required_tools)
+            self._fit_context(messages, stream, tools)
+            try:
+                turn = self._create_completion(messages, tools, stream if can_finish else None, deadline)
+            except Exception as exc:
+                if deadline.expired:
+                    return self._deadline_result(deadline, called_tools_set, trace_lines, stream)
+                trace_lines.append(f"llm-error: {exc}")
+                return self._finish(False, f"LLM 调用失败: {exc}", trace_lines, stream)
+
+            if turn.tool_calls:
+                outcomes = self.tool_executor.execute_many(
+                    [(tc.name, parse_tool_args(tc.arguments)) for tc in turn.tool_calls],
+                    ctx,
+                    speculative,
+                    deadline,
+                )
+                self._record_tool_step(turn, outcomes, messages, called_tools_set, trace_lines)
+                continue
+
+            answer = turn.content.strip()
+            if answer:
+                if self._accept_answer(answer, required_tools, called_tools_set, messages, trace_lines):
+                    return self._finish(True, answer, trace_lines, stream)
+                # The predicted subset may be what kept the model from finishing.
+                tools = self._tool_schemas([])
+                continue
+
+            messages.append({"role": "user", "content": "请继续执行并给出最终答复。"})
+
+        return self._finish(False, "工作流执行超出最大步骤，请重试或拆分任务。", trace_lines, stream)
+
+    def _run_plan(
+        self,
+        plan: FileDigestPlan,
+        ctx: SkillContext,
+        messages: list[dict[str, Any]],
+        called_tools_set: set[str],
+        trace_lines: list[str],
+        deadline: Deadline,
+    ) -> None:
+        # Deterministic steps run back to back; the model only sees the finished transcript.
+        outcomes: list[ToolCallOutcome] = []
+        while not deadline.expired and (turn := self._plan_turn(plan, outcomes)) is not None:
+            tc = turn.tool_calls[0]
+            call = (tc.name, parse_tool_args(tc.arguments))
+            outcomes.extend(self.tool_executor.execute_many([call], ctx, deadline=deadline))
+            self._record_tool_step(turn, outcomes[-1:], messages, called_tools_set, trace_lines)
+        trace_lines.append(f"fast-path: {plan.name} {len(outcomes)}/{len(plan.tools)} steps")
+
+    def _create_completion(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]],
+        stream: StreamState | None = None,
+        deadline: Deadline | None = None,
+    ) -> AssistantTurn:
+        route = self.router.select("workflow")
+        client = self._client if route.name == self._route.name else self.router.client(route)
+        key, turn = self._cache_lookup(route, messages, tools, stream)
+        if turn is not None:
+            return turn
+
+        kwargs = self._completion_kwargs(messages, tools)
+        if stream is not None and stream.writer is not None:
+            assembler = TurnAssembler(stream)
+            for chunk in self.router.complete(route, client, deadline, stream=True, **kwargs):
+                if deadline is not None:
+                    deadline.check()
+                assembler.feed(chunk)
+            turn = assembler.turn()
+        else:
+            response = self.router.complete(route, client, deadline, **kwargs)
+            turn = turn_from_message(response.choices[0].message)
+        self._cache_store(key, turn)
+        return turn
@@ -6,8 +6,10 @@ from pathlib import Path
 from claw_demo.agent.workflow_runner import WorkflowAgentRunner
 from claw_demo.chat.slash_commands import SlashResult, parse_slash
 from claw_demo.config.schema import Config
+from claw_demo.llm.client import prewarm_clients
 from claw_demo.memory.manager import MemoryManager
 from claw_demo.skills.dispatcher import AgentSkillDispatcher
+from claw_demo.skills.tool_cache import build_tool_cache
 
 
 HELP_TEXT = (
@@ -83,8 +85,12 @@ class ChatEngine:
         self.last_tool_trace: list[str] = []
         self.trace_auto_show = False
         self.memory = MemoryManager(config=config, project_root=project_root)
-        self.dispatcher = AgentSkillDispatcher(config=config, project_root=project_root)
-        self.workflow_runner = WorkflowAgentRunner(config=config, project_root=project_root)
+        # One tool-result cache per chat session, shared by skills and workflows.
+        self.tool_cache = build_tool_cache(config)
+        self.dispatcher = AgentSkillDispatcher(config=config, project_root=project_root, tool_cache=self.tool_cache)
+        self.workflow_runner = WorkflowAgentRunner(
+            config=config, project_root=project_root, tool_cache=self.tool_cache
+        )
         self._prompt_session = self._build_prompt_session()
 
     def _build_prompt_session(self):
@@ -108,6 +114,7 @@ class ChatEngine:
 
     def run_loop(self) -> None:
         print("Claw CLI Demo. 输入 /help 查看命令帮助，/exit 退出")
+        prewarm_clients(self.config)
         while True:
             user_input = self._read_user_input()
             if not user_input:
@@ -120,13 +127,19 @@ class ChatEngine:
                     break
                 continue
 
-            if self.config.chat.stream:
-                print("bot> ", end="", flush=True)
-                answer = self.handle_user_input(user_input, stream_writer=lambda chunk: print(chunk, end="", flush=True))
-                print()
-            else:
-                answer = self.handle_user_input(user_input)
-                print(f"bot> {answer}")
+            try:
+                if self.config.chat.stream:
+                    print("bot> ", end="", flush=True)
+                    answer = self.handle_user_input(
+                        user_input, stream_writer=lambda chunk: print(chunk, end="", flush=True)
+                    )
+                    print()
+                else:
+                    answer = self.handle_user_input(user_input)
+                    print(f"bot> {answer}")
+            except KeyboardInterrupt:
+                # Ctrl-C cancels the current turn only; pending tool calls were dropped on the way out.
+                print("\n[已取消本轮请求]")
 
     def handle_user_input(
         self,
@@ -142,12 +155,22 @@ class ChatEngine:
             user_input=user_input,
             recent_messages=recent,
             memory_snippets=self.last_memories,
+            stream_writer=stream_writer,
         )
         text = result.text
         self.last_tool_trace = result.tool_trace
         if self.trace_auto_show and self.last_tool_trace:
-            text = text + "\n\n[trace]\n" + "\n".join(self.last_tool_trace)
-        if stream_writer is not None:
+            text = text + "\n\n[trace]\n" + "\n".join(self.last_tool_trace + self.memory.parse_stats_lines())
+        if stream_writer is not None and getattr(result, "streamed", False):
+            # The answer already reached the terminal token by token; only the trace is left.
+            # A deadline, LLM error or rejected answer can leave the streamed text cut off or
+            # replaced, so the final text is written out again on its own line.
+            shown = getattr(result, "streamed_text", "")
+            if not result.ok or not shown.rstrip().endswith(result.text):
+                stream_writer("\n" + result.text)
+            if len(text) > len(result.text):
+                stream_writer(text[len(result.text) :])
+        elif stream_writer is not None:
             chunks = []
             chunk_size = 16
             for i in range(0, len(text), chunk_size):
@@ -220,7 +243,7 @@ class ChatEngine:
                 self.trace_auto_show = arg == "on"
                 return SlashResult(handled=True, output=f"trace auto show = {self.trace_auto_show}")
             text = "\n".join(self.last_tool_trace) if self.last_tool_trace else "当前无工作流轨迹"
-            return SlashResult(handled=True, output=text)
+            return SlashResult(handled=True, output="\n".join([text, *self.memory.parse_stats_lines()]))
         if cmd == "/dryrun":
             if arg not in {"on", "off"}:
                 return SlashResult(handled=True, output="用法: /dryrun on|off")
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import time
 from pathlib import Path
 
 import typer
@@ -9,6 +10,7 @@ from claw_demo.config.loader import load_config
 from claw_demo.config.workspace import resolve_workspace_dir, write_workspace_to_env
 from claw_demo.memory.manager import MemoryManager
 from claw_demo.skills.dispatcher import AgentSkillDispatcher
+from claw_demo.skills.workspace_index import build_workspace_index
 
 app = typer.Typer(help="Claw CLI Demo")
 mem_app = typer.Typer(help="Memory commands")
@@ -90,6 +92,17 @@ def workspace_show() -> None:
     typer.echo(str(workspace_root))
 
 
+@workspace_app.command("index")
+def workspace_index() -> None:
+    project_root, cfg = _ctx()
+    workspace_root = resolve_workspace_dir(cfg, project_root)
+    index = build_workspace_index(cfg, project_root, workspace_root)
+    started = time.perf_counter()
+    index.refresh(force=True)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    typer.echo(f"indexed {len(index.paths)} paths in {elapsed_ms:.0f}ms -> {index.store_path}")
+
+
 @workspace_app.command("set")
 def workspace_set(path: str) -> None:
     project_root, _cfg = _ctx()
@@ -12,6 +12,47 @@ class AppConfig(BaseModel):
     verbose: bool = False
 
 
+class LLMCacheConfig(BaseModel):
+    enabled: bool = False
+    root: str = "./.claw_cache/llm"
+    ttl_sec: int = 86400
+    max_entries: int = 2000
+    max_bytes: int = 64 * 1024 * 1024
+    include_workflow: bool = False
+
+    @field_validator("ttl_sec", "max_entries", "max_bytes")
+    @classmethod
+    def _validate_positive(cls, value: int) -> int:
+        if value <= 0:
+            raise ValueError("llm.cache limits must be > 0")
+        return value
+
+
+class LLMPoolConfig(BaseModel):
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry_sec: float = 60.0
+    prewarm: bool = True
+
+
+class LLMResilienceConfig(BaseModel):
+    base_delay_sec: float = 0.5
+    max_delay_sec: float = 8.0
+    max_retry_after_sec: float = 30.0
+    breaker_failure_threshold: int = 5
+    breaker_reset_sec: float = 30.0
+
+
+class LLMRouteConfig(BaseModel):
+    model: str = ""
+    base_url: str = ""
+    api_key: str = ""
+    timeout_sec: int | None = None
+    max_retries: int | None = None
+    fallback: str = ""
+    p95_budget_ms: int = 0
+
+
 class LLMConfig(BaseModel):
     provider: Literal["openai_compatible"] = "openai_compatible"
     model: str = "gpt-4o-mini"
@@ -20,6 +61,12 @@ class LLMConfig(BaseModel):
     temperature: float = 0.3
     timeout_sec: int = 60
     max_retries: int = 2
+    response_format: Literal["text", "json_object", "json_schema"] = "text"
+    stream_parse: bool = False
+    cache: LLMCacheConfig = Field(default_factory=LLMCacheConfig)
+    pool: LLMPoolConfig = Field(default_factory=LLMPoolConfig)
+    routes: dict[str, LLMRouteConfig] = Field(default_factory=dict)
+    resilience: LLMResilienceConfig = Field(default_factory=LLMResilienceConfig)
 
 
 class ChatConfig(BaseModel):
@@ -61,6 +108,38 @@ class MemoryConfig(BaseModel):
         return value
 
 
+class ToolCacheConfig(BaseModel):
+    enabled: bool = True
+    max_entries: int = 256
+    weather_ttl_sec: int = 600
+    search_ttl_sec: int = 30
+
+    @field_validator("max_entries", "weather_ttl_sec", "search_ttl_sec")
+    @classmethod
+    def _validate_positive(cls, value: int) -> int:
+        if value <= 0:
+            raise ValueError("skills.tool_cache limits must be > 0")
+        return value
+
+
+class SummarizeConfig(BaseModel):
+    mode: Literal["local", "llm"] = "local"
+    chunk_chars: int = 4000
+    max_workers: int = 4
+    cache_enabled: bool = True
+    cache_root: str = "./.claw_cache/summaries"
+    cache_ttl_sec: int = 7 * 86400
+    cache_max_entries: int = 5000
+    cache_max_bytes: int = 32 * 1024 * 1024
+
+    @field_validator("chunk_chars", "max_workers", "cache_ttl_sec", "cache_max_entries", "cache_max_bytes")
+    @classmethod
+    def _validate_positive(cls, value: int) -> int:
+        if value <= 0:
+            raise ValueError("skills.summarize limits must be > 0")
+        return value
+
+
 class SkillsConfig(BaseModel):
     enabled: list[str] = Field(
         default_factory=lambda: ["weather", "time", "file_search", "file_read", "summarize", "email"]
@@ -68,12 +147,49 @@ class SkillsConfig(BaseModel):
     timeout_sec: int = 20
     max_steps: int = 6
     import_dirs: list[str] = Field(default_factory=list)
+    max_parallel_tools: int = 4
+    tool_concurrency: dict[str, int] = Field(default_factory=lambda: {"email": 1})
+    tool_cache: ToolCacheConfig = Field(default_factory=ToolCacheConfig)
+    summarize: SummarizeConfig = Field(default_factory=SummarizeConfig)
+    fast_path: bool = True
+    direct_answer: bool = True
+    speculate: bool = True
 
 
 class FileAccessConfig(BaseModel):
     workspace_dir: str = ""
     allowed_roots: list[str] = Field(default_factory=lambda: ["./"])
     max_read_bytes: int = 262144
+    max_batch_read_bytes: int = 524288
+    max_summarize_chars: int = 67108864
+    index_enabled: bool = True
+    index_root: str = "./.claw_cache/workspace"
+    index_refresh_sec: float = 2.0
+    content_search_max_hits: int = 50
+    content_search_workers: int = 8
+    content_index_enabled: bool = True
+    ignore_files: list[str] = Field(default_factory=lambda: [".gitignore", ".clawignore"])
+    ignore_dirs: list[str] = Field(
+        default_factory=lambda: [
+            ".git",
+            ".hg",
+            ".svn",
+            "node_modules",
+            ".venv",
+            "venv",
+            "__pycache__",
+            ".mypy_cache",
+            ".pytest_cache",
+            ".tox",
+        ]
+    )
+
+    @field_validator("content_search_max_hits", "content_search_workers")
+    @classmethod
+    def _validate_positive(cls, value: int) -> int:
+        if value <= 0:
+            raise ValueError("file_access content search limits must be > 0")
+        return value
 
 
 class WeatherConfig(BaseModel):
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from claw_demo.config.schema import Config
+
+_RESYNC_PUTS = 1000
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def summary(self) -> str:
+        return f"hits={self.hits} misses={self.misses} hit_ratio={self.hit_ratio:.0%}"
+
+
+def completion_cache_key(
+    model: str,
+    messages: list[dict[str, Any]],
+    tools: list[dict[str, Any]] | None,
+    temperature: float,
+    response_format: dict[str, Any] | None = None,
+) -> str:
+    body: dict[str, Any] = {"model": model, "messages": messages, "tools": tools or [], "temperature": temperature}
+    if response_format is not None:
+        body["response_format"] = response_format
+    payload = json.dumps(
+        body,
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, root: Path, ttl_sec: int, max_entries: int, max_bytes: int) -> None:
+        self.root = root
+        self.ttl_sec = ttl_sec
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        # Entry count and bytes are tracked in memory, so a put only rescans the directory when
+        # the cache is over a limit, once at start-up, and every _RESYNC_PUTS puts to pick up
+        # changes made by other processes.
+        self._count: int | None = None
+        self._bytes = 0
+        self._puts = 0
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        path = self._path(key)
+        with self._lock:
+            try:
+                raw = path.read_bytes()
+                record = json.loads(raw)
+            except (OSError, json.JSONDecodeError):
+                self.stats.misses += 1
+                return None
+            if time.time() - float(record.get("created_at", 0)) > self.ttl_sec:
+                path.unlink(missing_ok=True)
+                if self._count is not None:
+                    self._count -= 1
+                    self._bytes -= len(raw)
+                self.stats.misses += 1
+                return None
+            # mtime doubles as the LRU clock, so a hit refreshes recency.
+            os.utime(path)
+            self.stats.hits += 1
+            return record.get("payload")
+
+    def put(self, key: str, payload: dict[str, Any]) -> None:
+        path = self._path(key)
+        body = json.dumps({"created_at": time.time(), "payload": payload}, ensure_ascii=False).encode("utf-8")
+        with self._lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                replaced: int | None = path.stat().st_size
+            except OSError:
+                replaced = None
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_bytes(body)
+            tmp_path.replace(path)
+            self._puts += 1
+            if self._count is None or self._puts % _RESYNC_PUTS == 0:
+                self._evict()
+                return
+            self._count += 1 if replaced is None else 0
+            self._bytes += len(body) - (replaced or 0)
+            if self._count > self.max_entries or self._bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        entries: list[tuple[float, int, Path]] = []
+        for path in self.root.glob("*/*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        count = len(entries)
+        total_bytes = sum(size for _, size, _ in entries)
+        if count > self.max_entries or total_bytes > self.max_bytes:
+            # Evicting a tenth below the limits leaves room for many puts before the next scan.
+            max_entries = self.max_entries - self.max_entries // 10
+            max_bytes = self.max_bytes - self.max_bytes // 10
+            entries.sort(key=lambda item: item[0])
+            for _, size, path in entries:
+                if count <= max_entries and total_bytes <= max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                count -= 1
+                total_bytes -= size
+        self._count = count
+        self._bytes = total_bytes
+
+
+_CACHES: dict[Path, ResponseCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+# One instance per directory keeps hit/miss stats and the in-memory size counters process-wide;
+# the limits of the first caller for a directory apply.
+def get_response_cache(root: Path, ttl_sec: int, max_entries: int, max_bytes: int) -> ResponseCache:
+    root = root.resolve()
+    with _CACHES_LOCK:
+        cache = _CACHES.get(root)
+        if cache is None:
+            cache = ResponseCache(root, ttl_sec=ttl_sec, max_entries=max_entries, max_bytes=max_bytes)
+            _CACHES[root] = cache
+        return cache
+
+
+def build_response_cache(config: Config, project_root: Path) -> ResponseCache | None:
+    cache_cfg = config.llm.cache
+    if not cache_cfg.enabled:
+        return None
+    return get_response_cache(
+        project_root / cache_cfg.root,
+        ttl_sec=cache_cfg.ttl_sec,
+        max_entries=cache_cfg.max_entries,
+        max_bytes=cache_cfg.max_bytes,
+    )
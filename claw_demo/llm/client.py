@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Any
+
+from claw_demo.config.schema import Config, LLMPoolConfig
+
+
+@dataclass
+class _PooledClient:
+    client: Any
+    http_client: Any
+    base_url: str
+    warmed: bool = False
+
+
+_CLIENTS: dict[tuple[str, str, float], _PooledClient] = {}
+_ASYNC_CLIENTS: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[tuple[str, str, float], _PooledClient]] = (
+    weakref.WeakKeyDictionary()
+)
+_CLIENTS_LOCK = threading.Lock()
+
+
+def _create_client(base_url: str, api_key: str, timeout: float, pool: LLMPoolConfig) -> _PooledClient:
+    import httpx
+    from openai import DefaultHttpxClient, OpenAI
+
+    http_client = DefaultHttpxClient(
+        limits=httpx.Limits(
+            max_connections=pool.max_connections,
+            max_keepalive_connections=pool.max_keepalive_connections,
+            keepalive_expiry=pool.keepalive_expiry_sec,
+        ),
+    )
+    # Retries are owned by claw_demo.llm.resilience, so the SDK must not retry on its own.
+    client = OpenAI(base_url=base_url, api_key=api_key, timeout=timeout, max_retries=0, http_client=http_client)
+    return _PooledClient(client=client, http_client=http_client, base_url=base_url)
+
+
+def get_client(base_url: str, api_key: str, timeout: float, pool: LLMPoolConfig) -> Any:
+    key = (base_url.rstrip("/"), api_key, float(timeout))
+    with _CLIENTS_LOCK:
+        pooled = _CLIENTS.get(key)
+        if pooled is None:
+            pooled = _create_client(base_url, api_key, timeout, pool)
+            _CLIENTS[key] = pooled
+        return pooled.client
+
+
+def _create_async_client(base_url: str, api_key: str, timeout: float, pool: LLMPoolConfig) -> _PooledClient:
+    import httpx
+    from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+    http_client = DefaultAsyncHttpxClient(
+        limits=httpx.Limits(
+            max_connections=pool.max_connections,
+            max_keepalive_connections=pool.max_keepalive_connections,
+            keepalive_expiry=pool.keepalive_expiry_sec,
+        ),
+    )
+    client = AsyncOpenAI(base_url=base_url, api_key=api_key, timeout=timeout, max_retries=0, http_client=http_client)
+    return _PooledClient(client=client, http_client=http_client, base_url=base_url)
+
+
+def get_async_client(base_url: str, api_key: str, timeout: float, pool: LLMPoolConfig) -> Any:
+    # Async connections are bound to the event loop that opened them, so each loop gets its own pool.
+    loop = asyncio.get_running_loop()
+    key = (base_url.rstrip("/"), api_key, float(timeout))
+    with _CLIENTS_LOCK:
+        clients = _ASYNC_CLIENTS.setdefault(loop, {})
+        pooled = clients.get(key)
+        if pooled is None:
+            pooled = _create_async_client(base_url, api_key, timeout, pool)
+            clients[key] = pooled
+        return pooled.client
+
+
+def _warm(pooled: _PooledClient) -> None:
+    try:
+        # Any response proves TCP/TLS is up; the connection stays in the keep-alive pool.
+        pooled.http_client.request("HEAD", pooled.base_url, timeout=5)
+    except Exception:
+        pass
+
+
+def prewarm_clients(config: Config) -> list[threading.Thread]:
+    if not config.llm.pool.prewarm:
+        return []
+    threads: list[threading.Thread] = []
+    with _CLIENTS_LOCK:
+        pending = [pooled for pooled in _CLIENTS.values() if not pooled.warmed]
+        for pooled in pending:
+            pooled.warmed = True
+    for pooled in pending:
+        thread = threading.Thread(target=_warm, args=(pooled,), daemon=True)
+        thread.start()
+        threads.append(thread)
+    return threads
+
+
+def reset_clients() -> None:
+    with _CLIENTS_LOCK:
+        pooled_clients = list(_CLIENTS.values())
+        _CLIENTS.clear()
+        _ASYNC_CLIENTS.clear()
+    for pooled in pooled_clients:
+        try:
+            pooled.client.close()
+        except Exception:
+            pass
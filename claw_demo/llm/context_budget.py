@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from claw_demo.config.schema import Config
+
+# Role, separators and per-message framing that the content length does not cover.
+_MESSAGE_OVERHEAD = 16
+_MIN_TOOL_CHARS = 200
+
+
+def message_chars(message: dict[str, Any]) -> int:
+    size = _MESSAGE_OVERHEAD + len(message.get("content") or "")
+    for tc in message.get("tool_calls") or []:
+        fn = tc.get("function", {})
+        size += len(fn.get("name") or "") + len(fn.get("arguments") or "")
+    return size
+
+
+def prompt_bytes(messages: list[dict[str, Any]]) -> int:
+    return len(json.dumps(messages, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def clip_text(text: str, limit: int) -> str:
+    if len(text) <= limit:
+        return text
+    dropped = len(text) - limit
+    return f"{text[:limit]}\n...[已截断 {dropped} 字符]"
+
+
+class ContextBudget:
+    def __init__(
+        self,
+        max_context_chars: int,
+        max_item_chars: int,
+        max_memory_items: int = 5,
+        max_recent_messages: int = 6,
+    ) -> None:
+        self.max_context_chars = max_context_chars
+        self.max_item_chars = max_item_chars
+        self.max_memory_items = max_memory_items
+        self.max_recent_messages = max_recent_messages
+
+    @classmethod
+    def from_config(cls, config: Config) -> ContextBudget:
+        return cls(config.chat.max_context_chars, config.memory.max_item_chars)
+
+    def cap_memory(self, snippets: list[str]) -> list[str]:
+        return [clip_text(item, self.max_item_chars) for item in snippets[: self.max_memory_items]]
+
+    def cap_history(self, recent_messages: list[dict[str, str]]) -> list[dict[str, str]]:
+        # History gets a quarter of the window; the newest turns are kept first.
+        budget = self.max_context_chars // 4
+        kept: list[dict[str, str]] = []
+        for msg in reversed(recent_messages[-self.max_recent_messages :]):
+            clipped = {**msg, "content": clip_text(msg.get("content", ""), self.max_item_chars)}
+            budget -= message_chars(clipped)
+            if budget < 0 and kept:
+                break
+            kept.append(clipped)
+        kept.reverse()
+        return kept
+
+    # Shrinks tool outputs in place until the messages fit the window and returns the estimated size.
+    # Older tool outputs are clipped to max_item_chars, then elided oldest first; the latest tool batch
+    # is only clipped as a last resort, so the model always sees some of what it just asked for.
+    def fit(self, messages: list[dict[str, Any]]) -> int:
+        total = sum(message_chars(m) for m in messages)
+        if total <= self.max_context_chars:
+            return total
+
+        last_call = max((i for i, m in enumerate(messages) if m.get("tool_calls")), default=-1)
+        tool_indexes = [i for i, m in enumerate(messages) if m.get("role") == "tool"]
+        older = [i for i in tool_indexes if i < last_call]
+        latest = [i for i in tool_indexes if i > last_call]
+
+        for i in older:
+            total += self._replace(messages[i], clip_text(messages[i]["content"], self.max_item_chars))
+        for i in older:
+            if total <= self.max_context_chars:
+                return total
+            content = messages[i]["content"]
+            if not content.startswith("[已省略"):
+                total += self._replace(messages[i], f"[已省略较早的工具输出，共 {len(content)} 字符]")
+
+        if total > self.max_context_chars and latest:
+            fixed = total - sum(len(messages[i]["content"]) for i in latest)
+            share = max(_MIN_TOOL_CHARS, (self.max_context_chars - fixed) // len(latest))
+            for i in latest:
+                total += self._replace(messages[i], clip_text(messages[i]["content"], share))
+        return total
+
+    @staticmethod
+    def _replace(message: dict[str, Any], content: str) -> int:
+        delta = len(content) - len(message["content"])
+        message["content"] = content
+        return delta
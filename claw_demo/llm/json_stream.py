@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+_CLOSERS = {"}": "{", "]": "["}
+_SCALAR_CHARS = set("0123456789+-.eEtruefalsn")
+
+
+class JSONStreamError(ValueError):
+    pass
+
+
+@dataclass
+class ParseStats:
+    attempts: int = 0
+    retries: int = 0
+    early_aborts: int = 0
+
+    def summary(self) -> str:
+        return f"attempts={self.attempts} retries={self.retries} early_aborts={self.early_aborts}"
+
+
+# Consumes a JSON object chunk by chunk and surfaces the items of one top-level array as soon as
+# they close. Structural errors and items rejected by validate_item raise immediately, so callers
+# can drop the stream instead of waiting for the full response.
+class IncrementalJSONParser:
+    def __init__(self, array_key: str | None = None, validate_item: Callable[[Any], Any] | None = None) -> None:
+        self.array_key = array_key
+        self.validate_item = validate_item
+        self.items: list[Any] = []
+        self._text = ""
+        self._pos = 0
+        self._doc_start = -1
+        self._doc_end = -1
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = -1
+        self._expect_key = False
+        self._current_key: str | None = None
+        self._array_depth = -1
+        self._item_start = -1
+
+    @property
+    def done(self) -> bool:
+        return self._doc_end >= 0
+
+    def feed(self, chunk: str) -> list[Any]:
+        before = len(self.items)
+        self._text += chunk
+        while self._pos < len(self._text):
+            if self._doc_start < 0:
+                if not self._skip_preamble():
+                    break
+                continue
+            ch = self._text[self._pos]
+            if self.done:
+                if not ch.isspace() and ch != "`":
+                    raise JSONStreamError("unexpected text after JSON document")
+            else:
+                self._step(ch)
+            self._pos += 1
+        return self.items[before:]
+
+    def close(self) -> Any:
+        if not self.done:
+            raise JSONStreamError("truncated JSON document")
+        return json.loads(self._text[self._doc_start : self._doc_end])
+
+    def _skip_preamble(self) -> bool:
+        # Tolerate a markdown fence such as ```json or a line of prose before the object, as the
+        # non-streaming parse does by searching for the first "{".
+        start = self._text.find("{", self._pos)
+        if start < 0:
+            self._pos = len(self._text)
+            return False
+        self._pos = start
+        self._doc_start = start
+        return True
+
+    def _step(self, ch: str) -> None:
+        pos = self._pos
+        depth = len(self._stack)
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif ch == "\\":
+                self._escape = True
+            elif ch == '"':
+                self._in_string = False
+                if depth == 1 and self._expect_key:
+                    self._current_key = json.loads(self._text[self._string_start : pos + 1])
+                    self._expect_key = False
+            return
+        if ch == '"':
+            self._in_string = True
+            self._string_start = pos
+            self._mark_item_start(depth)
+            return
+        if ch in "{[":
+            self._mark_item_start(depth)
+            if ch == "[" and depth == 1 and self.array_key and self._current_key == self.array_key:
+                self._array_depth = 2
+            self._stack.append(ch)
+            if ch == "{" and depth == 0:
+                self._expect_key = True
+            return
+        if ch in _CLOSERS:
+            if not self._stack or self._stack[-1] != _CLOSERS[ch]:
+                raise JSONStreamError(f"unbalanced '{ch}' at offset {pos}")
+            if ch == "]" and depth == self._array_depth:
+                self._complete_item(pos)
+                self._array_depth = -1
+            self._stack.pop()
+            if len(self._stack) == self._array_depth:
+                self._complete_item(pos + 1)
+            if not self._stack:
+                self._doc_end = pos + 1
+            return
+        if ch == ",":
+            if depth == 1:
+                self._expect_key = True
+            if depth == self._array_depth:
+                self._complete_item(pos)
+            return
+        if ch == ":" or ch.isspace():
+            return
+        if ch not in _SCALAR_CHARS:
+            raise JSONStreamError(f"unexpected character {ch!r} at offset {pos}")
+        self._mark_item_start(depth)
+
+    def _mark_item_start(self, depth: int) -> None:
+        if depth == self._array_depth and self._item_start < 0:
+            self._item_start = self._pos
+
+    def _complete_item(self, end: int) -> None:
+        if self._item_start < 0:
+            return
+        raw = self._text[self._item_start : end].strip()
+        self._item_start = -1
+        try:
+            item = json.loads(raw)
+        except json.JSONDecodeError as exc:
+            raise JSONStreamError(f"malformed array item: {raw[:80]}") from exc
+        if self.validate_item is not None:
+            try:
+                self.validate_item(item)
+            except Exception as exc:
+                raise JSONStreamError(f"invalid array item: {exc}") from exc
+        self.items.append(item)
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+_RETRYABLE_STATUS = {408, 409, 425, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(RuntimeError):
+    def __init__(self, endpoint: str, retry_in: float) -> None:
+        super().__init__(f"circuit open for {endpoint}, retry in {retry_in:.1f}s")
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+@dataclass
+class Deadline:
+    expires_at: float | None = None
+    budget_sec: float = 0.0
+
+    @classmethod
+    def after(cls, seconds: float) -> Deadline:
+        if seconds <= 0:
+            return cls()
+        return cls(time.monotonic() + seconds, float(seconds))
+
+    def remaining(self) -> float | None:
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def cap(self, timeout: float) -> float:
+        remaining = self.remaining()
+        return timeout if remaining is None else min(timeout, remaining)
+
+    def check(self) -> None:
+        if self.expired:
+            raise DeadlineExceeded(f"deadline of {self.budget_sec:.0f}s exceeded")
+
+
+@dataclass
+class RetryPolicy:
+    max_retries: int = 2
+    base_delay_sec: float = 0.5
+    max_delay_sec: float = 8.0
+    max_retry_after_sec: float = 30.0
+
+    def backoff(self, attempt: int, retry_after: float | None = None) -> float:
+        ceiling = min(self.max_delay_sec, self.base_delay_sec * (2**attempt))
+        # Equal jitter: keep half of the exponential step, randomize the rest.
+        delay = ceiling / 2 + random.uniform(0, ceiling / 2)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_retry_after_sec))
+        return delay
+
+
+def _retry_after(exc: BaseException) -> float | None:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    raw_ms = headers.get("retry-after-ms")
+    if raw_ms:
+        try:
+            return max(0.0, float(raw_ms) / 1000)
+        except ValueError:
+            pass
+    raw = headers.get("retry-after")
+    if not raw:
+        return None
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(raw).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_error(exc: BaseException) -> tuple[bool, float | None]:
+    import openai
+
+    if isinstance(exc, (openai.APIConnectionError, TimeoutError, ConnectionError)):
+        return True, None
+    status = getattr(exc, "status_code", None)
+    if isinstance(exc, openai.APIStatusError) and status in _RETRYABLE_STATUS:
+        return True, _retry_after(exc)
+    return False, None
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, reset_timeout_sec: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_sec = reset_timeout_sec
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self, endpoint: str) -> None:
+        with self._lock:
+            if self.state == "closed":
+                return
+            elapsed = time.monotonic() - self._opened_at
+            if self.state == "open" and elapsed >= self.reset_timeout_sec:
+                self.state = "half_open"
+            if self.state == "half_open" and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            raise CircuitOpenError(endpoint, max(0.0, self.reset_timeout_sec - elapsed))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self.state == "half_open" or self._failures >= self.failure_threshold:
+                self.state = "open"
+                self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+
+_BREAKERS: dict[str, CircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+
+
+def get_breaker(endpoint: str, failure_threshold: int = 5, reset_timeout_sec: float = 30.0) -> CircuitBreaker:
+    key = endpoint.rstrip("/")
+    with _BREAKERS_LOCK:
+        breaker = _BREAKERS.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(failure_threshold, reset_timeout_sec)
+            _BREAKERS[key] = breaker
+        return breaker
+
+
+def reset_breakers() -> None:
+    with _BREAKERS_LOCK:
+        _BREAKERS.clear()
+
+
+def _past_deadline(deadline: Deadline | None, delay: float) -> bool:
+    remaining = deadline.remaining() if deadline is not None else None
+    return remaining is not None and delay >= remaining
+
+
+def call_with_resilience(
+    fn: Callable[[], T],
+    endpoint: str,
+    policy: RetryPolicy,
+    breaker: CircuitBreaker,
+    sleep: Callable[[float], Any] = time.sleep,
+    deadline: Deadline | None = None,
+) -> T:
+    attempt = 0
+    while True:
+        if deadline is not None:
+            deadline.check()
+        breaker.before_call(endpoint)
+        try:
+            result = fn()
+        except Exception as exc:
+            retryable, retry_after = classify_error(exc)
+            if not retryable:
+                # Client-side errors (bad request, auth) say nothing about endpoint health.
+                breaker.record_success()
+                raise
+            breaker.record_failure()
+            delay = policy.backoff(attempt, retry_after)
+            if attempt >= policy.max_retries or _past_deadline(deadline, delay):
+                raise
+            sleep(delay)
+            attempt += 1
+            continue
+        breaker.record_success()
+        return result
+
+
+async def call_with_resilience_async(
+    fn: Callable[[], Awaitable[T]],
+    endpoint: str,
+    policy: RetryPolicy,
+    breaker: CircuitBreaker,
+    deadline: Deadline | None = None,
+) -> T:
+    attempt = 0
+    while True:
+        if deadline is not None:
+            deadline.check()
+        breaker.before_call(endpoint)
+        try:
+            result = await fn()
+        except Exception as exc:
+            retryable, retry_after = classify_error(exc)
+            if not retryable:
+                breaker.record_success()
+                raise
+            breaker.record_failure()
+            delay = policy.backoff(attempt, retry_after)
+            if attempt >= policy.max_retries or _past_deadline(deadline, delay):
+                raise
+            await asyncio.sleep(delay)
+            attempt += 1
+            continue
+        breaker.record_success()
+        return result
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+from claw_demo.config.schema import Config
+from claw_demo.llm.client import get_async_client, get_client
+from claw_demo.llm.resilience import (
+    CircuitBreaker,
+    Deadline,
+    RetryPolicy,
+    call_with_resilience,
+    call_with_resilience_async,
+    get_breaker,
+)
+
+STAGES = ("extract", "verify", "workflow", "skill")
+
+
+@dataclass(frozen=True)
+class ResolvedRoute:
+    name: str
+    model: str
+    base_url: str
+    api_key: str
+    timeout_sec: float
+    max_retries: int
+
+
+class LatencyTracker:
+    def __init__(self, window_sec: float = 300.0, max_samples: int = 200, min_samples: int = 5) -> None:
+        self.window_sec = window_sec
+        self.min_samples = min_samples
+        self._samples: dict[str, deque[tuple[float, float]]] = {}
+        self._max_samples = max_samples
+        self._lock = threading.Lock()
+
+    def record(self, route_name: str, elapsed_ms: float) -> None:
+        with self._lock:
+            samples = self._samples.setdefault(route_name, deque(maxlen=self._max_samples))
+            samples.append((time.monotonic(), elapsed_ms))
+
+    def p95(self, route_name: str) -> float | None:
+        # Samples age out of the window, so a slow route is probed again once it goes quiet.
+        cutoff = time.monotonic() - self.window_sec
+        with self._lock:
+            values = sorted(ms for ts, ms in self._samples.get(route_name, ()) if ts >= cutoff)
+        if len(values) < self.min_samples:
+            return None
+        return values[min(len(values) - 1, int(round(0.95 * (len(values) - 1))))]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+
+_TRACKER = LatencyTracker()
+
+
+class LLMRouter:
+    def __init__(self, config: Config, tracker: LatencyTracker | None = None) -> None:
+        self.config = config
+        self.tracker = tracker or _TRACKER
+
+    def resolve(self, name: str) -> ResolvedRoute:
+        llm = self.config.llm
+        route = llm.routes.get(name)
+        if route is None:
+            return ResolvedRoute(
+                name=name,
+                model=llm.model,
+                base_url=llm.base_url,
+                api_key=llm.api_key,
+                timeout_sec=float(llm.timeout_sec),
+                max_retries=llm.max_retries,
+            )
+        return ResolvedRoute(
+            name=name,
+            model=route.model or llm.model,
+            base_url=route.base_url or llm.base_url,
+            api_key=route.api_key or llm.api_key,
+            timeout_sec=float(route.timeout_sec if route.timeout_sec is not None else llm.timeout_sec),
+            max_retries=route.max_retries if route.max_retries is not None else llm.max_retries,
+        )
+
+    def select(self, stage: str) -> ResolvedRoute:
+        primary = self.resolve(stage)
+        route_cfg = self.config.llm.routes.get(stage)
+        if route_cfg is None or not route_cfg.fallback or route_cfg.p95_budget_ms <= 0:
+            return primary
+        p95 = self.tracker.p95(primary.name)
+        if p95 is not None and p95 > route_cfg.p95_budget_ms:
+            return self.resolve(route_cfg.fallback)
+        return primary
+
+    def client(self, route: ResolvedRoute) -> Any | None:
+        if not route.api_key:
+            return None
+        return get_client(route.base_url, route.api_key, route.timeout_sec, self.config.llm.pool)
+
+    def async_client(self, route: ResolvedRoute) -> Any | None:
+        if not route.api_key:
+            return None
+        return get_async_client(route.base_url, route.api_key, route.timeout_sec, self.config.llm.pool)
+
+    def _resilience(self, route: ResolvedRoute) -> tuple[RetryPolicy, CircuitBreaker]:
+        res_cfg = self.config.llm.resilience
+        policy = RetryPolicy(
+            max_retries=route.max_retries,
+            base_delay_sec=res_cfg.base_delay_sec,
+            max_delay_sec=res_cfg.max_delay_sec,
+            max_retry_after_sec=res_cfg.max_retry_after_sec,
+        )
+        breaker = get_breaker(route.base_url, res_cfg.breaker_failure_threshold, res_cfg.breaker_reset_sec)
+        return policy, breaker
+
+    def complete(self, route: ResolvedRoute, client: Any, deadline: Deadline | None = None, **kwargs: Any) -> Any:
+        policy, breaker = self._resilience(route)
+
+        def _attempt() -> Any:
+            if deadline is not None:
+                # Each attempt only gets what is left of the run, not a fresh route timeout.
+                kwargs["timeout"] = deadline.cap(route.timeout_sec)
+            start = time.perf_counter()
+            try:
+                return client.chat.completions.create(model=route.model, **kwargs)
+            finally:
+                self.tracker.record(route.name, (time.perf_counter() - start) * 1000)
+
+        return call_with_resilience(_attempt, route.base_url, policy, breaker, deadline=deadline)
+
+    async def acomplete(
+        self, route: ResolvedRoute, client: Any, deadline: Deadline | None = None, **kwargs: Any
+    ) -> Any:
+        policy, breaker = self._resilience(route)
+
+        async def _attempt() -> Any:
+            if deadline is not None:
+                kwargs["timeout"] = deadline.cap(route.timeout_sec)
+            start = time.perf_counter()
+            try:
+                return await client.chat.completions.create(model=route.model, **kwargs)
+            finally:
+                self.tracker.record(route.name, (time.perf_counter() - start) * 1000)
+
+        return await call_with_resilience_async(_attempt, route.base_url, policy, breaker, deadline=deadline)
@@ -2,15 +2,21 @@ from __future__ import annotations
 
 import json
 import re
+from collections.abc import Callable
 from dataclasses import dataclass
-from typing import Protocol
+from typing import Any, ClassVar, Protocol, TypeVar
 
 from pydantic import BaseModel, Field, ValidationError
 
 from claw_demo.config.schema import Config
+from claw_demo.llm.cache import ResponseCache, completion_cache_key
+from claw_demo.llm.json_stream import IncrementalJSONParser, JSONStreamError, ParseStats
+from claw_demo.llm.routing import LLMRouter
 from claw_demo.memory.grep_retriever import MemoryEntry
 from claw_demo.memory.normalize import now_ts
 
+T = TypeVar("T")
+
 
 class MemoryRecord(BaseModel):
     key: str = Field(min_length=1)
@@ -42,24 +48,97 @@ class MemoryVerifier(Protocol):
         ...
 
 
-def _build_client(config: Config):
-    if not config.llm.api_key:
-        return None
-    from openai import OpenAI
+def _validate_index(item: Any) -> None:
+    if not isinstance(item, int) or isinstance(item, bool):
+        raise ValueError(f"keep index must be int, got {item!r}")
+
+
+def _response_format(config: Config, name: str, schema: type[BaseModel]) -> dict[str, Any] | None:
+    mode = config.llm.response_format
+    if mode == "json_object":
+        return {"type": "json_object"}
+    if mode == "json_schema":
+        return {
+            "type": "json_schema",
+            "json_schema": {"name": name, "schema": schema.model_json_schema(), "strict": False},
+        }
+    return None
+
+
+class _JSONCompletionMixin:
+    stage: ClassVar[str]
+    config: Config
+    cache: ResponseCache | None
+
+    def _init_llm(self) -> None:
+        self._router = LLMRouter(self.config)
+        self._route = self._router.resolve(self.stage)
+        self._client = self._router.client(self._route)
+        self.parse_stats = ParseStats()
 
-    return OpenAI(
-        base_url=config.llm.base_url,
-        api_key=config.llm.api_key,
-        timeout=config.llm.timeout_sec,
-    )
+    # Completes the prompt and parses the reply; only a reply that parses is cached, so an error
+    # page or malformed output is asked for again instead of being replayed for ttl_sec.
+    def _complete_parsed(
+        self,
+        prompt: str,
+        parse: Callable[[str], T | None],
+        response_format: dict[str, Any] | None = None,
+        parser: IncrementalJSONParser | None = None,
+    ) -> T | None:
+        self.parse_stats.attempts += 1
+        route = self._router.select(self.stage)
+        client = self._client if route.name == self._route.name else self._router.client(route)
+        if client is None:
+            return None
+        messages = [{"role": "user", "content": prompt}]
+        key = ""
+        if self.cache is not None:
+            key = completion_cache_key(route.model, messages, None, 0, response_format)
+            hit = self.cache.get(key)
+            if hit is not None:
+                parsed = parse(str(hit.get("content", "")))
+                if parsed is not None:
+                    return parsed
+        kwargs: dict[str, Any] = {"messages": messages, "temperature": 0}
+        if response_format is not None:
+            kwargs["response_format"] = response_format
+        if parser is None or not self.config.llm.stream_parse:
+            resp = self._router.complete(route, client, **kwargs)
+            raw = (resp.choices[0].message.content or "").strip()
+        else:
+            stream = self._router.complete(route, client, stream=True, **kwargs)
+            parts: list[str] = []
+            try:
+                for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content or ""
+                    if delta:
+                        parts.append(delta)
+                        parser.feed(delta)
+            except JSONStreamError:
+                # Malformed output is detected mid-stream; stop paying for the rest of it.
+                self.parse_stats.early_aborts += 1
+                return None
+            finally:
+                close = getattr(stream, "close", None)
+                if close is not None:
+                    close()
+            raw = "".join(parts).strip()
+        parsed = parse(raw)
+        if parsed is not None and self.cache is not None:
+            self.cache.put(key, {"content": raw})
+        return parsed
 
 
 @dataclass
-class LLMMemoryExtractor:
+class LLMMemoryExtractor(_JSONCompletionMixin):
     config: Config
+    cache: ResponseCache | None = None
+    stage: ClassVar[str] = "extract"
 
     def __post_init__(self) -> None:
-        self._client = _build_client(self.config)
+        self._init_llm()
 
     def extract(self, user_text: str, recent_messages: list[dict[str, str]] | None = None) -> list[MemoryEntry]:
         text = user_text.strip()
@@ -79,15 +158,19 @@ class LLMMemoryExtractor:
             f"\n用户输入:\n{text}"
         )
 
-        retries = self.config.llm.max_retries
+        response_format = _response_format(self.config, "memory_records", MemoryRecordList)
+        retries = self._route.max_retries
         for attempt in range(retries + 1):
-            resp = self._client.chat.completions.create(
-                model=self.config.llm.model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0,
-            )
-            raw = (resp.choices[0].message.content or "").strip()
-            parsed = self._parse_records(raw)
+            try:
+                parsed = self._complete_parsed(
+                    prompt,
+                    self._parse_records,
+                    response_format=response_format,
+                    parser=IncrementalJSONParser("records", MemoryRecord.model_validate),
+                )
+            except Exception:
+                # Transport errors were already retried by the resilience layer; extraction is best-effort.
+                return []
             if parsed is not None:
                 return [
                     MemoryEntry(
@@ -101,6 +184,7 @@ class LLMMemoryExtractor:
                     for record in parsed.records
                 ]
             if attempt < retries:
+                self.parse_stats.retries += 1
                 prompt = prompt + "\n请只返回合法 JSON，不要输出其他文本。"
         return []
 
@@ -129,11 +213,13 @@ class LLMMemoryExtractor:
 
 
 @dataclass
-class LLMMemoryVerifier:
+class LLMMemoryVerifier(_JSONCompletionMixin):
     config: Config
+    cache: ResponseCache | None = None
+    stage: ClassVar[str] = "verify"
 
     def __post_init__(self) -> None:
-        self._client = _build_client(self.config)
+        self._init_llm()
 
     def verify(
         self,
@@ -168,19 +254,23 @@ class LLMMemoryVerifier:
             f"\n候选记忆: {candidate_json}"
         )
 
-        retries = self.config.llm.max_retries
+        response_format = _response_format(self.config, "memory_verify_decision", MemoryVerifyDecision)
+        retries = self._route.max_retries
         for attempt in range(retries + 1):
-            resp = self._client.chat.completions.create(
-                model=self.config.llm.model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0,
-            )
-            raw = (resp.choices[0].message.content or "").strip()
-            decision = self._parse_decision(raw)
+            try:
+                decision = self._complete_parsed(
+                    prompt,
+                    self._parse_decision,
+                    response_format=response_format,
+                    parser=IncrementalJSONParser("keep", _validate_index),
+                )
+            except Exception:
+                return fallback
             if decision is not None:
                 keep_set = set(i for i in decision.keep if 0 <= i < len(entries))
                 return [entry for i, entry in enumerate(entries) if i in keep_set]
             if attempt < retries:
+                self.parse_stats.retries += 1
                 prompt = prompt + "\n请只返回合法 JSON，不要输出其他文本。"
 
         return fallback
@@ -3,6 +3,7 @@ from __future__ import annotations
 from pathlib import Path
 
 from claw_demo.config.schema import Config
+from claw_demo.llm.cache import build_response_cache
 from claw_demo.memory.episode import is_episode_trigger, prune_old_episode_files
 from claw_demo.memory.extractor import LLMMemoryExtractor, LLMMemoryVerifier, MemoryExtractor, MemoryVerifier
 from claw_demo.memory.grep_retriever import MemoryEntry, RetrievedMemory, load_all_entries, progressive_retrieve
@@ -27,8 +28,9 @@ class MemoryManager:
     ) -> None:
         self.config = config
         self.memory_root = (project_root / config.memory.root).resolve()
-        self.extractor = extractor or LLMMemoryExtractor(config)
-        self.verifier = verifier or LLMMemoryVerifier(config)
+        cache = build_response_cache(config, project_root)
+        self.extractor = extractor or LLMMemoryExtractor(config, cache=cache)
+        self.verifier = verifier or LLMMemoryVerifier(config, cache=cache)
         (self.memory_root / "episodes").mkdir(parents=True, exist_ok=True)
         (self.memory_root / "index").mkdir(parents=True, exist_ok=True)
         for p in [self.memory_root / "profile.md", self.memory_root / "facts.md", self.memory_root / "index" / "memory_keys.tsv"]:
@@ -50,6 +52,16 @@ class MemoryManager:
             episode_decay_half_life_days=self.config.memory.episode_decay_half_life_days,
         )
 
+    def parse_stats_lines(self) -> list[str]:
+        # Structured-output attempts, retries and early aborts per stage; custom extractors
+        # without parse_stats are skipped.
+        lines: list[str] = []
+        for stage, component in (("extract", self.extractor), ("verify", self.verifier)):
+            stats = getattr(component, "parse_stats", None)
+            if stats is not None:
+                lines.append(f"memory-parse[{stage}]: {stats.summary()}")
+        return lines
+
     def add(self, key: str, mem_type: str, content: str, tags: list[str] | None = None) -> None:
         entry = MemoryEntry(
             key=key,
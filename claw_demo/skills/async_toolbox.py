@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import weakref
+from typing import Any
+
+from pydantic import ValidationError
+
+from claw_demo.skills.models import SkillContext, SkillResult
+from claw_demo.skills.tool_cache import ToolResultCache
+from claw_demo.skills.toolbox import ToolCallOutcome, ToolExecutor, WeatherToolArgs
+
+
+async def _run_weather_async(args: WeatherToolArgs, ctx: SkillContext) -> SkillResult:
+    import httpx
+
+    city = (args.city or ctx.config.weather.default_city).strip()
+    try:
+        async with httpx.AsyncClient(timeout=8) as client:
+            geo_resp = await client.get(
+                "https://geocoding-api.open-meteo.com/v1/search",
+                params={"name": city, "count": 1, "language": "zh"},
+            )
+            geo_resp.raise_for_status()
+            results = geo_resp.json().get("results") or []
+            if not results:
+                return SkillResult(ok=False, text=f"未找到城市: {city}")
+
+            loc = results[0]
+            weather_resp = await client.get(
+                "https://api.open-meteo.com/v1/forecast",
+                params={
+                    "latitude": loc["latitude"],
+                    "longitude": loc["longitude"],
+                    "current": "temperature_2m,weather_code",
+                },
+            )
+            weather_resp.raise_for_status()
+        current = weather_resp.json().get("current", {})
+        temp = current.get("temperature_2m", "?")
+        code = current.get("weather_code", "?")
+        return SkillResult(ok=True, text=f"{city} 当前天气: code={code}, 温度={temp}°C")
+    except Exception:
+        return SkillResult(ok=False, text="天气服务暂不可用")
+
+
+class AsyncToolExecutor:
+    def __init__(
+        self,
+        max_workers: int = 4,
+        tool_concurrency: dict[str, int] | None = None,
+        result_cache: ToolResultCache | None = None,
+    ) -> None:
+        self.max_workers = max(1, max_workers)
+        self.tool_concurrency = dict(tool_concurrency or {})
+        self.result_cache = result_cache
+        self._sync = ToolExecutor(max_workers=1)
+        self._semaphores: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    async def execute(self, tool_name: str, tool_args: dict[str, Any], ctx: SkillContext) -> SkillResult:
+        if tool_name == "weather":
+            try:
+                return await _run_weather_async(WeatherToolArgs.model_validate(tool_args), ctx)
+            except ValidationError as exc:
+                return SkillResult(ok=False, text=f"工具参数错误: {exc}")
+        # File, summarize, email and time tools are blocking and short; run them off the loop.
+        return await asyncio.to_thread(self._sync.execute, tool_name, tool_args, ctx)
+
+    async def execute_many(self, calls: list[tuple[str, dict[str, Any]]], ctx: SkillContext) -> list[ToolCallOutcome]:
+        if len(calls) <= 1:
+            return [await self._timed(name, args, ctx) for name, args in calls]
+        # gather keeps request order, so tool messages line up with tool_call ids.
+        return list(await asyncio.gather(*(self._timed(name, args, ctx) for name, args in calls)))
+
+    async def _timed(self, tool_name: str, tool_args: dict[str, Any], ctx: SkillContext) -> ToolCallOutcome:
+        start = time.perf_counter()
+        if self.result_cache is not None:
+            hit = self.result_cache.get(tool_name, tool_args, ctx)
+            if hit is not None:
+                return ToolCallOutcome(tool_name, tool_args, hit, (time.perf_counter() - start) * 1000, cached=True)
+        async with self._semaphore("*", self.max_workers):
+            limit = self.tool_concurrency.get(tool_name)
+            if not limit or limit <= 0:
+                start = time.perf_counter()
+                result = await self.execute(tool_name, tool_args, ctx)
+            else:
+                async with self._semaphore(tool_name, limit):
+                    start = time.perf_counter()
+                    result = await self.execute(tool_name, tool_args, ctx)
+        if self.result_cache is not None:
+            self.result_cache.put(tool_name, tool_args, ctx, result)
+        return ToolCallOutcome(tool_name, tool_args, result, (time.perf_counter() - start) * 1000)
+
+    def _semaphore(self, name: str, limit: int) -> asyncio.Semaphore:
+        # asyncio primitives belong to one loop; the executor may be reused across asyncio.run calls.
+        semaphores = self._semaphores.setdefault(asyncio.get_running_loop(), {})
+        semaphore = semaphores.get(name)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(limit)
+            semaphores[name] = semaphore
+        return semaphore
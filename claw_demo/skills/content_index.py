@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import threading
+import time
+from pathlib import Path
+
+from claw_demo.config.schema import Config
+from claw_demo.skills.sandbox import open_nofollow
+from claw_demo.skills.workspace_index import index_store_path
+
+_INDEX_VERSION = 1
+_BINARY_SNIFF_BYTES = 8192
+
+
+# Trigrams are taken over ASCII-lowercased raw bytes (latin-1 keeps one char per byte), which
+# matches the case folding of the bytes patterns used by content search.
+def query_trigrams(query: str) -> set[str]:
+    text = query.encode("utf-8").lower().decode("latin-1")
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def file_trigrams(path: Path, max_bytes: int) -> set[str]:
+    try:
+        size = path.stat().st_size
+        if size < 3 or size > max_bytes:
+            return set()
+        with open_nofollow(path) as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm.find(b"\0", 0, _BINARY_SNIFF_BYTES) >= 0:
+                return set()
+            text = mm[:].lower().decode("latin-1")
+    except (OSError, ValueError):
+        return set()
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+# Trigram postings over workspace file contents, in the spirit of codesearch: a query is
+# narrowed to the files containing all of its trigrams before any byte is scanned. The
+# manifest records (id, mtime_ns, size) per file so only changed files are read again.
+class ContentIndex:
+    def __init__(self, root: Path, store_dir: Path, max_bytes: int, refresh_sec: float = 2.0) -> None:
+        self.root = root
+        self.store_dir = store_dir
+        self.max_bytes = max_bytes
+        self.refresh_sec = refresh_sec
+        self._manifest: dict[str, list[int]] = {}
+        self._postings: dict[str, set[int]] = {}
+        self._next_id = 0
+        self._checked_at = 0.0
+        self._last_files: list[str] = []
+        self._lock = threading.Lock()
+        self._load()
+
+    @property
+    def size(self) -> int:
+        return len(self._manifest)
+
+    def update(self, files: list[str], force: bool = False) -> int:
+        with self._lock:
+            now = time.monotonic()
+            if not force and files == self._last_files and now - self._checked_at < self.refresh_sec:
+                return 0
+            self._checked_at = now
+            self._last_files = list(files)
+            stale: set[int] = set()
+            fresh: dict[str, tuple[int, int]] = {}
+            current = set(files)
+            for rel in [rel for rel in self._manifest if rel not in current]:
+                stale.add(self._manifest.pop(rel)[0])
+            for rel in files:
+                try:
+                    st = os.stat(self.root / rel)
+                except OSError:
+                    continue
+                entry = self._manifest.get(rel)
+                if not force and entry is not None and entry[1] == st.st_mtime_ns and entry[2] == st.st_size:
+                    continue
+                if entry is not None:
+                    stale.add(entry[0])
+                fresh[rel] = (st.st_mtime_ns, st.st_size)
+            if not stale and not fresh:
+                return 0
+            if stale:
+                for key in list(self._postings):
+                    ids = self._postings[key]
+                    ids -= stale
+                    if not ids:
+                        del self._postings[key]
+            for rel, (mtime, size) in fresh.items():
+                file_id = self._next_id
+                self._next_id += 1
+                self._manifest[rel] = [file_id, mtime, size]
+                for gram in file_trigrams(self.root / rel, self.max_bytes):
+                    self._postings.setdefault(gram, set()).add(file_id)
+            self._save()
+            return len(fresh)
+
+    def candidates(self, query: str, files: list[str]) -> list[str]:
+        grams = query_trigrams(query)
+        if not grams:
+            return files
+        with self._lock:
+            postings = sorted((self._postings.get(g, set()) for g in grams), key=len)
+            ids = set(postings[0]).intersection(*postings[1:])
+            return [rel for rel in files if rel in self._manifest and self._manifest[rel][0] in ids]
+
+    def _load(self) -> None:
+        try:
+            manifest = json.loads((self.store_dir / "manifest.json").read_text(encoding="utf-8"))
+            postings = json.loads((self.store_dir / "postings.json").read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return
+        if manifest.get("version") != _INDEX_VERSION or manifest.get("max_bytes") != self.max_bytes:
+            return
+        self._manifest = manifest.get("files", {})
+        self._next_id = manifest.get("next_id", 0)
+        self._postings = {gram: set(ids) for gram, ids in postings.items()}
+
+    def _save(self) -> None:
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        manifest = {
+            "version": _INDEX_VERSION,
+            "max_bytes": self.max_bytes,
+            "next_id": self._next_id,
+            "files": self._manifest,
+        }
+        postings = {gram: sorted(ids) for gram, ids in self._postings.items()}
+        for name, body in (("postings.json", postings), ("manifest.json", manifest)):
+            tmp_path = self.store_dir / f"{name}.tmp"
+            tmp_path.write_text(json.dumps(body, separators=(",", ":")), encoding="utf-8")
+            tmp_path.replace(self.store_dir / name)
+
+
+_INDEXES: dict[Path, ContentIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_content_index(config: Config, project_root: Path, workspace_root: Path) -> ContentIndex | None:
+    fa = config.file_access
+    if not fa.index_enabled or not fa.content_index_enabled:
+        return None
+    store_dir = index_store_path(config, project_root, workspace_root).with_suffix(".content")
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(store_dir)
+        if index is None or index.max_bytes != fa.max_read_bytes:
+            index = ContentIndex(workspace_root, store_dir, fa.max_read_bytes, fa.index_refresh_sec)
+            _INDEXES[store_dir] = index
+        return index
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import mmap
+import re
+import threading
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from claw_demo.skills.sandbox import open_nofollow
+
+_BINARY_SNIFF_BYTES = 8192
+_SNIPPET_CHARS = 160
+
+
+def compile_query(query: str, regex: bool = False) -> re.Pattern[bytes]:
+    source = query if regex else re.escape(query)
+    return re.compile(source.encode("utf-8"), re.IGNORECASE | re.MULTILINE)
+
+
+def _snippet(line: bytes) -> str:
+    text = line.decode("utf-8", errors="replace").strip()
+    return text if len(text) <= _SNIPPET_CHARS else f"{text[:_SNIPPET_CHARS]}..."
+
+
+def scan_file(
+    path: Path, pattern: re.Pattern[bytes], max_bytes: int, limit: int, stop: threading.Event | None = None
+) -> list[tuple[int, str]]:
+    try:
+        size = path.stat().st_size
+        if size == 0 or size > max_bytes:
+            return []
+        with open_nofollow(path) as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm.find(b"\0", 0, _BINARY_SNIFF_BYTES) >= 0:
+                return []
+            hits: list[tuple[int, str]] = []
+            pos = 0
+            line_no = 1
+            counted_to = 0
+            while len(hits) < limit and pos <= size:
+                if stop is not None and stop.is_set():
+                    break
+                match = pattern.search(mm, pos)
+                if match is None:
+                    break
+                start = mm.rfind(b"\n", 0, match.start()) + 1
+                end = mm.find(b"\n", match.start())
+                end = size if end < 0 else end
+                line_no += mm[counted_to:start].count(b"\n")
+                counted_to = start
+                hits.append((line_no, _snippet(mm[start:end])))
+                # One hit per line; the next search starts on the following line.
+                pos = end + 1
+            return hits
+    except (OSError, ValueError):
+        return []
+
+
+# Scans files concurrently and keeps the caller's file order in the output, so a capped
+# result is the same prefix a sequential scan would produce. Once enough hits are in, the
+# remaining files are cancelled and in-flight scans stop at their next match.
+def search_contents(
+    files: Iterable[tuple[str, Path]],
+    pattern: re.Pattern[bytes],
+    max_bytes: int,
+    limit: int = 50,
+    workers: int = 8,
+) -> list[str]:
+    stop = threading.Event()
+    lines: list[str] = []
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="claw-grep") as pool:
+        futures = [
+            (rel, pool.submit(scan_file, path, pattern, max_bytes, limit, stop)) for rel, path in files
+        ]
+        try:
+            for rel, future in futures:
+                for line_no, text in future.result():
+                    lines.append(f"{rel}:{line_no}:{text}")
+                    if len(lines) >= limit:
+                        stop.set()
+                        return lines
+        finally:
+            for _rel, future in futures:
+                future.cancel()
+    return lines
@@ -7,9 +7,13 @@ from typing import Any
 
 from claw_demo.config.schema import Config
 from claw_demo.config.workspace import resolve_workspace_dir
+from claw_demo.llm.context_budget import ContextBudget
+from claw_demo.llm.resilience import Deadline
+from claw_demo.llm.routing import LLMRouter
 from claw_demo.skills.loader import SkillLoader
 from claw_demo.skills.models import AgentSkillSpec, SkillContext, SkillResult
-from claw_demo.skills.toolbox import TOOL_SCHEMAS, ToolExecutor
+from claw_demo.skills.tool_cache import ToolResultCache, build_tool_cache
+from claw_demo.skills.toolbox import TOOL_SCHEMAS, ToolExecutor, select_tool_schemas
 
 
 @dataclass
@@ -21,23 +25,22 @@ class SkillCheckReport:
 
 
 class AgentSkillDispatcher:
-    def __init__(self, config: Config, project_root: Path) -> None:
+    def __init__(self, config: Config, project_root: Path, tool_cache: ToolResultCache | None = None) -> None:
         self.config = config
         self.project_root = project_root
         self.workspace_root = resolve_workspace_dir(config, project_root)
         skills_root = Path(__file__).resolve().parent
         import_roots = [Path(p).expanduser().resolve() for p in config.skills.import_dirs if str(p).strip()]
         self.loader = SkillLoader(skills_root, import_roots=import_roots)
-        self.tool_executor = ToolExecutor()
-        self._client = None
-        if config.llm.api_key:
-            from openai import OpenAI
-
-            self._client = OpenAI(
-                base_url=config.llm.base_url,
-                api_key=config.llm.api_key,
-                timeout=config.llm.timeout_sec,
-            )
+        self.tool_executor = ToolExecutor(
+            max_workers=config.skills.max_parallel_tools,
+            tool_concurrency=config.skills.tool_concurrency,
+            result_cache=tool_cache if tool_cache is not None else build_tool_cache(config),
+        )
+        self.router = LLMRouter(config)
+        self._route = self.router.resolve("skill")
+        self._client = self.router.client(self._route)
+        self.budget = ContextBudget.from_config(config)
 
     def enabled_skills(self) -> list[str]:
         enabled = set(self.config.skills.enabled)
@@ -125,8 +128,11 @@ class AgentSkillDispatcher:
         recent_messages: list[dict[str, str]],
         memory_snippets: list[str],
     ) -> SkillResult:
-        recent_text = "\n".join(f"{m.get('role','')}: {m.get('content','')}" for m in recent_messages[-6:])
-        memory_text = "\n".join(memory_snippets[:5]) if memory_snippets else "(empty)"
+        recent_text = "\n".join(
+            f"{m.get('role','')}: {m.get('content','')}" for m in self.budget.cap_history(recent_messages)
+        )
+        memory_snippets = self.budget.cap_memory(memory_snippets)
+        memory_text = "\n".join(memory_snippets) if memory_snippets else "(empty)"
         system = (
             "你是技能代理执行器。"
             f"\n技能名: {spec.name}"
@@ -143,15 +149,30 @@ class AgentSkillDispatcher:
             {"role": "user", "content": request_text},
         ]
 
+        # External skills without a same-named tool fall back to every enabled tool.
+        tools = select_tool_schemas(self.config.skills.enabled, [spec.name])
+        deadline = Deadline.after(self.config.skills.timeout_sec)
         max_steps = max(1, int(self.config.skills.max_steps))
         for _ in range(max_steps):
-            resp = self._client.chat.completions.create(
-                model=self.config.llm.model,
-                messages=messages,
-                temperature=self.config.llm.temperature,
-                tools=TOOL_SCHEMAS,
-                tool_choice="auto",
-            )
+            if deadline.expired:
+                return self._deadline_result(deadline)
+            self.budget.fit(messages)
+            route = self.router.select("skill")
+            client = self._client if route.name == self._route.name else self.router.client(route)
+            try:
+                resp = self.router.complete(
+                    route,
+                    client,
+                    deadline,
+                    messages=messages,
+                    temperature=self.config.llm.temperature,
+                    tools=tools,
+                    tool_choice="auto",
+                )
+            except Exception as exc:
+                if deadline.expired:
+                    return self._deadline_result(deadline)
+                return SkillResult(ok=False, text=f"LLM 调用失败: {exc}")
             msg = resp.choices[0].message
             tool_calls = msg.tool_calls or []
 
@@ -173,17 +194,20 @@ class AgentSkillDispatcher:
                         ],
                     }
                 )
+                calls: list[tuple[str, dict[str, Any]]] = []
                 for tc in tool_calls:
                     try:
                         args = json.loads(tc.function.arguments or "{}")
                     except json.JSONDecodeError:
                         args = {}
-                    tool_result = self.tool_executor.execute(tc.function.name, args, ctx)
+                    calls.append((tc.function.name, args if isinstance(args, dict) else {}))
+                outcomes = self.tool_executor.execute_many(calls, ctx, deadline=deadline)
+                for tc, outcome in zip(tool_calls, outcomes):
                     messages.append(
                         {
                             "role": "tool",
                             "tool_call_id": tc.id,
-                            "content": tool_result.text,
+                            "content": outcome.result.text,
                         }
                     )
                 continue
@@ -195,3 +219,6 @@ class AgentSkillDispatcher:
             messages.append({"role": "assistant", "content": "请给出最终答案。"})
 
         return SkillResult(ok=False, text="技能代理执行超出最大步骤，请重试。")
+
+    def _deadline_result(self, deadline: Deadline) -> SkillResult:
+        return SkillResult(ok=False, text=f"技能执行超过 {deadline.budget_sec:.0f} 秒时限，已停止。")
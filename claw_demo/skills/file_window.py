@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import mmap
+from dataclasses import dataclass
+from typing import BinaryIO
+
+
+@dataclass
+class FileWindow:
+    text: str
+    size: int
+    start: int
+    end: int
+    cursor: str = ""
+
+    def render(self) -> str:
+        if not self.cursor:
+            return self.text
+        # The cursor leads the text so that clipping the tail of the message never loses it.
+        return f"[已截断: 字节 {self.start}-{self.end} / 共 {self.size} 字节，继续读取请传 {self.cursor}]\n{self.text}"
+
+
+def _char_start(mm: mmap.mmap, pos: int) -> int:
+    # Move back to the first byte of a UTF-8 sequence so a window never splits a character.
+    while 0 < pos < len(mm) and mm[pos] & 0xC0 == 0x80:
+        pos -= 1
+    return pos
+
+
+def _line_start(mm: mmap.mmap, line: int) -> int:
+    pos = 0
+    for _ in range(line - 1):
+        nl = mm.find(b"\n", pos)
+        if nl < 0:
+            return len(mm)
+        pos = nl + 1
+    return pos
+
+
+def _decode(mm: mmap.mmap, start: int, end: int) -> str:
+    return mm[start:end].decode("utf-8", errors="replace")
+
+
+def read_bytes(mm: mmap.mmap, offset: int, length: int) -> FileWindow:
+    size = len(mm)
+    start = _char_start(mm, min(offset, size))
+    end = _char_start(mm, min(size, start + length))
+    if end == start and start < size:
+        end = min(size, start + length)
+    cursor = f"offset={end}" if end < size else ""
+    return FileWindow(_decode(mm, start, end), size, start, end, cursor)
+
+
+def read_lines(mm: mmap.mmap, start_line: int, end_line: int | None, budget: int) -> FileWindow:
+    size = len(mm)
+    start = _line_start(mm, start_line)
+    line = start_line
+    end = start
+    while end < size and (end_line is None or line <= end_line):
+        nl = mm.find(b"\n", end)
+        line_end = size if nl < 0 else nl + 1
+        if line_end - start > budget:
+            if end == start:
+                # A single line longer than the budget is split by bytes instead.
+                return read_bytes(mm, start, budget)
+            break
+        end = line_end
+        line += 1
+    truncated = end < size and (end_line is None or line <= end_line)
+    cursor = f"start_line={line}" if truncated else ""
+    return FileWindow(_decode(mm, start, end), size, start, end, cursor)
+
+
+def read_tail(mm: mmap.mmap, lines: int, budget: int) -> FileWindow:
+    size = len(mm)
+    limit = max(0, size - budget)
+    # A trailing newline terminates the last line rather than starting an empty one.
+    pos = size - 1 if mm[size - 1] == ord("\n") else size
+    start = limit
+    for _ in range(lines):
+        nl = mm.rfind(b"\n", limit, pos)
+        if nl < 0:
+            start = limit
+            break
+        pos = nl
+        start = nl + 1
+    while start < size and mm[start] & 0xC0 == 0x80:
+        start += 1
+    cursor = f"offset={max(0, start - budget)}" if start > 0 else ""
+    return FileWindow(_decode(mm, start, size), size, start, size, cursor)
+
+
+# Returns only the requested part of a file. Reads go through mmap so a slice near the end of
+# a multi-gigabyte log costs the pages it touches, and every window is capped at budget bytes.
+def read_window(
+    fh: BinaryIO,
+    budget: int,
+    offset: int | None = None,
+    length: int | None = None,
+    start_line: int | None = None,
+    end_line: int | None = None,
+    head: int | None = None,
+    tail: int | None = None,
+) -> FileWindow:
+    if fh.seek(0, 2) == 0:
+        return FileWindow("", 0, 0, 0)
+    with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if tail is not None:
+            return read_tail(mm, tail, budget)
+        if head is not None:
+            return read_lines(mm, 1, head, budget)
+        if start_line is not None or end_line is not None:
+            return read_lines(mm, start_line or 1, end_line, budget)
+        return read_bytes(mm, offset or 0, min(length or budget, budget))
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import heapq
+import os
+import time
+from collections.abc import Iterable
+from pathlib import Path
+
+SCORE_MATCH = 16
+BONUS_CONSECUTIVE = 8
+BONUS_BOUNDARY = 10
+BONUS_BASENAME = 8
+BONUS_EXACT = 30
+BONUS_EXACT_NAME = 40
+BONUS_PREFIX = 15
+BONUS_RECENT = 12
+PENALTY_GAP_START = 3
+PENALTY_GAP_EXTENSION = 1
+RECENT_HALF_LIFE_DAYS = 7.0
+
+_BOUNDARY_CHARS = "/_-. "
+
+
+def _positions(query: str, text: str) -> list[int] | None:
+    # fzf v1: a forward pass finds where the subsequence ends, a backward pass from there finds
+    # the latest start, and matching inside that window keeps the positions as tight as possible.
+    end = -1
+    for ch in query:
+        end = text.find(ch, end + 1)
+        if end < 0:
+            return None
+    start = end + 1
+    for ch in reversed(query):
+        start = text.rfind(ch, 0, start)
+    positions: list[int] = []
+    pos = start - 1
+    for ch in query:
+        pos = text.find(ch, pos + 1)
+        positions.append(pos)
+    return positions
+
+
+def _is_boundary(text: str, pos: int) -> bool:
+    if pos == 0 or text[pos - 1] in _BOUNDARY_CHARS:
+        return True
+    return text[pos - 1].islower() and text[pos].isupper()
+
+
+def _score_positions(text: str, positions: list[int]) -> int:
+    score = 0
+    run_bonus = 0
+    for i, pos in enumerate(positions):
+        if i and pos == positions[i - 1] + 1:
+            # A contiguous run keeps the bonus of the boundary it started on.
+            run_bonus = max(run_bonus, BONUS_CONSECUTIVE)
+        else:
+            if i:
+                score -= PENALTY_GAP_START + PENALTY_GAP_EXTENSION * (pos - positions[i - 1] - 2)
+            run_bonus = 0
+        if _is_boundary(text, pos):
+            run_bonus = max(run_bonus, BONUS_BOUNDARY)
+        score += SCORE_MATCH + run_bonus
+    return score
+
+
+def fuzzy_score(query: str, path: str) -> int | None:
+    q = query.lower()
+    if not q:
+        return None
+    name_start = path.rfind("/") + 1
+    name = path[name_start:]
+    lowered = name.lower()
+    positions = _positions(q, lowered)
+    if positions is not None:
+        score = _score_positions(name, positions) + BONUS_BASENAME
+        if q in lowered:
+            score += BONUS_EXACT
+            if lowered.startswith(q):
+                score += BONUS_PREFIX
+            if q in (lowered, _stem(lowered)):
+                score += BONUS_EXACT_NAME
+    else:
+        positions = _positions(q, path.lower())
+        if positions is None:
+            return None
+        score = _score_positions(path, positions)
+    return score * 10
+
+
+def _stem(name: str) -> str:
+    dot = name.rfind(".")
+    return name[:dot] if dot > 0 else name
+
+
+def _rank_key(item: tuple[int, str]) -> tuple[int, int, int, str]:
+    # Higher score first; ties go to the shorter basename, then the shorter path (as in fzf),
+    # then alphabetical order, so equal candidates always come back in the same order.
+    score, path = item
+    return (-score, len(path) - path.rfind("/") - 1, len(path), path)
+
+
+def _recency_bonus(path: Path, now: float) -> int:
+    try:
+        age_days = max(0.0, now - os.stat(path).st_mtime) / 86400
+    except OSError:
+        return 0
+    return round(BONUS_RECENT * 10 * 0.5 ** (age_days / RECENT_HALF_LIFE_DAYS))
+
+
+# Scores every candidate, keeps a bounded heap of the best, and only stats that shortlist for
+# the recency bonus so ranking a large tree costs a handful of syscalls.
+def rank_paths(query: str, paths: Iterable[str], root: Path, limit: int = 20) -> list[tuple[str, int]]:
+    scored = ((score, path) for path in paths if (score := fuzzy_score(query, path)) is not None)
+    shortlist = heapq.nsmallest(limit * 2, scored, key=_rank_key)
+    now = time.time()
+    ranked = ((score + _recency_bonus(root / path, now), path) for score, path in shortlist)
+    return [(path, score) for score, path in heapq.nsmallest(limit, ranked, key=_rank_key)]
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+import zlib
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+from claw_demo.config.schema import Config
+from claw_demo.llm.cache import CacheStats, ResponseCache, get_response_cache
+from claw_demo.skills.summarizer import split_sentences, summarize_text
+
+SummarizeFn = Callable[[str, int], str]
+
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+
+
+def _split_long(paragraph: str, chunk_chars: int) -> list[str]:
+    pieces: list[str] = []
+    current = ""
+    for sentence in split_sentences(paragraph) or [paragraph]:
+        while len(sentence) > chunk_chars:
+            pieces.append(sentence[:chunk_chars])
+            sentence = sentence[chunk_chars:]
+        if current and len(current) + len(sentence) > chunk_chars:
+            pieces.append(current)
+            current = ""
+        current += sentence
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def _ends_chunk(paragraph: str, size: int, chunk_chars: int) -> bool:
+    # Content-defined cut points: besides the size cap, a chunk may end after any paragraph
+    # whose hash falls in a fixed bucket. Boundaries then depend on the text around them, not
+    # on offsets, so an edit early in a file leaves later chunks (and their cache keys) intact.
+    if size >= chunk_chars:
+        return True
+    return size >= chunk_chars // 4 and zlib.crc32(paragraph.encode("utf-8")) % 4 == 0
+
+
+def split_chunks(text: str, chunk_chars: int) -> list[str]:
+    chunks: list[str] = []
+    current: list[str] = []
+    size = 0
+    for raw in _PARAGRAPH_RE.split(text):
+        paragraph = raw.strip()
+        if not paragraph:
+            continue
+        for piece in _split_long(paragraph, chunk_chars) if len(paragraph) > chunk_chars else [paragraph]:
+            if current and size + len(piece) > chunk_chars:
+                chunks.append("\n\n".join(current))
+                current, size = [], 0
+            current.append(piece)
+            size += len(piece) + 2
+            if _ends_chunk(piece, size, chunk_chars):
+                chunks.append("\n\n".join(current))
+                current, size = [], 0
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+# Map: chunks are summarized concurrently as they arrive, with at most 2 * workers in flight,
+# and each partial summary is cached under the hash of its chunk. Reduce: partial summaries are
+# joined and, while that is still longer than one chunk, chunked and summarized again.
+class MapReduceSummarizer:
+    def __init__(
+        self,
+        summarize: SummarizeFn,
+        target_chars: int = 300,
+        chunk_chars: int = 4000,
+        workers: int = 4,
+        cache: ResponseCache | None = None,
+        namespace: str = "local",
+        fallback: SummarizeFn = summarize_text,
+    ) -> None:
+        self.summarize = summarize
+        self.target_chars = target_chars
+        self.chunk_chars = chunk_chars
+        self.partial_chars = max(target_chars, chunk_chars // 8)
+        self.workers = max(1, workers)
+        self.cache = cache
+        self.namespace = namespace
+        self.fallback = fallback
+        self.stats = CacheStats()
+        self.total_chars = 0
+        self.chunks = 0
+        self._lock = threading.Lock()
+
+    def run(self, text: str) -> str:
+        self.total_chars += len(text)
+        return self._run_text(text)
+
+    def _run_text(self, text: str) -> str:
+        if len(text) <= self.target_chars:
+            return text.strip()
+        if len(text) <= self.chunk_chars:
+            return self._summarize_one(text, self.target_chars)
+        return self._reduce(self._map(split_chunks(text, self.chunk_chars)))
+
+    def run_stream(self, read: Callable[[], str]) -> str:
+        # Pulls text until read() returns "", so only the unchunked tail of the input and the
+        # partial summaries are held in memory. Chunks are cut from complete paragraphs only,
+        # and the last one is carried over, so the cut points match a whole-text split_chunks.
+        summaries: list[str] = []
+        pending: deque[Future[str]] = deque()
+        buffer = ""
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="claw-summary") as pool:
+            while piece := read():
+                self.total_chars += len(piece)
+                buffer += piece
+                if len(buffer) < self.chunk_chars * 2:
+                    continue
+                last_break = buffer.rfind("\n\n")
+                if last_break < self.chunk_chars:
+                    if len(buffer) < self.chunk_chars * 4:
+                        continue
+                    # One huge paragraph: a hard cut keeps the buffer bounded.
+                    last_break = self.chunk_chars * 2
+                head = split_chunks(buffer[:last_break], self.chunk_chars)
+                if not head:
+                    # The prefix was only whitespace, which split_chunks drops anyway.
+                    buffer = buffer[last_break:]
+                    continue
+                *ready, carry = head
+                buffer = f"{carry}{buffer[last_break:]}"
+                for chunk in ready:
+                    pending.append(pool.submit(self._summarize_one, chunk, self.partial_chars))
+                    self.chunks += 1
+                    while len(pending) > self.workers * 2:
+                        summaries.append(pending.popleft().result())
+            tail = split_chunks(buffer, self.chunk_chars)
+            if not summaries and not pending and len(tail) <= 1:
+                return self._run_text(tail[0]) if tail else ""
+            for chunk in tail:
+                pending.append(pool.submit(self._summarize_one, chunk, self.partial_chars))
+                self.chunks += 1
+            summaries.extend(future.result() for future in pending)
+        return self._reduce(summaries)
+
+    def _map(self, chunks: list[str]) -> list[str]:
+        self.chunks += len(chunks)
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="claw-summary") as pool:
+            return list(pool.map(lambda chunk: self._summarize_one(chunk, self.partial_chars), chunks))
+
+    def _reduce(self, summaries: list[str]) -> str:
+        combined = "\n\n".join(s for s in summaries if s)
+        while len(combined) > self.chunk_chars:
+            reduced = "\n\n".join(s for s in self._map(split_chunks(combined, self.chunk_chars)) if s)
+            if len(reduced) >= len(combined):
+                break
+            combined = reduced
+        return self._summarize_one(combined, self.target_chars)
+
+    def _summarize_one(self, text: str, target_chars: int) -> str:
+        if not text.strip():
+            return ""
+        key = hashlib.sha256(f"{self.namespace}\0{target_chars}\0{text}".encode("utf-8")).hexdigest()
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                with self._lock:
+                    self.stats.hits += 1
+                return str(cached.get("summary", ""))
+        with self._lock:
+            self.stats.misses += 1
+        try:
+            summary = self.summarize(text, target_chars)
+        except Exception:
+            # A failed remote summary is replaced locally but never cached under its namespace.
+            return self.fallback(text, target_chars)
+        if self.cache is not None:
+            self.cache.put(key, {"summary": summary})
+        return summary
+
+
+def build_summary_cache(config: Config, project_root: Path) -> ResponseCache | None:
+    cfg = config.skills.summarize
+    if not cfg.cache_enabled:
+        return None
+    return get_response_cache(
+        project_root / cfg.cache_root,
+        ttl_sec=cfg.cache_ttl_sec,
+        max_entries=cfg.cache_max_entries,
+        max_bytes=cfg.cache_max_bytes,
+    )
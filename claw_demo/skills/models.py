@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
 from typing import Any
 
 from claw_demo.config.schema import Config
+from claw_demo.skills.sandbox import Sandbox
 
 
 @dataclass
@@ -13,6 +15,10 @@ class SkillContext:
     project_root: Path
     workspace_root: Path
 
+    @cached_property
+    def sandbox(self) -> Sandbox:
+        return Sandbox(self.workspace_root, self.config.file_access.allowed_roots)
+
 
 @dataclass
 class SkillResult:
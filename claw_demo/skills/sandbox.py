@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import errno
+import os
+import stat
+from pathlib import Path
+from typing import BinaryIO
+
+_O_NOFOLLOW = getattr(os, "O_NOFOLLOW", 0)
+_O_DIRECTORY = getattr(os, "O_DIRECTORY", 0)
+_O_NONBLOCK = getattr(os, "O_NONBLOCK", 0)
+_DIR_FD = os.open in os.supports_dir_fd and bool(_O_NOFOLLOW and _O_DIRECTORY)
+# Errors a component walk raises when it meets a symlink (ENOTDIR on some platforms).
+_SYMLINK_ERRNOS = {errno.ELOOP, errno.ENOTDIR, getattr(errno, "EMLINK", errno.ELOOP)}
+
+
+class SandboxError(PermissionError):
+    pass
+
+
+def open_nofollow(path: Path) -> BinaryIO:
+    # For paths the walker already found inside a root: a symlinked file must not pull in
+    # content from outside it.
+    fd = os.open(path, os.O_RDONLY | _O_NOFOLLOW | _O_NONBLOCK)
+    return _regular_file(fd)
+
+
+def _regular_file(fd: int) -> BinaryIO:
+    try:
+        if not stat.S_ISREG(os.fstat(fd).st_mode):
+            raise IsADirectoryError(errno.EISDIR, "not a regular file")
+    except BaseException:
+        os.close(fd)
+        raise
+    return os.fdopen(fd, "rb")
+
+
+# Allowed roots are resolved once per SkillContext. Containment is then a string-prefix test,
+# and opens walk down from the root's directory fd without following symlinks, so a link
+# swapped in after the check cannot redirect the read outside the sandbox.
+class Sandbox:
+    def __init__(self, base: Path, allowed_roots: list[str]) -> None:
+        self.base = base
+        resolved = {os.path.realpath(base / root) for root in allowed_roots}
+        # Longest first, so a path is attributed to the innermost root that contains it.
+        self.roots = tuple(sorted(resolved, key=len, reverse=True))
+
+    def root_of(self, real_path: str) -> str | None:
+        for root in self.roots:
+            if real_path == root or real_path.startswith(root.rstrip(os.sep) + os.sep):
+                return root
+        return None
+
+    def contains(self, path: Path) -> bool:
+        return self.root_of(os.path.realpath(path)) is not None
+
+    def open(self, rel: str) -> BinaryIO:
+        target = os.path.normpath(os.path.join(self.base, rel))
+        root = self.root_of(target)
+        if root is None:
+            target = os.path.realpath(target)
+            root = self.root_of(target)
+            if root is None:
+                raise SandboxError(errno.EACCES, "path outside allowed roots", rel)
+        try:
+            return self._open_beneath(root, target)
+        except OSError as exc:
+            if isinstance(exc, SandboxError) or exc.errno not in _SYMLINK_ERRNOS:
+                raise
+        # A symlink on the way is followed once, and only if it lands inside an allowed root.
+        real = os.path.realpath(target)
+        root = self.root_of(real)
+        if root is None:
+            raise SandboxError(errno.EACCES, "symlink leaves allowed roots", rel)
+        return self._open_beneath(root, real)
+
+    def _open_beneath(self, root: str, target: str) -> BinaryIO:
+        if not _DIR_FD:
+            real = os.path.realpath(target)
+            if self.root_of(real) is None:
+                raise SandboxError(errno.EACCES, "path outside allowed roots", target)
+            return _regular_file(os.open(real, os.O_RDONLY | _O_NONBLOCK))
+        parts = [part for part in os.path.relpath(target, root).split(os.sep) if part not in ("", ".")]
+        if not parts:
+            raise IsADirectoryError(errno.EISDIR, "is a directory", target)
+        fd = os.open(root, os.O_RDONLY | _O_DIRECTORY)
+        try:
+            for part in parts[:-1]:
+                next_fd = os.open(part, os.O_RDONLY | _O_DIRECTORY | _O_NOFOLLOW, dir_fd=fd)
+                os.close(fd)
+                fd = next_fd
+            file_fd = os.open(parts[-1], os.O_RDONLY | _O_NOFOLLOW | _O_NONBLOCK, dir_fd=fd)
+        finally:
+            os.close(fd)
+        return _regular_file(file_fd)
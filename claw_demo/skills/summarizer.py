@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[。！？!?；…])\s*|(?<=[.;])\s+|\s*\n\s*")
+_WORD_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+_CJK_RUN_RE = re.compile(r"[\u3400-\u9fff\uf900-\ufaff]+")
+_CJK_END_RE = re.compile(r"[\u3000-\u303f\u3400-\u9fff\uf900-\ufaff\uff00-\uffef]$")
+_CLAUSE_BREAK_RE = re.compile(r"[，,、：:]\s*|\s+")
+_STOPWORDS = frozenset(
+    "a an the and or but if of to in on at by for with from as is are was were be been being it its this that "
+    "these those i you he she we they them his her our their not no do does did so than then there here".split()
+)
+_MIN_SENTENCE_CHARS = 2
+_REDUNDANCY = 0.6
+
+
+def split_sentences(text: str) -> list[str]:
+    return [s.strip() for s in _SENTENCE_SPLIT_RE.split(text) if len(s.strip()) >= _MIN_SENTENCE_CHARS]
+
+
+# Text without sentence punctuation would otherwise come back as one sentence, and the first
+# sentence selected is always kept; over-long sentences are cut at the last comma or space
+# before max_chars, or hard-cut when there is none, so one sentence never exceeds the target.
+def _split_long_sentence(sentence: str, max_chars: int) -> list[str]:
+    pieces: list[str] = []
+    while len(sentence) > max_chars:
+        cut = 0
+        for match in _CLAUSE_BREAK_RE.finditer(sentence, 1, max_chars):
+            cut = match.end()
+        cut = cut or max_chars
+        pieces.append(sentence[:cut].strip())
+        sentence = sentence[cut:].lstrip()
+    if len(sentence) >= _MIN_SENTENCE_CHARS:
+        pieces.append(sentence)
+    return pieces
+
+
+# English words minus stopwords, plus character bigrams for Chinese runs, which stand in for
+# word segmentation well enough to weight sentences.
+def sentence_terms(sentence: str) -> list[str]:
+    lowered = sentence.lower()
+    terms = [w for w in _WORD_RE.findall(lowered) if w not in _STOPWORDS]
+    for run in _CJK_RUN_RE.findall(lowered):
+        terms.extend(run[i : i + 2] for i in range(max(1, len(run) - 1)))
+    return terms
+
+
+@dataclass
+class _Sentence:
+    position: int
+    text: str
+    terms: frozenset[str]
+    score: float = 0.0
+
+
+def _score(sentences: list[_Sentence], counts: list[Counter[str]]) -> None:
+    # TF-IDF over sentences as documents; each sentence is scored by cosine similarity to the
+    # TF-IDF centroid, so it ranks high when it carries the text's recurring, distinctive terms.
+    df: Counter[str] = Counter()
+    for sentence in sentences:
+        df.update(sentence.terms)
+    n = len(sentences)
+    idf = {term: math.log((1 + n) / (1 + freq)) + 1 for term, freq in df.items()}
+    centroid: Counter[str] = Counter()
+    for tf in counts:
+        for term, freq in tf.items():
+            centroid[term] += freq * idf[term]
+    centroid_norm = math.sqrt(sum(v * v for v in centroid.values())) or 1.0
+    for sentence, tf in zip(sentences, counts):
+        weights = {term: freq * idf[term] for term, freq in tf.items()}
+        norm = math.sqrt(sum(v * v for v in weights.values())) or 1.0
+        sentence.score = sum(w * centroid[t] for t, w in weights.items()) / (norm * centroid_norm)
+
+
+def _jaccard(a: frozenset[str], b: frozenset[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _select(sentences: list[_Sentence], target_chars: int) -> list[_Sentence]:
+    chosen: list[_Sentence] = []
+    used = 0
+    for sentence in sorted(sentences, key=lambda s: (-s.score, s.position)):
+        if used >= target_chars:
+            break
+        if any(_jaccard(sentence.terms, other.terms) > _REDUNDANCY for other in chosen):
+            continue
+        if chosen and used + len(sentence.text) > target_chars * 1.2:
+            continue
+        chosen.append(sentence)
+        used += len(sentence.text)
+    return sorted(chosen, key=lambda s: s.position)
+
+
+def _join(sentences: Iterable[str]) -> str:
+    out = ""
+    for sentence in sentences:
+        if out and not (_CJK_END_RE.search(out) and _CJK_END_RE.search(sentence[:1])):
+            out += " "
+        out += sentence
+    return out
+
+
+# Extractive summary over a stream of text. Input is consumed in blocks of block_chars; each
+# block keeps only its best non-redundant sentences as candidates, and the candidate pool is
+# itself re-ranked whenever it grows past a few summaries' worth, so memory stays bounded by
+# the block size no matter how long the input is.
+class ExtractiveSummarizer:
+    def __init__(self, target_chars: int = 300, block_chars: int = 20000) -> None:
+        self.target_chars = target_chars
+        self.block_chars = block_chars
+        self.total_chars = 0
+        self._buffer = ""
+        self._position = 0
+        self._candidates: list[_Sentence] = []
+
+    def feed(self, text: str) -> ExtractiveSummarizer:
+        self.total_chars += len(text)
+        self._buffer += text
+        while len(self._buffer) >= self.block_chars:
+            cut = self._buffer.rfind("\n", 0, self.block_chars)
+            cut = self.block_chars if cut <= 0 else cut + 1
+            self._consume(self._buffer[:cut])
+            self._buffer = self._buffer[cut:]
+        return self
+
+    def finish(self) -> str:
+        self._consume(self._buffer)
+        self._buffer = ""
+        return _join(s.text for s in self._rank(self._candidates, self.target_chars))
+
+    def _consume(self, block: str) -> None:
+        sentences = []
+        for sentence in split_sentences(block):
+            for text in _split_long_sentence(sentence, self.target_chars):
+                sentences.append(_Sentence(self._position, text, frozenset(sentence_terms(text))))
+                self._position += 1
+        if not sentences:
+            return
+        self._candidates.extend(self._rank(sentences, self.target_chars * 2))
+        if sum(len(s.text) for s in self._candidates) > self.target_chars * 8:
+            self._candidates = self._rank(self._candidates, self.target_chars * 4)
+
+    def _rank(self, sentences: list[_Sentence], budget: int) -> list[_Sentence]:
+        if not sentences:
+            return []
+        _score(sentences, [Counter(sentence_terms(s.text)) for s in sentences])
+        return _select(sentences, budget)
+
+
+def summarize_text(text: str, target_chars: int = 300) -> str:
+    if len(text) <= target_chars:
+        return text.strip()
+    return ExtractiveSummarizer(target_chars).feed(text).finish() or text[:target_chars]
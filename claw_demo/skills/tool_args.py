@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field, ValidationError, model_validator
+
+# Argument models of the built-in tools. They live apart from toolbox so the result cache can
+# key entries by the same canonical form as speculative matching without importing the executor.
+
+
+class WeatherToolArgs(BaseModel):
+    city: str | None = None
+
+
+class FileSearchToolArgs(BaseModel):
+    query: str = Field(min_length=1)
+    path: str = "./"
+    mode: Literal["name", "content"] = "name"
+    regex: bool = False
+    glob: str | None = None
+    ext: list[str] = Field(default_factory=list)
+    min_bytes: int | None = Field(default=None, ge=0)
+    max_bytes: int | None = Field(default=None, ge=0)
+    modified_within_days: float | None = Field(default=None, gt=0)
+
+
+class FileReadToolArgs(BaseModel):
+    path: str = ""
+    paths: list[str] = Field(default_factory=list, max_length=20)
+    offset: int | None = Field(default=None, ge=0)
+    length: int | None = Field(default=None, gt=0)
+    start_line: int | None = Field(default=None, ge=1)
+    end_line: int | None = Field(default=None, ge=1)
+    head: int | None = Field(default=None, gt=0)
+    tail: int | None = Field(default=None, gt=0)
+
+    @model_validator(mode="after")
+    def _one_window(self) -> FileReadToolArgs:
+        modes = [
+            self.offset is not None or self.length is not None,
+            self.start_line is not None or self.end_line is not None,
+            self.head is not None,
+            self.tail is not None,
+        ]
+        if sum(modes) > 1:
+            raise ValueError("offset/length、start_line/end_line、head、tail 只能选择一种")
+        if bool(self.path) == bool(self.paths):
+            raise ValueError("path 与 paths 需且只能提供一个")
+        return self
+
+
+class SummarizeToolArgs(BaseModel):
+    text: str = ""
+    path: str = ""
+    max_chars: int = Field(default=300, ge=50, le=4000)
+
+    @model_validator(mode="after")
+    def _one_source(self) -> SummarizeToolArgs:
+        if bool(self.text.strip()) == bool(self.path):
+            raise ValueError("text 与 path 需且只能提供一个")
+        return self
+
+
+class EmailToolArgs(BaseModel):
+    to: str
+    subject: str
+    body: str
+
+
+class TimeToolArgs(BaseModel):
+    timezone: str | None = None
+
+
+_TOOL_ARG_MODELS: dict[str, type[BaseModel]] = {
+    "weather": WeatherToolArgs,
+    "file_search": FileSearchToolArgs,
+    "file_read": FileReadToolArgs,
+    "summarize": SummarizeToolArgs,
+    "email": EmailToolArgs,
+    "time": TimeToolArgs,
+}
+
+
+def canonical_tool_args(tool_name: str, tool_args: dict[str, Any]) -> str:
+    # Defaults are filled in, so {"query": "x"} and {"query": "x", "path": "./"} compare equal.
+    model = _TOOL_ARG_MODELS.get(tool_name)
+    try:
+        payload = model.model_validate(tool_args).model_dump() if model is not None else tool_args
+    except ValidationError:
+        payload = tool_args
+    return json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from claw_demo.config.schema import Config, ToolCacheConfig
+from claw_demo.llm.cache import CacheStats
+from claw_demo.skills.models import SkillContext, SkillResult
+from claw_demo.skills.tool_args import canonical_tool_args
+
+# Tools whose result depends on when or whether they run are never cached.
+_UNCACHEABLE = {"email", "time"}
+
+
+@dataclass
+class _Entry:
+    result: SkillResult
+    stored_at: float
+    fingerprint: tuple[Any, ...] | None
+
+
+def _stat_fingerprint(path: Path) -> tuple[Any, ...] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class ToolResultCache:
+    def __init__(self, config: ToolCacheConfig) -> None:
+        self.config = config
+        self.stats = CacheStats()
+        self._entries: OrderedDict[tuple[str, str, str], _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, tool_name: str, tool_args: dict[str, Any], ctx: SkillContext) -> SkillResult | None:
+        key = self._key(tool_name, tool_args, ctx)
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not self._is_fresh(tool_name, tool_args, ctx, entry):
+                self._entries.pop(key, None)
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry.result
+
+    def put(self, tool_name: str, tool_args: dict[str, Any], ctx: SkillContext, result: SkillResult) -> None:
+        key = self._key(tool_name, tool_args, ctx)
+        if key is None or not result.ok:
+            return
+        entry = _Entry(result, time.monotonic(), self._fingerprint(tool_name, tool_args, ctx))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.config.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _key(self, tool_name: str, tool_args: dict[str, Any], ctx: SkillContext) -> tuple[str, str, str] | None:
+        if tool_name in _UNCACHEABLE:
+            return None
+        try:
+            # Same canonical form as speculative matching, so {"query": "x"} and
+            # {"query": "x", "path": "./"} share one entry.
+            canonical = canonical_tool_args(tool_name, tool_args)
+        except (TypeError, ValueError):
+            return None
+        return (tool_name, str(ctx.workspace_root), canonical)
+
+    def _fingerprint(self, tool_name: str, tool_args: dict[str, Any], ctx: SkillContext) -> tuple[Any, ...] | None:
+        raw_path = tool_args.get("path")
+        if tool_name == "file_read" and isinstance(tool_args.get("paths"), list) and tool_args["paths"]:
+            return tuple(_stat_fingerprint((ctx.workspace_root / str(p)).resolve()) for p in tool_args["paths"])
+        if tool_name in ("file_read", "summarize") and isinstance(raw_path, str):
+            return _stat_fingerprint((ctx.workspace_root / raw_path).resolve())
+        if tool_name == "file_search":
+            root = raw_path if isinstance(raw_path, str) else "./"
+            return _stat_fingerprint((ctx.workspace_root / root).resolve())
+        return None
+
+    def _is_fresh(self, tool_name: str, tool_args: dict[str, Any], ctx: SkillContext, entry: _Entry) -> bool:
+        age = time.monotonic() - entry.stored_at
+        if tool_name == "weather":
+            return age <= self.config.weather_ttl_sec
+        if tool_name == "file_search":
+            # A directory mtime only covers direct children, so deeper changes rely on the TTL.
+            if age > self.config.search_ttl_sec:
+                return False
+        return entry.fingerprint == self._fingerprint(tool_name, tool_args, ctx)
+
+
+def build_tool_cache(config: Config) -> ToolResultCache | None:
+    if not config.skills.tool_cache.enabled:
+        return None
+    return ToolResultCache(config.skills.tool_cache)
@@ -1,42 +1,45 @@
 from __future__ import annotations
 
+import io
+import os
+import re
 import smtplib
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
 from email.message import EmailMessage
 from pathlib import Path
 from typing import Any
 from zoneinfo import ZoneInfo
 
 import requests
-from pydantic import BaseModel, Field, ValidationError
-
+from pydantic import ValidationError
+
+from claw_demo.config.schema import Config
+from claw_demo.llm.resilience import Deadline
+from claw_demo.llm.routing import LLMRouter
+from claw_demo.skills.content_index import get_content_index
+from claw_demo.skills.content_search import compile_query, search_contents
+from claw_demo.skills.file_window import read_window
+from claw_demo.skills.fuzzy import rank_paths
+from claw_demo.skills.map_reduce import MapReduceSummarizer, SummarizeFn, build_summary_cache
 from claw_demo.skills.models import SkillContext, SkillResult
-
-
-class WeatherToolArgs(BaseModel):
-    city: str | None = None
-
-
-class FileSearchToolArgs(BaseModel):
-    query: str = Field(min_length=1)
-    path: str = "./"
-
-
-class FileReadToolArgs(BaseModel):
-    path: str
-
-
-class SummarizeToolArgs(BaseModel):
-    text: str = Field(min_length=1)
-
-
-class EmailToolArgs(BaseModel):
-    to: str
-    subject: str
-    body: str
-
-
-class TimeToolArgs(BaseModel):
-    timezone: str | None = None
+from claw_demo.skills.sandbox import SandboxError
+from claw_demo.skills.summarizer import summarize_text
+from claw_demo.skills.tool_args import (
+    EmailToolArgs,
+    FileReadToolArgs,
+    FileSearchToolArgs,
+    SummarizeToolArgs,
+    TimeToolArgs,
+    WeatherToolArgs,
+    canonical_tool_args,
+)
+from claw_demo.skills.tool_cache import ToolResultCache
+from claw_demo.skills.walk import EntryFilter, IgnoreRules, rules_for, walk_entries
+from claw_demo.skills.workspace_index import WorkspaceIndex, get_workspace_index, index_store_path
 
 
 TOOL_SCHEMAS: list[dict[str, Any]] = [
@@ -57,12 +60,19 @@ TOOL_SCHEMAS: list[dict[str, Any]] = [
         "type": "function",
         "function": {
             "name": "file_search",
-            "description": "在工作目录中搜索文件名",
+            "description": "在工作目录中按相关度模糊搜索文件名（附得分）；mode=content 时按内容搜索并返回 路径:行号:片段",
             "parameters": {
                 "type": "object",
                 "properties": {
                     "query": {"type": "string"},
                     "path": {"type": "string"},
+                    "mode": {"type": "string", "enum": ["name", "content"]},
+                    "regex": {"type": "boolean"},
+                    "glob": {"type": "string"},
+                    "ext": {"type": "array", "items": {"type": "string"}},
+                    "min_bytes": {"type": "integer"},
+                    "max_bytes": {"type": "integer"},
+                    "modified_within_days": {"type": "number"},
                 },
                 "required": ["query"],
                 "additionalProperties": False,
@@ -73,11 +83,20 @@ TOOL_SCHEMAS: list[dict[str, Any]] = [
         "type": "function",
         "function": {
             "name": "file_read",
-            "description": "读取工作目录中的文件内容",
+            "description": "读取工作目录中的文件内容；多个文件用 paths 一次读取；大文件可按字节(offset/length)、行号(start_line/end_line)或 head/tail 行数分段读取，截断时返回继续读取的参数",
             "parameters": {
                 "type": "object",
-                "properties": {"path": {"type": "string"}},
-                "required": ["path"],
+                "properties": {
+                    "path": {"type": "string"},
+                    "paths": {"type": "array", "items": {"type": "string"}},
+                    "offset": {"type": "integer"},
+                    "length": {"type": "integer"},
+                    "start_line": {"type": "integer"},
+                    "end_line": {"type": "integer"},
+                    "head": {"type": "integer"},
+                    "tail": {"type": "integer"},
+                },
+                "required": [],
                 "additionalProperties": False,
             },
         },
@@ -86,11 +105,15 @@ TOOL_SCHEMAS: list[dict[str, Any]] = [
         "type": "function",
         "function": {
             "name": "summarize",
-            "description": "总结给定文本",
+            "description": "在本地抽取式总结给定文本，或用 path 直接总结工作目录中的文件（不必先读取全文）",
             "parameters": {
                 "type": "object",
-                "properties": {"text": {"type": "string"}},
-                "required": ["text"],
+                "properties": {
+                    "text": {"type": "string"},
+                    "path": {"type": "string"},
+                    "max_chars": {"type": "integer"},
+                },
+                "required": [],
                 "additionalProperties": False,
             },
         },
@@ -128,13 +151,21 @@ TOOL_SCHEMAS: list[dict[str, Any]] = [
 ]
 
 
-def _is_under_allowed(path: Path, allowed_roots: list[str], base_root: Path) -> bool:
-    resolved = path.resolve()
-    for root in allowed_roots:
-        root_path = (base_root / root).resolve()
-        if resolved == root_path or root_path in resolved.parents:
-            return True
-    return False
+# Tools a skill or intent usually needs next to its own, e.g. a search is followed by a read.
+_TOOL_COMPANIONS: dict[str, tuple[str, ...]] = {
+    "file_search": ("file_read",),
+    "summarize": ("file_read",),
+}
+
+
+def select_tool_schemas(enabled: list[str], wanted: list[str] | None = None) -> list[dict[str, Any]]:
+    available = [schema for schema in TOOL_SCHEMAS if schema["function"]["name"] in enabled] or TOOL_SCHEMAS
+    if not wanted:
+        return available
+    names = set(wanted)
+    for name in wanted:
+        names.update(_TOOL_COMPANIONS.get(name, ()))
+    return [schema for schema in available if schema["function"]["name"] in names] or available
 
 
 def _run_weather(args: WeatherToolArgs, ctx: SkillContext) -> SkillResult:
@@ -169,45 +200,231 @@ def _run_weather(args: WeatherToolArgs, ctx: SkillContext) -> SkillResult:
         return SkillResult(ok=False, text="天气服务暂不可用")
 
 
+_SEARCH_RESULT_LIMIT = 20
+
+
+def _entry_filter(args: FileSearchToolArgs) -> EntryFilter:
+    modified_after = None
+    if args.modified_within_days is not None:
+        modified_after = time.time() - args.modified_within_days * 86400
+    extensions = tuple(f".{ext.lower().lstrip('.')}" for ext in args.ext if ext.strip("."))
+    return EntryFilter(args.glob, extensions, args.min_bytes, args.max_bytes, modified_after)
+
+
+def _search_index(root: Path, ctx: SkillContext, entry_filter: EntryFilter) -> tuple[WorkspaceIndex, str] | None:
+    # Size and mtime filters need fresh stat data, which the scandir walk gets from DirEntry.
+    if entry_filter.needs_stat:
+        return None
+    if root != ctx.workspace_root and ctx.workspace_root not in root.parents:
+        return None
+    index = get_workspace_index(ctx.config, ctx.project_root, ctx.workspace_root)
+    if index is None:
+        return None
+    index.refresh()
+    under = root.relative_to(ctx.workspace_root).as_posix()
+    return index, "" if under == "." else under
+
+
+def _walk_candidates(root: Path, ctx: SkillContext, entry_filter: EntryFilter, files_only: bool) -> list[str]:
+    fa = ctx.config.file_access
+    rel_root = Path(os.path.relpath(root, ctx.workspace_root)).as_posix()
+    rel_root = "" if rel_root == "." else rel_root
+    rules = IgnoreRules(frozenset(fa.ignore_dirs))
+    if not rel_root.startswith(".."):
+        rules = rules_for(ctx.workspace_root, rel_root, rules, fa.ignore_files)
+    skip = index_store_path(ctx.config, ctx.project_root, ctx.workspace_root).parent
+    found: list[str] = []
+    for rel, entry in walk_entries(root, rel_root, rules, fa.ignore_files, skip=skip):
+        if entry.is_dir(follow_symlinks=False):
+            if files_only or entry_filter.active:
+                continue
+        elif entry_filter.active and not entry_filter.match_entry(rel, entry):
+            continue
+        found.append(rel)
+    return found
+
+
 def _run_file_search(args: FileSearchToolArgs, ctx: SkillContext) -> SkillResult:
     root = (ctx.workspace_root / args.path).resolve()
-    if not _is_under_allowed(root, ctx.config.file_access.allowed_roots, ctx.workspace_root):
+    if not ctx.sandbox.contains(root):
         return SkillResult(ok=False, text="路径不在允许范围内")
 
-    matches: list[str] = []
-    q = args.query.lower()
-    for p in root.rglob("*"):
-        if q in p.name.lower():
-            matches.append(str(p.relative_to(ctx.workspace_root)))
-        if len(matches) >= 20:
-            break
-
-    if not matches:
+    entry_filter = _entry_filter(args)
+    if args.mode == "content":
+        return _run_content_search(args, root, entry_filter, ctx)
+
+    indexed = _search_index(root, ctx, entry_filter)
+    if indexed is None:
+        candidates = _walk_candidates(root, ctx, entry_filter, files_only=False)
+    elif entry_filter.active:
+        index, under = indexed
+        candidates = [rel for rel in index.files(under) if entry_filter.match_name(rel)]
+    else:
+        index, under = indexed
+        # Contiguous name hits always outrank scattered ones, so a full fuzzy pass is only
+        # needed when there are too few of them to fill the result.
+        candidates = index.search(args.query, under, limit=None)
+        if len(candidates) < _SEARCH_RESULT_LIMIT:
+            candidates = index.paths_under(under)
+
+    ranked = rank_paths(args.query, candidates, ctx.workspace_root, limit=_SEARCH_RESULT_LIMIT)
+    if not ranked:
         return SkillResult(ok=True, text="未找到匹配文件")
-    return SkillResult(ok=True, text="\n".join(matches))
+    return SkillResult(ok=True, text="\n".join(f"{path}  (score {score})" for path, score in ranked))
 
 
-def _run_file_read(args: FileReadToolArgs, ctx: SkillContext) -> SkillResult:
-    target = (ctx.workspace_root / args.path).resolve()
-    if not _is_under_allowed(target, ctx.config.file_access.allowed_roots, ctx.workspace_root):
+def _run_content_search(
+    args: FileSearchToolArgs, root: Path, entry_filter: EntryFilter, ctx: SkillContext
+) -> SkillResult:
+    try:
+        pattern = compile_query(args.query, args.regex)
+    except re.error as exc:
+        return SkillResult(ok=False, text=f"正则表达式无效: {exc}")
+
+    fa = ctx.config.file_access
+    indexed = _search_index(root, ctx, entry_filter)
+    if indexed is not None:
+        index, under = indexed
+        rels = [rel for rel in index.files(under) if entry_filter.match_name(rel)]
+        content_index = None if args.regex else get_content_index(ctx.config, ctx.project_root, ctx.workspace_root)
+        if content_index is not None:
+            # Index the whole workspace so narrower searches later reuse the same postings.
+            content_index.update(index.files())
+            rels = content_index.candidates(args.query, rels)
+    else:
+        rels = _walk_candidates(root, ctx, entry_filter, files_only=True)
+    hits = search_contents(
+        ((rel, ctx.workspace_root / rel) for rel in rels),
+        pattern,
+        fa.max_read_bytes,
+        limit=fa.content_search_max_hits,
+        workers=fa.content_search_workers,
+    )
+    if not hits:
+        return SkillResult(ok=True, text="未找到匹配内容")
+    return SkillResult(ok=True, text="\n".join(hits))
+
+
+_BATCH_READ_WORKERS = 8
+_SECTION_OVERHEAD = 120
+
+
+def _read_budget(config: Config) -> int:
+    # A window larger than the context budget would be clipped by ContextBudget.fit before the
+    # model sees it, and a continuation cursor past the clipped text would skip what was cut.
+    # Half the window leaves room for the system prompt and history (bytes >= chars).
+    return max(1, min(config.file_access.max_read_bytes, config.chat.max_context_chars // 2))
+
+
+def _read_one(rel: str, args: FileReadToolArgs, budget: int, ctx: SkillContext) -> SkillResult:
+    try:
+        with ctx.sandbox.open(rel) as fh:
+            window = read_window(
+                fh,
+                budget,
+                offset=args.offset,
+                length=args.length,
+                start_line=args.start_line,
+                end_line=args.end_line,
+                head=args.head,
+                tail=args.tail,
+            )
+    except SandboxError:
         return SkillResult(ok=False, text="路径不在允许范围内")
-    if not target.exists() or not target.is_file():
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
         return SkillResult(ok=False, text="文件不存在")
-    if target.stat().st_size > ctx.config.file_access.max_read_bytes:
-        return SkillResult(ok=False, text="文件超过读取大小限制")
-    return SkillResult(ok=True, text=target.read_text(encoding="utf-8", errors="replace"))
+    return SkillResult(ok=True, text=window.render())
+
+
+def _run_file_read(args: FileReadToolArgs, ctx: SkillContext) -> SkillResult:
+    fa = ctx.config.file_access
+    if not args.paths:
+        return _read_one(args.path, args, _read_budget(ctx.config), ctx)
+
+    paths = list(dict.fromkeys(args.paths))
+    # Every file gets an equal share of the batch budget and of the context window, less room
+    # for its header and cursor, so the whole message survives ContextBudget.fit and each file
+    # keeps some content and its own continuation cursor.
+    share = min(fa.max_batch_read_bytes, _read_budget(ctx.config)) // len(paths) - _SECTION_OVERHEAD
+    budget = max(1, min(fa.max_read_bytes, share))
+    with ThreadPoolExecutor(max_workers=min(len(paths), _BATCH_READ_WORKERS)) as pool:
+        results = list(pool.map(lambda rel: _read_one(rel, args, budget, ctx), paths))
+    sections = [
+        f"=== {rel} ===\n{result.text if result.ok else f'[失败] {result.text}'}" for rel, result in zip(paths, results)
+    ]
+    return SkillResult(ok=any(result.ok for result in results), text="\n\n".join(sections))
+
+
+_SUMMARIZE_READ_CHARS = 65536
+
+
+def _llm_summarize_fn(ctx: SkillContext) -> tuple[SummarizeFn, str] | None:
+    router = LLMRouter(ctx.config)
+    route = router.select("skill")
+    client = router.client(route)
+    if client is None:
+        return None
+
+    def _summarize(text: str, target_chars: int) -> str:
+        resp = router.complete(
+            route,
+            client,
+            messages=[
+                {"role": "system", "content": f"用不超过 {target_chars} 个字总结用户给出的内容，只输出摘要本身。"},
+                {"role": "user", "content": text},
+            ],
+            temperature=0,
+        )
+        summary = (resp.choices[0].message.content or "").strip()
+        if not summary:
+            raise ValueError("empty summary")
+        return summary
+
+    return _summarize, f"llm:{route.model}"
+
+
+def _summary_pipeline(args: SummarizeToolArgs, ctx: SkillContext) -> MapReduceSummarizer:
+    cfg = ctx.config.skills.summarize
+    summarize_fn, namespace = summarize_text, "local"
+    if cfg.mode == "llm":
+        # Without a configured model the pipeline quietly stays local.
+        summarize_fn, namespace = _llm_summarize_fn(ctx) or (summarize_fn, namespace)
+    return MapReduceSummarizer(
+        summarize_fn,
+        target_chars=args.max_chars,
+        chunk_chars=cfg.chunk_chars,
+        workers=cfg.max_workers,
+        cache=build_summary_cache(ctx.config, ctx.project_root),
+        namespace=namespace,
+    )
 
 
 def _run_summarize(args: SummarizeToolArgs, ctx: SkillContext) -> SkillResult:
-    text = args.text.strip()
-    if len(text) <= 220:
-        return SkillResult(ok=True, text=text)
-    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-    if not lines:
-        return SkillResult(ok=True, text=text[:220])
-    if len(lines) == 1:
-        return SkillResult(ok=True, text=lines[0][:220])
-    return SkillResult(ok=True, text=f"{lines[0]}\n...\n{lines[-1]}")
+    pipeline = _summary_pipeline(args, ctx)
+    truncated = False
+    if not args.path:
+        summary = pipeline.run(args.text.strip())
+    else:
+        limit = ctx.config.file_access.max_summarize_chars
+        try:
+            with ctx.sandbox.open(args.path) as fh:
+                reader = io.TextIOWrapper(fh, encoding="utf-8", errors="replace")
+
+                def _read() -> str:
+                    if pipeline.total_chars >= limit:
+                        return ""
+                    return reader.read(min(_SUMMARIZE_READ_CHARS, limit - pipeline.total_chars))
+
+                summary = pipeline.run_stream(_read)
+                truncated = bool(reader.read(1))
+        except SandboxError:
+            return SkillResult(ok=False, text="路径不在允许范围内")
+        except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+            return SkillResult(ok=False, text="文件不存在")
+        if truncated:
+            summary = f"{summary}\n[仅总结了前 {pipeline.total_chars} 个字符]"
+    stats = {"chunks": pipeline.chunks, "cache_hits": pipeline.stats.hits, "cache_misses": pipeline.stats.misses}
+    return SkillResult(ok=True, text=summary or "内容为空", data=stats)
 
 
 def _run_email(args: EmailToolArgs, ctx: SkillContext) -> SkillResult:
@@ -264,7 +481,7 @@ def _run_time(args: TimeToolArgs, ctx: SkillContext) -> SkillResult:
         local_now = datetime.now(ZoneInfo(tz_name))
         utc_now = datetime.now(timezone.utc)
         text = (
-            f"当前时间({tz_name}): {local_now.strftime('%Y-%m-%d %H:%M:%S %Z')}\\n"
+            f"当前时间({tz_name}): {local_now.strftime('%Y-%m-%d %H:%M:%S %Z')}\n"
             f"UTC: {utc_now.strftime('%Y-%m-%d %H:%M:%S %Z')}"
         )
         return SkillResult(ok=True, text=text)
@@ -272,7 +489,83 @@ def _run_time(args: TimeToolArgs, ctx: SkillContext) -> SkillResult:
         return SkillResult(ok=False, text=f"无效时区或获取时间失败: {tz_name}")
 
 
+@dataclass
+class ToolCallOutcome:
+    tool_name: str
+    tool_args: dict[str, Any]
+    result: SkillResult
+    elapsed_ms: float
+    cached: bool = False
+    speculative: bool = False
+
+
+@dataclass
+class SpeculationStats:
+    started: int = 0
+    used: int = 0
+    discarded: int = 0
+
+    def summary(self) -> str:
+        return f"started={self.started} used={self.used} discarded={self.discarded}"
+
+
+def _timed_out(tool_name: str, tool_args: dict[str, Any], start: float, cancelled: bool) -> ToolCallOutcome:
+    # A call that already started cannot be stopped; its thread runs on and may still take
+    # effect (an email may still be sent), so it must not be reported as cancelled.
+    if cancelled:
+        text = "工具执行超时，已取消（未执行）"
+    else:
+        text = "工具执行超时，调用仍在后台运行，结果未知（可能已生效，请勿直接重试）"
+    return ToolCallOutcome(tool_name, tool_args, SkillResult(ok=False, text=text), (time.perf_counter() - start) * 1000)
+
+
+class SpeculativeCalls:
+    def __init__(self, executor: ToolExecutor, calls: list[tuple[str, dict[str, Any]]], ctx: SkillContext) -> None:
+        self.stats = SpeculationStats()
+        self._futures: dict[tuple[str, str], Future[ToolCallOutcome]] = {}
+        for name, args in calls:
+            key = (name, canonical_tool_args(name, args))
+            if key not in self._futures:
+                self._futures[key] = executor.submit(name, args, ctx)
+                self.stats.started += 1
+
+    def take(
+        self, tool_name: str, tool_args: dict[str, Any], deadline: Deadline | None = None
+    ) -> ToolCallOutcome | None:
+        future = self._futures.pop((tool_name, canonical_tool_args(tool_name, tool_args)), None)
+        if future is None:
+            return None
+        self.stats.used += 1
+        start = time.perf_counter()
+        try:
+            outcome = future.result(timeout=deadline.remaining() if deadline is not None else None)
+        except FutureTimeoutError:
+            return _timed_out(tool_name, tool_args, start, future.cancel())
+        return ToolCallOutcome(tool_name, tool_args, outcome.result, outcome.elapsed_ms, speculative=True)
+
+    def discard(self) -> SpeculationStats:
+        for future in self._futures.values():
+            # Work that already started keeps running and only feeds the tool cache.
+            future.cancel()
+            self.stats.discarded += 1
+        self._futures.clear()
+        return self.stats
+
+
 class ToolExecutor:
+    def __init__(
+        self,
+        max_workers: int = 4,
+        tool_concurrency: dict[str, int] | None = None,
+        result_cache: ToolResultCache | None = None,
+    ) -> None:
+        self.max_workers = max(1, max_workers)
+        self.tool_concurrency = dict(tool_concurrency or {})
+        self.result_cache = result_cache
+        self._pool: ThreadPoolExecutor | None = None
+        self._semaphores: dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
     def execute(self, tool_name: str, tool_args: dict[str, Any], ctx: SkillContext) -> SkillResult:
         try:
             if tool_name == "weather":
@@ -292,3 +585,71 @@ class ToolExecutor:
             return SkillResult(ok=False, text=f"工具参数错误: {exc}")
         except Exception as exc:  # pragma: no cover
             return SkillResult(ok=False, text=f"工具执行失败: {exc}")
+
+    def execute_many(
+        self,
+        calls: list[tuple[str, dict[str, Any]]],
+        ctx: SkillContext,
+        speculative: SpeculativeCalls | None = None,
+        deadline: Deadline | None = None,
+    ) -> list[ToolCallOutcome]:
+        if speculative is not None:
+            outcomes = [speculative.take(name, args, deadline) for name, args in calls]
+            pending = [call for call, outcome in zip(calls, outcomes) if outcome is None]
+            fresh = iter(self.execute_many(pending, ctx, deadline=deadline))
+            return [outcome if outcome is not None else next(fresh) for outcome in outcomes]
+        unbounded = deadline is None or deadline.remaining() is None
+        if unbounded and (len(calls) <= 1 or self.max_workers == 1):
+            return [self._timed(name, args, ctx) for name, args in calls]
+        start = time.perf_counter()
+        futures = [self.submit(name, args, ctx) for name, args in calls]
+        cancelled: set[Future[ToolCallOutcome]] = set()
+        try:
+            done, _ = wait(futures, timeout=deadline.remaining() if deadline is not None else None)
+        finally:
+            # On a deadline or Ctrl-C, calls that have not started yet are dropped.
+            cancelled.update(future for future in futures if future.cancel())
+        # Results come back in request order so tool messages line up with tool_call ids.
+        return [
+            future.result() if future in done else _timed_out(name, args, start, future in cancelled)
+            for future, (name, args) in zip(futures, calls)
+        ]
+
+    def submit(self, tool_name: str, tool_args: dict[str, Any], ctx: SkillContext) -> Future[ToolCallOutcome]:
+        # Starts one call on the shared pool without waiting for it, e.g. for speculative calls.
+        return self._get_pool().submit(self._timed, tool_name, tool_args, ctx)
+
+    def _timed(self, tool_name: str, tool_args: dict[str, Any], ctx: SkillContext) -> ToolCallOutcome:
+        start = time.perf_counter()
+        if self.result_cache is not None:
+            hit = self.result_cache.get(tool_name, tool_args, ctx)
+            if hit is not None:
+                return ToolCallOutcome(tool_name, tool_args, hit, (time.perf_counter() - start) * 1000, cached=True)
+        semaphore = self._semaphore(tool_name)
+        if semaphore is None:
+            start = time.perf_counter()
+            result = self.execute(tool_name, tool_args, ctx)
+        else:
+            with semaphore:
+                start = time.perf_counter()
+                result = self.execute(tool_name, tool_args, ctx)
+        if self.result_cache is not None:
+            self.result_cache.put(tool_name, tool_args, ctx, result)
+        return ToolCallOutcome(tool_name, tool_args, result, (time.perf_counter() - start) * 1000)
+
+    def _semaphore(self, tool_name: str) -> threading.BoundedSemaphore | None:
+        limit = self.tool_concurrency.get(tool_name)
+        if not limit or limit <= 0:
+            return None
+        with self._lock:
+            semaphore = self._semaphores.get(tool_name)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(limit)
+                self._semaphores[tool_name] = semaphore
+            return semaphore
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="claw-tool")
+            return self._pool
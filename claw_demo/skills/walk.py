@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import fnmatch
+import os
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+
+@lru_cache(maxsize=512)
+def _glob_regex(pattern: str) -> re.Pattern[str]:
+    out: list[str] = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 2 :]:
+            end = pattern.index("]", i + 2)
+            body = pattern[i + 1 : end]
+            out.append(f"[{'^' + body[1:] if body.startswith('!') else body}]")
+            i = end + 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("".join(out) + r"\Z")
+
+
+@dataclass(frozen=True)
+class IgnoreRule:
+    base: str
+    pattern: str
+    negate: bool = False
+    dir_only: bool = False
+    anchored: bool = False
+
+    def matches(self, rel: str, name: str, is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+        if not self.anchored:
+            return _glob_regex(self.pattern).match(name) is not None
+        if self.base:
+            if not rel.startswith(f"{self.base}/"):
+                return False
+            rel = rel[len(self.base) + 1 :]
+        return _glob_regex(self.pattern).match(rel) is not None
+
+
+def parse_ignore_file(text: str, base: str) -> list[IgnoreRule]:
+    rules: list[IgnoreRule] = []
+    for raw in text.splitlines():
+        line = raw.rstrip()
+        if not line or line.startswith("#"):
+            continue
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+        # As in git, a slash anywhere but the end ties the pattern to the ignore file's directory.
+        anchored = "/" in line
+        rules.append(IgnoreRule(base, line.lstrip("/"), negate, dir_only, anchored))
+    return rules
+
+
+# The rule chain in effect for one directory: its parent's rules plus its own ignore files.
+# Later rules win, so a nested "!pattern" can re-include what an outer file excluded.
+@dataclass
+class IgnoreRules:
+    always: frozenset[str] = frozenset()
+    rules: tuple[IgnoreRule, ...] = ()
+
+    def child(self, directory: Path, rel: str, ignore_files: list[str]) -> IgnoreRules:
+        extra: list[IgnoreRule] = []
+        for name in ignore_files:
+            try:
+                text = (directory / name).read_text(encoding="utf-8", errors="replace")
+            except OSError:
+                continue
+            extra.extend(parse_ignore_file(text, rel))
+        if not extra:
+            return self
+        return IgnoreRules(self.always, self.rules + tuple(extra))
+
+    def ignored(self, rel: str, name: str, is_dir: bool) -> bool:
+        if is_dir and name in self.always:
+            return True
+        result = False
+        for rule in self.rules:
+            if rule.matches(rel, name, is_dir):
+                result = not rule.negate
+        return result
+
+
+@dataclass
+class EntryFilter:
+    glob: str | None = None
+    extensions: tuple[str, ...] = ()
+    min_bytes: int | None = None
+    max_bytes: int | None = None
+    modified_after: float | None = None
+
+    @property
+    def active(self) -> bool:
+        return bool(self.glob or self.extensions or self.needs_stat)
+
+    @property
+    def needs_stat(self) -> bool:
+        return self.min_bytes is not None or self.max_bytes is not None or self.modified_after is not None
+
+    def match_name(self, rel: str) -> bool:
+        name = rel.rsplit("/", 1)[-1]
+        if self.extensions and not name.lower().endswith(self.extensions):
+            return False
+        if self.glob:
+            target = rel if "/" in self.glob else name
+            return fnmatch.fnmatchcase(target.lower(), self.glob.lower())
+        return True
+
+    def match_entry(self, rel: str, entry: os.DirEntry[str]) -> bool:
+        if not self.match_name(rel):
+            return False
+        if not self.needs_stat:
+            return True
+        # DirEntry caches its stat result, so each file costs at most one lstat here.
+        st = entry.stat(follow_symlinks=False)
+        if self.min_bytes is not None and st.st_size < self.min_bytes:
+            return False
+        if self.max_bytes is not None and st.st_size > self.max_bytes:
+            return False
+        return self.modified_after is None or st.st_mtime >= self.modified_after
+
+
+def rules_for(root: Path, rel: str, base: IgnoreRules, ignore_files: list[str]) -> IgnoreRules:
+    # Ignore files in the ancestors of a search root still apply below it.
+    rules = base
+    parts = [part for part in rel.split("/") if part]
+    for depth in range(len(parts)):
+        ancestor = "/".join(parts[:depth])
+        rules = rules.child(root / ancestor if ancestor else root, ancestor, ignore_files)
+    return rules
+
+
+def walk_entries(
+    root: Path,
+    rel_root: str,
+    rules: IgnoreRules,
+    ignore_files: list[str],
+    skip: Path | None = None,
+) -> Iterator[tuple[str, os.DirEntry[str]]]:
+    stack = [(root, rel_root, rules)]
+    while stack:
+        directory, rel, dir_rules = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+        names = {entry.name for entry in entries}
+        dir_rules = dir_rules.child(directory, rel, [name for name in ignore_files if name in names])
+        subdirs: list[tuple[Path, str, IgnoreRules]] = []
+        for entry in entries:
+            child_rel = f"{rel}/{entry.name}" if rel else entry.name
+            is_dir = entry.is_dir(follow_symlinks=False)
+            if dir_rules.ignored(child_rel, entry.name, is_dir):
+                continue
+            if is_dir:
+                if skip is not None and Path(entry.path) == skip:
+                    continue
+                subdirs.append((Path(entry.path), child_rel, dir_rules))
+            yield child_rel, entry
+        stack.extend(reversed(subdirs))
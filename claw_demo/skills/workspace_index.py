@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from claw_demo.config.schema import Config
+from claw_demo.skills.walk import IgnoreRules
+
+_INDEX_VERSION = 3
+
+
+def name_trigrams(name: str) -> set[str]:
+    lowered = name.lower()
+    return {lowered[i : i + 3] for i in range(len(lowered) - 2)}
+
+
+def _listings(dirs: dict[str, dict[str, Any]]) -> dict[str, tuple[list[str], list[str]]]:
+    return {rel: (entry["files"], entry["subdirs"]) for rel, entry in dirs.items()}
+
+
+# Persistent list of every path under a workspace, kept fresh by directory mtimes.
+# A directory's mtime changes when an entry is added, removed or renamed in it, so an
+# unchanged directory reuses its stored listing and only its subdirectories are stat'ed.
+# Listings are stored after ignore rules are applied, so pruned trees are never walked.
+class WorkspaceIndex:
+    def __init__(
+        self,
+        root: Path,
+        store_path: Path,
+        refresh_sec: float = 2.0,
+        ignore_dirs: list[str] | None = None,
+        ignore_files: list[str] | None = None,
+    ) -> None:
+        self.root = root
+        self.store_path = store_path
+        self.refresh_sec = refresh_sec
+        self.ignore_dirs = sorted(ignore_dirs or [])
+        self.ignore_files = list(ignore_files or [])
+        self.paths: list[str] = []
+        self._dirs: dict[str, dict[str, Any]] = {}
+        self._trigrams: dict[str, list[int]] = {}
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._load()
+
+    def refresh(self, force: bool = False) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._dirs and now - self._checked_at < self.refresh_sec:
+                return False
+            dirs = self._scan({} if force else self._dirs)
+            self._checked_at = now
+            # Saving the index can bump a parent's mtime without changing any listing.
+            changed = force or _listings(dirs) != _listings(self._dirs)
+            self._dirs = dirs
+            if not changed:
+                return False
+            self._rebuild()
+            self._save()
+            return True
+
+    def search(self, query: str, under: str = "", limit: int | None = 20) -> list[str]:
+        q = query.lower()
+        prefix = f"{under.strip('/')}/" if under.strip("/") else ""
+        with self._lock:
+            grams = name_trigrams(q)
+            if grams:
+                postings = sorted((self._trigrams.get(g, []) for g in grams), key=len)
+                ids = set(postings[0]).intersection(*postings[1:])
+                candidates = (self.paths[i] for i in sorted(ids))
+            else:
+                candidates = iter(self.paths)
+            matches: list[str] = []
+            for path in candidates:
+                if prefix and not path.startswith(prefix):
+                    continue
+                if q in path.rsplit("/", 1)[-1].lower():
+                    matches.append(path)
+                    if limit is not None and len(matches) >= limit:
+                        break
+            return matches
+
+    def paths_under(self, under: str = "") -> list[str]:
+        prefix = f"{under.strip('/')}/" if under.strip("/") else ""
+        with self._lock:
+            return [path for path in self.paths if path.startswith(prefix)]
+
+    def files(self, under: str = "") -> list[str]:
+        under = under.strip("/")
+        with self._lock:
+            found: list[str] = []
+            for rel, entry in self._dirs.items():
+                if under and rel != under and not rel.startswith(f"{under}/"):
+                    continue
+                base = f"{rel}/" if rel else ""
+                found.extend(base + name for name in entry["files"])
+            return sorted(found)
+
+    def _scan(self, previous: dict[str, dict[str, Any]]) -> dict[str, dict[str, Any]]:
+        store_dir = self.store_path.parent
+        dirs: dict[str, dict[str, Any]] = {}
+        stack: list[tuple[str, IgnoreRules, bool]] = [("", IgnoreRules(frozenset(self.ignore_dirs)), False)]
+        while stack:
+            rel, parent_rules, stale = stack.pop()
+            full = self.root / rel if rel else self.root
+            try:
+                mtime = os.stat(full).st_mtime_ns
+            except OSError:
+                continue
+            old = previous.get(rel)
+            entry = old if old is not None and not stale and old["mtime"] == mtime else None
+            # Editing an ignore file in place does not touch the directory mtime, so check it separately.
+            if entry is not None and self._ignore_signature(full, entry["files"]) != entry["ignore"]:
+                entry = None
+            items: list[os.DirEntry[str]] = []
+            if entry is None:
+                try:
+                    with os.scandir(full) as it:
+                        items = list(it)
+                except OSError:
+                    continue
+                present = {item.name for item in items}
+            else:
+                present = set(entry["files"])
+            rules = parent_rules.child(full, rel, [name for name in self.ignore_files if name in present])
+            if entry is None:
+                files: list[str] = []
+                subdirs: list[str] = []
+                for item in items:
+                    child_rel = f"{rel}/{item.name}" if rel else item.name
+                    is_dir = item.is_dir(follow_symlinks=False)
+                    if rules.ignored(child_rel, item.name, is_dir):
+                        continue
+                    if is_dir:
+                        # The index file lives here; indexing it would change on every save.
+                        if Path(item.path) != store_dir:
+                            subdirs.append(item.name)
+                    else:
+                        files.append(item.name)
+                files.sort()
+                entry = {
+                    "mtime": mtime,
+                    "files": files,
+                    "subdirs": sorted(subdirs),
+                    "ignore": self._ignore_signature(full, files),
+                }
+                # Whether an ignore file was created, deleted, edited or replaced by a rename,
+                # the rules below this directory changed and stored child listings are stale.
+                if old is None or entry["ignore"] != old["ignore"]:
+                    stale = True
+            dirs[rel] = entry
+            stack.extend((f"{rel}/{name}" if rel else name, rules, stale) for name in entry["subdirs"])
+        return dirs
+
+    def _ignore_signature(self, directory: Path, files: list[str]) -> list[list[Any]]:
+        signature: list[list[Any]] = []
+        for name in self.ignore_files:
+            if name in files:
+                try:
+                    st = os.stat(directory / name)
+                    signature.append([name, st.st_mtime_ns, st.st_size])
+                except OSError:
+                    signature.append([name, 0, 0])
+        return signature
+
+    def _rebuild(self) -> None:
+        paths: list[str] = []
+        for rel, entry in self._dirs.items():
+            base = f"{rel}/" if rel else ""
+            paths.extend(base + name for name in entry["files"])
+            paths.extend(base + name for name in entry["subdirs"])
+        paths.sort()
+        trigrams: dict[str, list[int]] = {}
+        for i, path in enumerate(paths):
+            for gram in name_trigrams(path.rsplit("/", 1)[-1]):
+                trigrams.setdefault(gram, []).append(i)
+        self.paths = paths
+        self._trigrams = trigrams
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.store_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return
+        if data.get("version") != _INDEX_VERSION or data.get("root") != str(self.root):
+            return
+        if data.get("ignore") != [self.ignore_dirs, self.ignore_files]:
+            return
+        self._dirs = data.get("dirs", {})
+        self.paths = data.get("paths", [])
+        self._trigrams = data.get("trigrams", {})
+
+    def _save(self) -> None:
+        body = json.dumps(
+            {
+                "version": _INDEX_VERSION,
+                "root": str(self.root),
+                "ignore": [self.ignore_dirs, self.ignore_files],
+                "dirs": self._dirs,
+                "paths": self.paths,
+                "trigrams": self._trigrams,
+            },
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        self.store_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.store_path.with_suffix(".tmp")
+        tmp_path.write_text(body, encoding="utf-8")
+        tmp_path.replace(self.store_path)
+
+
+_INDEXES: dict[tuple[Path, Path], WorkspaceIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def index_store_path(config: Config, project_root: Path, workspace_root: Path) -> Path:
+    digest = hashlib.sha256(str(workspace_root).encode("utf-8")).hexdigest()[:16]
+    return (project_root / config.file_access.index_root).resolve() / f"{digest}.json"
+
+
+def build_workspace_index(config: Config, project_root: Path, workspace_root: Path) -> WorkspaceIndex:
+    fa = config.file_access
+    store_path = index_store_path(config, project_root, workspace_root)
+    return WorkspaceIndex(workspace_root, store_path, fa.index_refresh_sec, fa.ignore_dirs, fa.ignore_files)
+
+
+def get_workspace_index(config: Config, project_root: Path, workspace_root: Path) -> WorkspaceIndex | None:
+    if not config.file_access.index_enabled:
+        return None
+    key = (workspace_root, index_store_path(config, project_root, workspace_root))
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = build_workspace_index(config, project_root, workspace_root)
+            _INDEXES[key] = index
+        return index
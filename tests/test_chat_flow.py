@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from pathlib import Path
 
+from claw_demo.agent.workflow_runner import WorkflowRunResult
 from claw_demo.chat.engine import ChatEngine
 from claw_demo.config.loader import load_config
 from claw_demo.memory.grep_retriever import MemoryEntry
@@ -110,6 +111,31 @@ def test_chat_stream_writer(tmp_path: Path) -> None:
     assert "hello" in final
 
 
+def test_chat_stream_writer_shows_error_after_cut_off_answer(tmp_path: Path) -> None:
+    cfg = load_config()
+    cfg.memory.root = "./memory"
+    cfg.file_access.workspace_dir = str(tmp_path)
+    cfg.llm.api_key = ""
+    cfg.chat.stream = True
+
+    def _run(**kwargs):
+        kwargs["stream_writer"]("日志里共有")
+        return WorkflowRunResult(
+            ok=False,
+            text="LLM 调用失败: timeout",
+            tool_trace=[],
+            streamed=True,
+            streamed_text="日志里共有",
+        )
+
+    engine = ChatEngine(config=cfg, project_root=tmp_path)
+    engine.workflow_runner.run = _run  # type: ignore[assignment]
+    chunks: list[str] = []
+    final = engine.handle_user_input("总结 app.log", stream_writer=chunks.append)
+    assert "".join(chunks) == "日志里共有\nLLM 调用失败: timeout"
+    assert final == "LLM 调用失败: timeout"
+
+
 def test_stream_slash_toggle(tmp_path: Path) -> None:
     cfg = load_config()
     cfg.memory.root = "./memory"
@@ -160,6 +186,9 @@ def test_trace_commands_and_auto_show(tmp_path: Path) -> None:
     show = engine._handle_slash("/trace")
     assert show.handled
     assert "file_read" in show.output
+    assert "memory-parse[extract]: attempts=" in show.output
+    assert "memory-parse[verify]: attempts=" in show.output
+    assert "memory-parse[extract]: attempts=" in out
 
     off = engine._handle_slash("/trace off")
     assert off.handled
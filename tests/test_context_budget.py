@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from claw_demo.config.loader import load_config
+from claw_demo.llm.context_budget import ContextBudget, message_chars
+
+
+def _tool_step(call_id: str, content: str) -> list[dict]:
+    return [
+        {
+            "role": "assistant",
+            "content": "",
+            "tool_calls": [{"id": call_id, "type": "function", "function": {"name": "file_read", "arguments": "{}"}}],
+        },
+        {"role": "tool", "tool_call_id": call_id, "content": content},
+    ]
+
+
+def test_fit_elides_old_tool_outputs_before_latest() -> None:
+    budget = ContextBudget(max_context_chars=3000, max_item_chars=500)
+    messages = [{"role": "system", "content": "sys"}, {"role": "user", "content": "go"}]
+    messages += _tool_step("c1", "a" * 5000)
+    messages += _tool_step("c2", "b" * 1500)
+
+    total = budget.fit(messages)
+    assert total == sum(message_chars(m) for m in messages)
+    assert total <= 3000
+    assert messages[3]["content"].startswith("a" * 500) and "已截断 4500" in messages[3]["content"]
+    assert messages[5]["content"] == "b" * 1500
+
+
+def test_fit_clips_latest_batch_as_last_resort() -> None:
+    budget = ContextBudget(max_context_chars=2000, max_item_chars=500)
+    messages = [{"role": "system", "content": "sys"}, {"role": "user", "content": "go"}]
+    messages += _tool_step("c1", "x" * 262144)
+
+    assert budget.fit(messages) <= 2100
+    assert "已截断" in messages[3]["content"]
+
+
+def test_caps_memory_and_history_from_config() -> None:
+    cfg = load_config()
+    cfg.chat.max_context_chars = 400
+    cfg.memory.max_item_chars = 50
+    budget = ContextBudget.from_config(cfg)
+
+    snippets = budget.cap_memory(["m" * 200] * 8)
+    assert len(snippets) == 5
+    assert all(s.startswith("m" * 50) and "已截断 150" in s for s in snippets)
+
+    history = [{"role": "user", "content": f"{i}" * 80} for i in range(10)]
+    kept = budget.cap_history(history)
+    assert kept and kept[-1]["content"].startswith("9")
+    assert sum(message_chars(m) for m in kept) <= 100 + 80
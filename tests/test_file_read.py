@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+from claw_demo.config.loader import load_config
+from claw_demo.llm.context_budget import ContextBudget
+from claw_demo.skills.models import SkillContext
+from claw_demo.skills.toolbox import ToolExecutor
+
+
+def _ctx(tmp_path: Path, max_read_bytes: int = 262144) -> SkillContext:
+    cfg = load_config()
+    cfg.file_access.allowed_roots = [str(tmp_path)]
+    cfg.file_access.max_read_bytes = max_read_bytes
+    return SkillContext(config=cfg, project_root=tmp_path, workspace_root=tmp_path)
+
+
+def _write_log(tmp_path: Path, lines: int = 100) -> Path:
+    path = tmp_path / "app.log"
+    path.write_text("".join(f"line {i}\n" for i in range(1, lines + 1)), encoding="utf-8")
+    return path
+
+
+def test_oversized_file_returns_first_window_with_cursor(tmp_path: Path) -> None:
+    _write_log(tmp_path)
+    executor = ToolExecutor()
+    ctx = _ctx(tmp_path, max_read_bytes=64)
+
+    first = executor.execute("file_read", {"path": "app.log"}, ctx)
+    assert first.ok
+    assert first.text.startswith("[已截断: 字节 0-64 / 共 ")
+    assert "继续读取请传 offset=64]\nline 1\nline 2\n" in first.text
+
+    second = executor.execute("file_read", {"path": "app.log", "offset": 64}, ctx)
+    assert "offset=128" in second.text
+    content = (tmp_path / "app.log").read_text(encoding="utf-8")
+    assert first.text.split("]\n", 1)[1] + second.text.split("]\n", 1)[1] == content[:128]
+
+
+def test_default_read_window_survives_context_budget(tmp_path: Path) -> None:
+    _write_log(tmp_path, lines=30000)
+    ctx = _ctx(tmp_path)
+    result = ToolExecutor().execute("file_read", {"path": "app.log"}, ctx)
+    messages = [
+        {"role": "system", "content": "s" * 2000},
+        {"role": "user", "content": "读 app.log"},
+        {"role": "assistant", "content": "", "tool_calls": [{"function": {"name": "file_read", "arguments": "{}"}}]},
+        {"role": "tool", "content": result.text},
+    ]
+
+    ContextBudget.from_config(ctx.config).fit(messages)
+
+    assert messages[3]["content"] == result.text
+    cursor = re.search(r"继续读取请传 offset=(\d+)", messages[3]["content"])
+    assert cursor is not None
+    text = result.text.split("]\n", 1)[1]
+    assert len(text.encode("utf-8")) == int(cursor.group(1))
+
+
+def test_line_range_head_and_tail(tmp_path: Path) -> None:
+    _write_log(tmp_path)
+    executor = ToolExecutor()
+    ctx = _ctx(tmp_path)
+
+    ranged = executor.execute("file_read", {"path": "app.log", "start_line": 10, "end_line": 12}, ctx)
+    assert ranged.text == "line 10\nline 11\nline 12\n"
+    assert executor.execute("file_read", {"path": "app.log", "head": 2}, ctx).text == "line 1\nline 2\n"
+    tail = executor.execute("file_read", {"path": "app.log", "tail": 2}, ctx)
+    assert tail.text.endswith("]\nline 99\nline 100\n")
+    assert "offset=" in tail.text
+
+    budgeted = executor.execute("file_read", {"path": "app.log", "start_line": 50}, _ctx(tmp_path, 20))
+    assert budgeted.text.endswith("]\nline 50\nline 51\n")
+    assert "start_line=52" in budgeted.text
+
+
+def test_windows_do_not_split_utf8_and_reject_mixed_modes(tmp_path: Path) -> None:
+    (tmp_path / "zh.txt").write_text("你好世界", encoding="utf-8")
+    executor = ToolExecutor()
+    ctx = _ctx(tmp_path)
+
+    window = executor.execute("file_read", {"path": "zh.txt", "offset": 1, "length": 5}, ctx)
+    assert window.text.endswith("]\n你")
+    assert "�" not in window.text
+
+    mixed = executor.execute("file_read", {"path": "zh.txt", "head": 1, "tail": 1}, ctx)
+    assert not mixed.ok
+
+
+def test_batch_read_returns_sections_within_aggregate_budget(tmp_path: Path) -> None:
+    (tmp_path / "a.txt").write_text("a" * 100, encoding="utf-8")
+    (tmp_path / "b.txt").write_text("b" * 10, encoding="utf-8")
+    ctx = _ctx(tmp_path)
+    ctx.config.file_access.max_batch_read_bytes = 480
+
+    result = ToolExecutor().execute("file_read", {"paths": ["a.txt", "b.txt", "missing.txt"]}, ctx)
+
+    assert result.ok
+    sections = result.text.split("\n\n")
+    assert sections[0] == "=== a.txt ===\n[已截断: 字节 0-40 / 共 100 字节，继续读取请传 offset=40]\n" + "a" * 40
+    assert sections[1] == "=== b.txt ===\n" + "b" * 10
+    assert sections[2] == "=== missing.txt ===\n[失败] 文件不存在"
+
+
+def test_batch_read_keeps_every_file_within_context_budget(tmp_path: Path) -> None:
+    for name in ("a.txt", "b.txt", "c.txt"):
+        (tmp_path / name).write_text(f"{name}\n" * 1400, encoding="utf-8")
+    ctx = _ctx(tmp_path)
+    result = ToolExecutor().execute("file_read", {"paths": ["a.txt", "b.txt", "c.txt"]}, ctx)
+    messages = [
+        {"role": "system", "content": "s" * 2000},
+        {"role": "user", "content": "读三个文件"},
+        {"role": "assistant", "content": "", "tool_calls": [{"function": {"name": "file_read", "arguments": "{}"}}]},
+        {"role": "tool", "content": result.text},
+    ]
+
+    ContextBudget.from_config(ctx.config).fit(messages)
+
+    assert messages[3]["content"] == result.text
+    for name in ("a.txt", "b.txt", "c.txt"):
+        section = result.text.split(f"=== {name} ===\n", 1)[1]
+        assert section.startswith("[已截断:") and "继续读取请传 offset=" in section
+        assert f"]\n{name}\n{name}\n" in section
+
+
+def test_batch_read_rejects_paths_outside_sandbox(tmp_path: Path) -> None:
+    ctx = _ctx(tmp_path)
+
+    result = ToolExecutor().execute("file_read", {"paths": ["../outside.txt"]}, ctx)
+
+    assert not result.ok
+    assert "路径不在允许范围内" in result.text
+    assert not ToolExecutor().execute("file_read", {"path": "a.txt", "paths": ["b.txt"]}, ctx).ok
+
+
+def test_sandbox_blocks_symlink_escape_and_sibling_prefix(tmp_path: Path) -> None:
+    workspace = tmp_path / "ws"
+    (workspace / "docs").mkdir(parents=True)
+    (workspace / "docs" / "a.txt").write_text("inside", encoding="utf-8")
+    (tmp_path / "ws2").mkdir()
+    (tmp_path / "ws2" / "secret.txt").write_text("secret", encoding="utf-8")
+    (workspace / "link_out.txt").symlink_to(tmp_path / "ws2" / "secret.txt")
+    (workspace / "link_in").symlink_to(workspace / "docs")
+    cfg = load_config()
+    cfg.file_access.allowed_roots = ["./"]
+    ctx = SkillContext(config=cfg, project_root=tmp_path, workspace_root=workspace)
+    executor = ToolExecutor()
+
+    assert executor.execute("file_read", {"path": "link_in/a.txt"}, ctx).text == "inside"
+    assert executor.execute("file_read", {"path": "link_out.txt"}, ctx).text == "路径不在允许范围内"
+    assert executor.execute("file_read", {"path": "../ws2/secret.txt"}, ctx).text == "路径不在允许范围内"
+    assert executor.execute("file_read", {"path": "docs"}, ctx).text == "文件不存在"
+    assert ctx.sandbox is ctx.sandbox
+    assert not ctx.sandbox.contains(tmp_path / "ws2")
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import pytest
+
+from claw_demo.llm.json_stream import IncrementalJSONParser, JSONStreamError
+
+
+def test_parser_emits_array_items_as_they_close() -> None:
+    parser = IncrementalJSONParser("records")
+    doc = '```json\n{"records":[{"key":"a","tags":["x,]"]},{"key":"b\\"}"}],"other":1}\n```'
+    emitted: list[list] = []
+    for i in range(0, len(doc), 7):
+        emitted.append(parser.feed(doc[i : i + 7]))
+    keys = [item["key"] for batch in emitted for item in batch]
+    assert keys == ["a", 'b"}']
+    assert parser.done
+    assert parser.close()["other"] == 1
+
+
+def test_parser_scalar_items() -> None:
+    parser = IncrementalJSONParser("keep")
+    parser.feed('{"keep": [0, 2')
+    assert parser.items == [0]
+    parser.feed("]}")
+    assert parser.items == [0, 2]
+
+
+def test_parser_aborts_early_on_invalid_item() -> None:
+    def _require_key(item):
+        if "key" not in item:
+            raise ValueError("missing key")
+
+    parser = IncrementalJSONParser("records", _require_key)
+    parser.feed('{"records":[{"key":"a"},')
+    with pytest.raises(JSONStreamError):
+        parser.feed('{"content":"no key"}')
+
+
+def test_parser_skips_prose_before_the_object() -> None:
+    parser = IncrementalJSONParser("records")
+    assert parser.feed("好的，以下是结果：\n") == []
+    parser.feed('{"records":[{"key":"a"}]}')
+    assert [item["key"] for item in parser.items] == ["a"]
+    assert parser.close() == {"records": [{"key": "a"}]}
+
+
+@pytest.mark.parametrize("raw", ['{"records":[}', '{"a":1} trailing'])
+def test_parser_rejects_malformed_prefixes(raw: str) -> None:
+    with pytest.raises(JSONStreamError):
+        IncrementalJSONParser("records").feed(raw)
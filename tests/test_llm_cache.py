@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+
+from claw_demo.config.loader import load_config
+from claw_demo.llm.cache import ResponseCache, build_response_cache, completion_cache_key, get_response_cache
+from claw_demo.skills.map_reduce import build_summary_cache
+from claw_demo.memory.extractor import LLMMemoryExtractor
+
+
+class _Message:
+    def __init__(self, content: str) -> None:
+        self.content = content
+
+
+class _Choice:
+    def __init__(self, content: str) -> None:
+        self.message = _Message(content)
+
+
+class _Response:
+    def __init__(self, content: str) -> None:
+        self.choices = [_Choice(content)]
+
+
+class CountingClient:
+    def __init__(self, content: str) -> None:
+        self.calls = 0
+        self.content = content
+        self.chat = self
+        self.completions = self
+
+    def create(self, **kwargs):
+        self.calls += 1
+        return _Response(self.content)
+
+
+def test_cache_key_is_stable_and_content_addressed() -> None:
+    messages = [{"role": "user", "content": "hi"}]
+    a = completion_cache_key("m", messages, None, 0)
+    b = completion_cache_key("m", [{"content": "hi", "role": "user"}], [], 0)
+    assert a == b
+    assert a != completion_cache_key("m2", messages, None, 0)
+    assert a != completion_cache_key("m", messages, None, 0.3)
+    assert a != completion_cache_key("m", messages, None, 0, {"type": "json_object"})
+
+
+def test_cache_ttl_and_lru_eviction(tmp_path: Path) -> None:
+    cache = ResponseCache(tmp_path, ttl_sec=60, max_entries=2, max_bytes=1024 * 1024)
+    cache.put("aa01", {"content": "one"})
+    cache.put("bb02", {"content": "two"})
+    old = time.time() - 10
+    os.utime(cache._path("aa01"), (old, old))
+    os.utime(cache._path("bb02"), (old - 10, old - 10))
+    assert cache.get("aa01") == {"content": "one"}
+
+    cache.put("cc03", {"content": "three"})
+    assert cache.get("bb02") is None
+    assert cache.get("aa01") is not None
+    assert cache.get("cc03") is not None
+
+    expired = ResponseCache(tmp_path / "ttl", ttl_sec=1, max_entries=10, max_bytes=1024 * 1024)
+    expired.put("dd04", {"content": "x"})
+    path = expired._path("dd04")
+    path.write_text(json.dumps({"created_at": time.time() - 5, "payload": {"content": "x"}}), encoding="utf-8")
+    assert expired.get("dd04") is None
+    assert not path.exists()
+
+
+def test_cache_puts_scan_directory_only_when_over_limit(tmp_path: Path) -> None:
+    cache = ResponseCache(tmp_path, ttl_sec=60, max_entries=50, max_bytes=1024 * 1024)
+    scans: list[int] = []
+    evict = cache._evict
+    cache._evict = lambda: scans.append(1) or evict()
+
+    for i in range(120):
+        cache.put(f"{i:04x}", {"content": "x" * 20})
+        cache.put(f"{i:04x}", {"content": "y" * 20})
+
+    assert len(list(tmp_path.glob("*/*.json"))) <= 50
+    assert len(scans) <= 20
+    assert cache.get(f"{119:04x}") == {"content": "y" * 20}
+
+
+def test_extractor_cache_hit_skips_network(tmp_path: Path) -> None:
+    cfg = load_config()
+    cfg.llm.api_key = ""
+    cfg.llm.cache.enabled = True
+    cfg.llm.cache.root = "./cache"
+    cache = build_response_cache(cfg, tmp_path)
+    assert cache is not None
+
+    client = CountingClient('{"records":[{"key":"pref:drink","mem_type":"profile","tags":[],"content":"用户喜欢奶茶"}]}')
+    extractor = LLMMemoryExtractor(cfg, cache=cache)
+    extractor._client = client
+    first = extractor.extract("我喜欢奶茶")
+    second = extractor.extract("我喜欢奶茶")
+    assert [e.key for e in first] == [e.key for e in second] == ["pref:drink"]
+    assert client.calls == 1
+    assert cache.stats.hits == 1
+    assert "hit_ratio=50%" in cache.stats.summary()
+
+
+def test_extractor_does_not_cache_unparsable_reply(tmp_path: Path) -> None:
+    cfg = load_config()
+    cfg.llm.api_key = ""
+    cfg.llm.cache.enabled = True
+    cfg.llm.cache.root = "./cache"
+    cfg.llm.stream_parse = False
+    cache = build_response_cache(cfg, tmp_path)
+    assert cache is not None
+
+    client = CountingClient("<html>502 Bad Gateway</html>")
+    extractor = LLMMemoryExtractor(cfg, cache=cache)
+    extractor._client = client
+    assert extractor.extract("我喜欢奶茶") == []
+    assert not list(tmp_path.glob("cache/*/*.json"))
+
+    client.calls = 0
+    client.content = '{"records":[{"key":"pref:drink","mem_type":"profile","tags":[],"content":"用户喜欢奶茶"}]}'
+    assert [e.key for e in extractor.extract("我喜欢奶茶")] == ["pref:drink"]
+    assert [e.key for e in extractor.extract("我喜欢奶茶")] == ["pref:drink"]
+    assert client.calls == 1
+
+
+def test_response_and_summary_caches_share_one_instance_per_directory(tmp_path: Path) -> None:
+    cfg = load_config()
+    cfg.llm.cache.enabled = True
+    cfg.llm.cache.root = "./shared"
+    cfg.skills.summarize.cache_enabled = True
+    cfg.skills.summarize.cache_root = "./shared/../shared"
+    cache = build_response_cache(cfg, tmp_path)
+    assert cache is not None
+    assert build_summary_cache(cfg, tmp_path) is cache
+    assert get_response_cache(tmp_path / "shared", 1, 1, 1) is cache
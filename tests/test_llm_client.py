@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from claw_demo.agent.workflow_runner import WorkflowAgentRunner
+from claw_demo.config.loader import load_config
+from claw_demo.llm import client as client_mod
+from claw_demo.memory.extractor import LLMMemoryExtractor, LLMMemoryVerifier
+from claw_demo.skills.dispatcher import AgentSkillDispatcher
+
+
+class FakeHttpClient:
+    def __init__(self) -> None:
+        self.requests: list[tuple[str, str]] = []
+
+    def request(self, method: str, url: str, timeout=None) -> None:
+        self.requests.append((method, url))
+
+
+class FakeClient:
+    def close(self) -> None:
+        pass
+
+
+def _fake_create(created: list[tuple[str, str, float]]):
+    def create(base_url, api_key, timeout, pool):
+        created.append((base_url, api_key, timeout))
+        return client_mod._PooledClient(client=FakeClient(), http_client=FakeHttpClient(), base_url=base_url)
+
+    return create
+
+
+def test_clients_are_shared_per_endpoint(tmp_path: Path, monkeypatch) -> None:
+    created: list[tuple[str, str, float]] = []
+    monkeypatch.setattr(client_mod, "_create_client", _fake_create(created))
+    client_mod.reset_clients()
+
+    cfg = load_config()
+    cfg.llm.api_key = "k"
+    cfg.llm.routes = {}
+    cfg.file_access.workspace_dir = str(tmp_path)
+    extractor = LLMMemoryExtractor(cfg)
+    verifier = LLMMemoryVerifier(cfg)
+    runner = WorkflowAgentRunner(config=cfg, project_root=tmp_path)
+    dispatcher = AgentSkillDispatcher(config=cfg, project_root=tmp_path)
+    assert extractor._client is verifier._client is runner._client is dispatcher._client
+    assert len(created) == 1
+
+    assert client_mod.get_client(cfg.llm.base_url, "k", 5, cfg.llm.pool) is not runner._client
+    assert len(created) == 2
+    client_mod.reset_clients()
+
+
+def test_prewarm_opens_each_pool_once(monkeypatch) -> None:
+    monkeypatch.setattr(client_mod, "_create_client", _fake_create([]))
+    client_mod.reset_clients()
+
+    cfg = load_config()
+    cfg.llm.api_key = "k"
+    client_mod.get_client(cfg.llm.base_url, cfg.llm.api_key, cfg.llm.timeout_sec, cfg.llm.pool)
+    pooled = next(iter(client_mod._CLIENTS.values()))
+    for thread in client_mod.prewarm_clients(cfg):
+        thread.join()
+    assert client_mod.prewarm_clients(cfg) == []
+    assert pooled.http_client.requests == [("HEAD", cfg.llm.base_url)]
+
+    cfg.llm.pool.prewarm = False
+    assert client_mod.prewarm_clients(cfg) == []
+    client_mod.reset_clients()
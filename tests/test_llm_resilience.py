@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import openai
+import pytest
+
+from claw_demo.config.loader import load_config
+from claw_demo.llm.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    Deadline,
+    DeadlineExceeded,
+    RetryPolicy,
+    call_with_resilience,
+)
+from claw_demo.llm.routing import LatencyTracker, LLMRouter
+
+
+class FaultInjectingServer:
+    def __init__(self, script: list[tuple[int, dict[str, str]]]) -> None:
+        self.script = list(script)
+        self.hits = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                self.rfile.read(int(self.headers.get("content-length", 0)))
+                server.hits += 1
+                status, headers = server.script.pop(0) if server.script else (200, {})
+                if status == 200:
+                    body = json.dumps(
+                        {
+                            "id": "cmpl-1",
+                            "object": "chat.completion",
+                            "created": 0,
+                            "model": "stub",
+                            "choices": [
+                                {"index": 0, "message": {"role": "assistant", "content": "ok"}, "finish_reason": "stop"}
+                            ],
+                        }
+                    ).encode()
+                else:
+                    body = json.dumps({"error": {"message": f"injected {status}"}}).encode()
+                self.send_response(status)
+                self.send_header("content-type", "application/json")
+                self.send_header("content-length", str(len(body)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_port}/v1"
+
+    def __enter__(self) -> FaultInjectingServer:
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _router(base_url: str, max_retries: int, threshold: int = 5) -> LLMRouter:
+    cfg = load_config()
+    cfg.llm.api_key = "k"
+    cfg.llm.base_url = base_url
+    cfg.llm.max_retries = max_retries
+    cfg.llm.routes = {}
+    cfg.llm.resilience.base_delay_sec = 0.001
+    cfg.llm.resilience.max_delay_sec = 0.01
+    cfg.llm.resilience.breaker_failure_threshold = threshold
+    return LLMRouter(cfg, tracker=LatencyTracker())
+
+
+def _complete(router: LLMRouter):
+    route = router.resolve("workflow")
+    return router.complete(route, router.client(route), messages=[{"role": "user", "content": "hi"}])
+
+
+def test_retries_429_and_5xx_then_succeeds() -> None:
+    with FaultInjectingServer([(429, {"retry-after": "0"}), (503, {})]) as server:
+        resp = _complete(_router(server.base_url, max_retries=2))
+    assert resp.choices[0].message.content == "ok"
+    assert server.hits == 3
+
+
+def test_client_errors_are_not_retried() -> None:
+    with FaultInjectingServer([(400, {})]) as server:
+        with pytest.raises(openai.BadRequestError):
+            _complete(_router(server.base_url, max_retries=3))
+    assert server.hits == 1
+
+
+def test_open_breaker_fails_fast_without_network() -> None:
+    with FaultInjectingServer([(500, {})] * 5) as server:
+        router = _router(server.base_url, max_retries=0, threshold=2)
+        for _ in range(2):
+            with pytest.raises(openai.InternalServerError):
+                _complete(router)
+        with pytest.raises(CircuitOpenError):
+            _complete(router)
+    assert server.hits == 2
+
+
+def test_backoff_jitter_bounds_and_retry_after() -> None:
+    delays: list[float] = []
+    calls = {"n": 0}
+
+    def flaky() -> str:
+        calls["n"] += 1
+        if calls["n"] == 1:
+            raise ConnectionError("reset")
+        return "done"
+
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout_sec=1)
+    policy = RetryPolicy(max_retries=2, base_delay_sec=0.1, max_delay_sec=1.0)
+    assert call_with_resilience(flaky, "stub", policy, breaker, sleep=delays.append) == "done"
+    assert len(delays) == 1 and 0.05 <= delays[0] <= 0.1
+    assert policy.backoff(0, retry_after=3.0) == 3.0
+    assert policy.backoff(5) <= 1.0
+    assert breaker.state == "closed"
+
+
+def test_deadline_stops_retries_and_caps_request_timeout() -> None:
+    delays: list[float] = []
+
+    def always_down() -> str:
+        raise ConnectionError("reset")
+
+    breaker = CircuitBreaker(failure_threshold=50, reset_timeout_sec=1)
+    policy = RetryPolicy(max_retries=5, base_delay_sec=2.0, max_delay_sec=4.0)
+    with pytest.raises(ConnectionError):
+        call_with_resilience(always_down, "stub", policy, breaker, sleep=delays.append, deadline=Deadline.after(0.5))
+    assert delays == []
+
+    with pytest.raises(DeadlineExceeded):
+        call_with_resilience(lambda: "late", "stub", policy, breaker, deadline=Deadline(expires_at=0.0, budget_sec=1))
+
+    with FaultInjectingServer([]) as server:
+        router = _router(server.base_url, max_retries=0)
+        route = router.resolve("workflow")
+        seen: dict[str, float] = {}
+        client = router.client(route)
+        original = client.chat.completions.create
+
+        def _spy(**kwargs):
+            seen["timeout"] = kwargs["timeout"]
+            return original(**kwargs)
+
+        client.chat.completions.create = _spy
+        router.complete(route, client, Deadline.after(5), messages=[{"role": "user", "content": "hi"}])
+    assert 0 < seen["timeout"] <= 5
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from claw_demo.config.loader import load_config
+from claw_demo.config.schema import LLMRouteConfig
+from claw_demo.llm.routing import LatencyTracker, LLMRouter
+
+
+def test_routes_inherit_llm_defaults() -> None:
+    cfg = load_config()
+    cfg.llm.api_key = "k"
+    cfg.llm.routes = {"extract": LLMRouteConfig(model="cheap-model", timeout_sec=10)}
+    router = LLMRouter(cfg, tracker=LatencyTracker())
+
+    extract = router.resolve("extract")
+    assert extract.model == "cheap-model"
+    assert extract.timeout_sec == 10
+    assert extract.base_url == cfg.llm.base_url
+    assert extract.max_retries == cfg.llm.max_retries
+
+    workflow = router.resolve("workflow")
+    assert workflow.model == cfg.llm.model
+
+
+def test_default_config_keeps_memory_stages_off_main_model() -> None:
+    cfg = load_config()
+    router = LLMRouter(cfg, tracker=LatencyTracker())
+    assert router.resolve("extract").model != cfg.llm.model
+    assert router.resolve("verify").model != cfg.llm.model
+
+
+def test_latency_budget_switches_to_fallback_route() -> None:
+    cfg = load_config()
+    cfg.llm.routes = {
+        "workflow": LLMRouteConfig(model="big", fallback="workflow_fast", p95_budget_ms=1000),
+        "workflow_fast": LLMRouteConfig(model="small"),
+    }
+    tracker = LatencyTracker(min_samples=3)
+    router = LLMRouter(cfg, tracker=tracker)
+    assert router.select("workflow").model == "big"
+
+    for ms in [200, 300, 250]:
+        tracker.record("workflow", ms)
+    assert router.select("workflow").model == "big"
+
+    for ms in [4000, 5000, 4500, 6000]:
+        tracker.record("workflow", ms)
+    selected = router.select("workflow")
+    assert selected.name == "workflow_fast"
+    assert selected.model == "small"
+
+    tracker.window_sec = 0
+    assert router.select("workflow").model == "big"
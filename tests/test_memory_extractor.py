@@ -47,3 +47,58 @@ def test_verifier_parse_decision_json_block() -> None:
     parsed = verifier._parse_decision('{"keep":[0,2]}')
     assert parsed is not None
     assert parsed.keep == [0, 2]
+
+
+class _Delta:
+    def __init__(self, content: str) -> None:
+        self.content = content
+
+
+class _StreamChoice:
+    def __init__(self, content: str) -> None:
+        self.delta = _Delta(content)
+
+
+class _Chunk:
+    def __init__(self, content: str) -> None:
+        self.choices = [_StreamChoice(content)]
+
+
+class StreamingClient:
+    def __init__(self, responses: list[str]) -> None:
+        self.responses = responses
+        self.calls: list[dict] = []
+        self.chunks_sent = 0
+        self.chat = self
+        self.completions = self
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        raw = self.responses[len(self.calls) - 1]
+
+        def _gen():
+            for i in range(0, len(raw), 5):
+                self.chunks_sent += 1
+                yield _Chunk(raw[i : i + 5])
+
+        return _gen()
+
+
+def test_extractor_stream_parse_aborts_early_and_retries() -> None:
+    cfg = load_config()
+    cfg.llm.api_key = ""
+    cfg.llm.stream_parse = True
+    cfg.llm.response_format = "json_schema"
+    bad = '{"records":[{"key":"k","mem_type":"bogus","content":"x"}' + " " * 500 + "]}"
+    good = '{"records":[{"key":"pref:drink","mem_type":"profile","tags":[],"content":"用户喜欢奶茶"}]}'
+    client = StreamingClient([bad, good])
+    extractor = LLMMemoryExtractor(cfg)
+    extractor._client = client
+
+    rows = extractor.extract("我喜欢奶茶")
+    assert [r.key for r in rows] == ["pref:drink"]
+    assert client.calls[0]["stream"] is True
+    assert client.calls[0]["response_format"]["type"] == "json_schema"
+    assert extractor.parse_stats.early_aborts == 1
+    assert extractor.parse_stats.retries == 1
+    assert client.chunks_sent < (len(bad) + len(good)) // 5
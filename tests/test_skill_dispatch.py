@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+import threading
+import time
 from pathlib import Path
 
+from claw_demo.agent.planner import direct_tool_call
 from claw_demo.config.loader import load_config
+from claw_demo.llm.resilience import Deadline
 from claw_demo.skills.dispatcher import AgentSkillDispatcher
-from claw_demo.skills.models import SkillContext
-from claw_demo.skills.toolbox import ToolExecutor
+from claw_demo.skills.models import SkillContext, SkillResult
+from claw_demo.skills.tool_cache import ToolResultCache, build_tool_cache
+from claw_demo.skills.toolbox import ToolExecutor, select_tool_schemas
 
 
 def test_dispatch_requires_llm(tmp_path: Path) -> None:
@@ -102,3 +107,148 @@ def test_tool_executor_time(tmp_path: Path) -> None:
     result = executor.execute("time", {}, ctx)
     assert result.ok
     assert "当前时间(Asia/Shanghai)" in result.text
+
+
+def test_execute_many_runs_concurrently_in_order_with_per_tool_limit(tmp_path: Path) -> None:
+    cfg = load_config()
+    ctx = SkillContext(config=cfg, project_root=tmp_path, workspace_root=tmp_path)
+    executor = ToolExecutor(max_workers=4, tool_concurrency={"email": 1})
+    active: dict[str, int] = {"weather": 0, "email": 0}
+    peak: dict[str, int] = {"weather": 0, "email": 0}
+    lock = threading.Lock()
+
+    def _fake_execute(tool_name, tool_args, ctx):
+        with lock:
+            active[tool_name] += 1
+            peak[tool_name] = max(peak[tool_name], active[tool_name])
+        time.sleep(0.05)
+        with lock:
+            active[tool_name] -= 1
+        return SkillResult(ok=True, text=f"{tool_name}:{tool_args['n']}")
+
+    executor.execute = _fake_execute  # type: ignore[assignment]
+    calls = [("weather", {"n": 1}), ("email", {"n": 2}), ("weather", {"n": 3}), ("email", {"n": 4})]
+    outcomes = executor.execute_many(calls, ctx)
+
+    assert [o.result.text for o in outcomes] == ["weather:1", "email:2", "weather:3", "email:4"]
+    assert peak["weather"] == 2
+    assert peak["email"] == 1
+    assert all(o.elapsed_ms >= 40 for o in outcomes)
+
+
+def test_tool_result_cache_validates_files_and_skips_side_effects(tmp_path: Path) -> None:
+    cfg = load_config()
+    cfg.file_access.workspace_dir = str(tmp_path)
+    ctx = SkillContext(config=cfg, project_root=tmp_path, workspace_root=tmp_path)
+    cache = build_tool_cache(cfg)
+    assert cache is not None
+    executor = ToolExecutor(result_cache=cache)
+    target = tmp_path / "notes.txt"
+    target.write_text("v1", encoding="utf-8")
+
+    first = executor.execute_many([("file_read", {"path": "notes.txt"})], ctx)[0]
+    second = executor.execute_many([("file_read", {"path": "notes.txt"})], ctx)[0]
+    assert not first.cached and second.cached
+    assert second.result.text == "v1"
+
+    target.write_text("version two", encoding="utf-8")
+    third = executor.execute_many([("file_read", {"path": "notes.txt"})], ctx)[0]
+    assert not third.cached and third.result.text == "version two"
+
+    executor.execute_many([("time", {})], ctx)
+    assert not executor.execute_many([("time", {})], ctx)[0].cached
+    assert cache.stats.hits == 1
+
+
+def test_deadline_reports_started_calls_as_unknown_not_cancelled(tmp_path: Path) -> None:
+    cfg = load_config()
+    ctx = SkillContext(config=cfg, project_root=tmp_path, workspace_root=tmp_path)
+    executor = ToolExecutor(max_workers=1)
+    finished = threading.Event()
+
+    def _slow(name, args, ctx):
+        time.sleep(0.4)
+        finished.set()
+        return SkillResult(ok=True, text="sent")
+
+    executor.execute = _slow
+    outcomes = executor.execute_many(
+        [("email", {"to": "a@b.c", "subject": "s", "body": "b"}), ("email", {"to": "d@e.f", "subject": "s", "body": "b"})],
+        ctx,
+        deadline=Deadline.after(0.1),
+    )
+
+    assert "仍在后台运行" in outcomes[0].result.text and "已取消" not in outcomes[0].result.text
+    assert "已取消" in outcomes[1].result.text
+    assert finished.wait(2)
+
+
+def test_tool_result_cache_revalidates_summarize_by_path(tmp_path: Path) -> None:
+    cfg = load_config()
+    cfg.file_access.allowed_roots = [str(tmp_path)]
+    ctx = SkillContext(config=cfg, project_root=tmp_path, workspace_root=tmp_path)
+    executor = ToolExecutor(result_cache=ToolResultCache(cfg.skills.tool_cache))
+    target = tmp_path / "notes.txt"
+    target.write_text("第一版内容。", encoding="utf-8")
+
+    first = executor.execute_many([("summarize", {"path": "notes.txt"})], ctx)[0]
+    assert executor.execute_many([("summarize", {"path": "notes.txt"})], ctx)[0].cached
+
+    target.write_text("第二版内容，已经改写。", encoding="utf-8")
+    third = executor.execute_many([("summarize", {"path": "notes.txt"})], ctx)[0]
+    assert not third.cached
+    assert "第二版" in third.result.text and third.result.text != first.result.text
+
+
+def test_tool_result_cache_expires_weather_by_ttl(tmp_path: Path) -> None:
+    cfg = load_config()
+    ctx = SkillContext(config=cfg, project_root=tmp_path, workspace_root=tmp_path)
+    cache = ToolResultCache(cfg.skills.tool_cache)
+    cache.put("weather", {"city": "上海"}, ctx, SkillResult(ok=True, text="sunny"))
+    cache.put("weather", {"city": "北京"}, ctx, SkillResult(ok=False, text="down"))
+    assert cache.get("weather", {"city": "上海"}, ctx).text == "sunny"
+    assert cache.get("weather", {"city": "北京"}, ctx) is None
+
+    cache._entries[("weather", str(tmp_path), '{"city":"上海"}')].stored_at -= cfg.skills.tool_cache.weather_ttl_sec + 1
+    assert cache.get("weather", {"city": "上海"}, ctx) is None
+
+
+def test_tool_result_cache_keys_by_canonical_args(tmp_path: Path) -> None:
+    cfg = load_config()
+    ctx = SkillContext(config=cfg, project_root=tmp_path, workspace_root=tmp_path)
+    cache = ToolResultCache(cfg.skills.tool_cache)
+    cache.put("file_search", {"query": "app.log"}, ctx, SkillResult(ok=True, text="app.log"))
+    hit = cache.get("file_search", {"query": "app.log", "path": "./", "mode": "name"}, ctx)
+    assert hit is not None and hit.text == "app.log"
+
+
+def test_direct_tool_call_fills_arguments_locally() -> None:
+    assert direct_tool_call("上海天气", ["weather"]) == ("weather", {"city": "上海"})
+    assert direct_tool_call("帮我查一下北京今天的天气", ["weather"]) == ("weather", {"city": "北京"})
+    assert direct_tool_call("今天天气怎么样", ["weather"]) == ("weather", {})
+    assert direct_tool_call("明天上海天气", ["weather"]) is None
+    assert direct_tool_call("现在几点", ["time"]) == ("time", {})
+    assert direct_tool_call("纽约现在几点", ["time"]) == ("time", {"timezone": "America/New_York"})
+    assert direct_tool_call("现在几点，上海天气", ["weather", "time"]) is None
+    assert direct_tool_call("北京时间几点了？", ["time"]) == ("time", {"timezone": "Asia/Shanghai"})
+    assert direct_tool_call("what time is it in Asia/Tokyo", ["time"]) == ("time", {"timezone": "Asia/Tokyo"})
+
+
+def test_direct_tool_call_needs_a_time_or_weather_question() -> None:
+    assert direct_tool_call("给我一些时间管理的建议", ["time"]) is None
+    assert direct_tool_call("I feel tired sometimes", ["time"]) is None
+    assert direct_tool_call("timeline 怎么写", ["time"]) is None
+    assert direct_tool_call("给我几点建议", ["time"]) is None
+    assert direct_tool_call("weatherproof 外套推荐", ["weather"]) is None
+
+
+def test_select_tool_schemas_subsets_by_enabled_and_intent() -> None:
+    def names(schemas):
+        return [s["function"]["name"] for s in schemas]
+
+    all_tools = ["weather", "time", "file_search", "file_read", "summarize", "email"]
+    assert names(select_tool_schemas(all_tools)) == ["weather", "file_search", "file_read", "summarize", "email", "time"]
+    assert names(select_tool_schemas(all_tools, ["time"])) == ["time"]
+    assert names(select_tool_schemas(all_tools, ["file_search"])) == ["file_search", "file_read"]
+    assert names(select_tool_schemas(["time", "weather"], ["email"])) == ["weather", "time"]
+    assert len(select_tool_schemas(["my_external_skill"], ["my_external_skill"])) == 6
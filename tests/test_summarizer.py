@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from claw_demo.config.loader import load_config
+from claw_demo.llm.cache import ResponseCache
+from claw_demo.skills.map_reduce import MapReduceSummarizer, split_chunks
+from claw_demo.skills.models import SkillContext
+from claw_demo.skills.summarizer import ExtractiveSummarizer, split_sentences, summarize_text
+from claw_demo.skills.toolbox import ToolExecutor
+
+ZH_TEXT = (
+    "本季度公司营收增长了百分之二十。营收增长主要来自海外市场。海外市场的营收占比首次超过一半。"
+    "员工食堂更换了新的供应商。下季度公司计划继续扩大海外市场投入。天气一直不错。"
+)
+EN_TEXT = (
+    "The release adds a new cache layer. The cache layer cuts latency by half. "
+    "The office plants were watered on Monday. The new cache layer cuts latency by half. "
+    "Next release will extend the cache layer to search."
+)
+
+
+def test_split_sentences_handles_chinese_and_english() -> None:
+    assert split_sentences("第一句。第二句！Third one. Fourth?\n第五句") == ["第一句。", "第二句！", "Third one.", "Fourth?", "第五句"]
+
+
+def test_summary_keeps_central_sentences_and_drops_redundant_ones() -> None:
+    zh = summarize_text(ZH_TEXT, 60)
+    assert "营收" in zh
+    assert "食堂" not in zh and "天气" not in zh
+
+    en = summarize_text(EN_TEXT, 130)
+    assert "plants" not in en
+    assert en.count("cuts latency by half") == 1
+
+
+def test_summary_of_unpunctuated_text_stays_near_target() -> None:
+    english = " ".join(f"service worker {i} restarted after the cache warmup" for i in range(90))
+    chinese = "".join(f"第{i}号节点在缓存预热后重新启动" for i in range(100))
+    for text in (english, chinese):
+        summary = summarize_text(text, 300)
+        assert 0 < len(summary) <= 360
+        assert summary.split()[0] in text
+
+
+def test_streaming_summary_stays_bounded_over_large_input() -> None:
+    summarizer = ExtractiveSummarizer(target_chars=120, block_chars=500)
+    for i in range(200):
+        summarizer.feed(f"Filler paragraph {i} mentions nothing in particular today.\n")
+        if i % 50 == 0:
+            summarizer.feed("The migration to the cache layer finished and latency dropped.\n")
+
+    summary = summarizer.finish()
+
+    assert summarizer.total_chars > 10000
+    assert len(summary) <= 150
+    assert len(summarizer._candidates) < 40
+
+
+def test_summarize_tool_reads_file_from_path(tmp_path: Path) -> None:
+    (tmp_path / "report.txt").write_text(ZH_TEXT * 3, encoding="utf-8")
+    cfg = load_config()
+    cfg.file_access.allowed_roots = [str(tmp_path)]
+    ctx = SkillContext(config=cfg, project_root=tmp_path, workspace_root=tmp_path)
+    executor = ToolExecutor()
+
+    result = executor.execute("summarize", {"path": "report.txt", "max_chars": 80}, ctx)
+    assert result.ok
+    assert "营收" in result.text and len(result.text) <= 100
+
+    assert not executor.execute("summarize", {"path": "../x.txt"}, ctx).ok
+    assert not executor.execute("summarize", {}, ctx).ok
+
+
+def _paragraphs(n: int, prefix: str = "Paragraph") -> str:
+    return "\n\n".join(
+        f"{prefix} {i} says the cache layer handled request batch {i} within budget. Nothing else happened."
+        for i in range(n)
+    )
+
+
+def test_split_chunks_respects_paragraphs_and_size() -> None:
+    text = _paragraphs(40)
+    chunks = split_chunks(text, 600)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 600 for chunk in chunks)
+    assert "\n\n".join(chunks) == text
+    assert split_chunks("x" * 1500, 600) == ["x" * 600, "x" * 600, "x" * 300]
+
+
+def test_map_reduce_recomputes_only_edited_chunks(tmp_path: Path) -> None:
+    calls: list[str] = []
+
+    def _summarize(text: str, target: int) -> str:
+        calls.append(text)
+        return summarize_text(text, target)
+
+    cache = ResponseCache(tmp_path / "cache", ttl_sec=3600, max_entries=1000, max_bytes=10_000_000)
+    text = _paragraphs(60)
+
+    first = MapReduceSummarizer(_summarize, target_chars=200, chunk_chars=800, workers=4, cache=cache)
+    assert first.run(text)
+    assert first.chunks > 3 and first.stats.misses >= first.chunks
+
+    edited = text.replace("Paragraph 3 says", "Paragraph 3 now says")
+    second = MapReduceSummarizer(_summarize, target_chars=200, chunk_chars=800, workers=4, cache=cache)
+    second.run(edited)
+    assert second.stats.hits >= first.chunks - 2
+    assert 0 < second.stats.misses <= 3
+
+
+def test_streamed_map_reduce_matches_whole_text_chunks(tmp_path: Path) -> None:
+    text = _paragraphs(80)
+    seen: list[str] = []
+
+    def _summarize(chunk: str, target: int) -> str:
+        seen.append(chunk)
+        return chunk[:target]
+
+    pieces = iter([text[i : i + 333] for i in range(0, len(text), 333)])
+    streamed = MapReduceSummarizer(_summarize, target_chars=100, chunk_chars=700, workers=2)
+    assert streamed.run_stream(lambda: next(pieces, ""))
+
+    assert set(split_chunks(text, 700)) <= set(seen)
+
+
+def test_streamed_map_reduce_skips_leading_whitespace() -> None:
+    text = _paragraphs(40)
+    for prefix in ("\n" * 3000, " " * 20000):
+        seen: list[str] = []
+
+        def _summarize(chunk: str, target: int) -> str:
+            seen.append(chunk)
+            return chunk[:target]
+
+        padded = prefix + text
+        pieces = iter([padded[i : i + 500] for i in range(0, len(padded), 500)])
+        streamed = MapReduceSummarizer(_summarize, target_chars=100, chunk_chars=700, workers=2)
+        assert streamed.run_stream(lambda: next(pieces, ""))
+        assert all(chunk.strip() for chunk in seen)
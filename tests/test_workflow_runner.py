@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import asyncio
+import time
 from pathlib import Path
+from types import SimpleNamespace
 
+from claw_demo.agent.async_runner import AsyncWorkflowAgentRunner
 from claw_demo.agent.workflow_runner import WorkflowAgentRunner
 from claw_demo.config.loader import load_config
+from claw_demo.skills.models import SkillResult
 
 
 def test_workflow_requires_llm(tmp_path: Path) -> None:
@@ -32,3 +37,358 @@ def test_required_tools_for_time_request(tmp_path: Path) -> None:
     runner = WorkflowAgentRunner(config=cfg, project_root=tmp_path)
     tools = runner._required_tools("现在几点了")
     assert tools == ["time"]
+
+
+class ScriptedClient:
+    def __init__(self, turns: list[dict]) -> None:
+        self.turns = list(turns)
+        self.calls: list[dict] = []
+        self.chat = self
+        self.completions = self
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        turn = self.turns.pop(0)
+        if not kwargs.get("stream"):
+            tool_calls = [
+                SimpleNamespace(id=tc["id"], function=SimpleNamespace(name=tc["name"], arguments=tc["arguments"]))
+                for tc in turn.get("tool_calls", [])
+            ] or None
+            message = SimpleNamespace(content=turn.get("content"), tool_calls=tool_calls)
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+        def _chunks():
+            for piece in turn.get("preamble_chunks", []):
+                yield _delta(content=piece)
+            for i, tc in enumerate(turn.get("tool_calls", [])):
+                args = tc["arguments"]
+                yield _delta(tool_calls=[_tc_delta(i, tc["id"], tc["name"], args[:3])])
+                yield _delta(tool_calls=[_tc_delta(i, None, None, args[3:])])
+            for piece in turn.get("content_chunks", []):
+                yield _delta(content=piece)
+
+        return _chunks()
+
+
+def _tc_delta(index, tc_id, name, arguments):
+    return SimpleNamespace(index=index, id=tc_id, function=SimpleNamespace(name=name, arguments=arguments))
+
+
+def _delta(content=None, tool_calls=None):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content, tool_calls=tool_calls))])
+
+
+def test_runner_streams_final_answer_deltas(tmp_path: Path) -> None:
+    cfg = load_config()
+    cfg.llm.api_key = ""
+    cfg.llm.base_url = "http://scripted.invalid/v1"
+    cfg.skills.direct_answer = False
+    cfg.file_access.workspace_dir = str(tmp_path)
+    runner = WorkflowAgentRunner(config=cfg, project_root=tmp_path)
+    runner._client = ScriptedClient(
+        [
+            {"tool_calls": [{"id": "c1", "name": "time", "arguments": '{"timezone":"UTC"}'}]},
+            {"content_chunks": ["现在是", " UTC ", "时间。"]},
+        ]
+    )
+    chunks: list[str] = []
+    result = runner.run("现在几点了", stream_writer=chunks.append)
+    assert result.ok
+    assert chunks == ["现在是", " UTC ", "时间。"]
+    assert result.text == "现在是 UTC 时间。"
+    assert result.streamed
+    assert result.ttft_ms is not None and result.total_ms is not None
+    assert result.ttft_ms <= result.total_ms
+    assert any(line.startswith("time ") for line in result.tool_trace)
+    assert any(line.startswith("latency: ttft=") for line in result.tool_trace)
+    assert "stream" not in runner._client.calls[0]
+    assert runner._client.calls[1]["stream"] is True
+
+
+def test_runner_assembles_streamed_tool_call_deltas(tmp_path: Path) -> None:
+    cfg = load_config()
+    cfg.llm.api_key = ""
+    cfg.llm.base_url = "http://scripted.invalid/v1"
+    cfg.file_access.workspace_dir = str(tmp_path)
+    runner = WorkflowAgentRunner(config=cfg, project_root=tmp_path)
+    runner._client = ScriptedClient(
+        [
+            {"tool_calls": [{"id": "c1", "name": "time", "arguments": '{"timezone":"UTC"}'}]},
+            {"content_chunks": ["done"]},
+        ]
+    )
+    chunks: list[str] = []
+    result = runner.run("你好", stream_writer=chunks.append)
+    assert result.ok
+    assert chunks == ["done"]
+    assert 'time args={"timezone": "UTC"}' in result.tool_trace[0]
+
+
+def test_runner_drops_streamed_preamble_before_tool_calls(tmp_path: Path) -> None:
+    cfg = load_config()
+    cfg.llm.api_key = ""
+    cfg.llm.base_url = "http://scripted.invalid/v1"
+    cfg.file_access.workspace_dir = str(tmp_path)
+    runner = WorkflowAgentRunner(config=cfg, project_root=tmp_path)
+    runner._client = ScriptedClient(
+        [
+            {
+                "preamble_chunks": ["我先", "看一下文件。"],
+                "tool_calls": [{"id": "c1", "name": "file_search", "arguments": '{"query":"app.log"}'}],
+            },
+            {"content_chunks": ["没有找到", "相关文件。"]},
+        ]
+    )
+    chunks: list[str] = []
+    result = runner.run("你好", stream_writer=chunks.append)
+    assert result.ok
+    assert chunks == ["没有找到", "相关文件。"]
+    assert "".join(chunks) == result.text
+
+
+class AsyncScriptedClient:
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.chat = self
+        self.completions = self
+
+    async def create(self, **kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.02)
+        self.in_flight -= 1
+        messages = kwargs["messages"]
+        if messages[-1]["role"] == "tool":
+            message = SimpleNamespace(content=f"答复: {messages[1]['content']}", tool_calls=None)
+        else:
+            call = SimpleNamespace(id="c1", function=SimpleNamespace(name="time", arguments='{"timezone":"UTC"}'))
+            message = SimpleNamespace(content="", tool_calls=[call])
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def test_async_runner_drives_concurrent_workflows(tmp_path: Path) -> None:
+    cfg = load_config()
+    cfg.llm.api_key = ""
+    cfg.llm.base_url = "http://scripted.invalid/v1"
+    cfg.skills.direct_answer = False
+    cfg.file_access.workspace_dir = str(tmp_path)
+    runner = AsyncWorkflowAgentRunner(config=cfg, project_root=tmp_path)
+    runner._client = AsyncScriptedClient()
+
+    async def _main():
+        return await asyncio.gather(*(runner.run(f"现在几点了 #{i}") for i in range(5)))
+
+    results = asyncio.run(_main())
+    assert [r.text for r in results] == [f"答复: 现在几点了 #{i}" for i in range(5)]
+    assert all(r.ok and r.tool_trace[0].startswith("time ") for r in results)
+    assert runner._client.max_in_flight == 5
+
+
+def test_async_runner_requires_llm(tmp_path: Path) -> None:
+    cfg = load_config()
+    cfg.llm.api_key = ""
+    cfg.skills.direct_answer = False
+    cfg.file_access.workspace_dir = str(tmp_path)
+    runner = AsyncWorkflowAgentRunner(config=cfg, project_root=tmp_path)
+    result = asyncio.run(runner.run("现在几点了"))
+    assert not result.ok
+    assert "LLM 不可用" in result.text
+
+
+def test_fast_path_runs_compound_workflow_with_one_completion(tmp_path: Path) -> None:
+    cfg = load_config()
+    cfg.llm.api_key = ""
+    cfg.llm.base_url = "http://scripted.invalid/v1"
+    cfg.email.enabled = False
+    cfg.file_access.workspace_dir = str(tmp_path)
+    (tmp_path / "logs").mkdir()
+    (tmp_path / "logs" / "app.log").write_text("boot ok\nrequest served\n", encoding="utf-8")
+    runner = WorkflowAgentRunner(config=cfg, project_root=tmp_path)
+    runner._client = ScriptedClient([{"content": "已总结 app.log 并发送给 wang990099@163.com。"}])
+
+    result = runner.run("搜索到app.log文件，将文件总结，发送给wang990099@163.com")
+    assert result.ok
+    assert len(runner._client.calls) == 1
+    tools = [line.split(" ", 1)[0] for line in result.tool_trace[:4]]
+    assert tools == ["file_search", "file_read", "summarize", "email"]
+    assert "fast-path: file-digest 4/4 steps" in result.tool_trace
+    assert "[DRY-RUN]" in result.tool_trace[3] and "app.log 摘要" in result.tool_trace[3]
+    sent = runner._client.calls[0]["messages"]
+    assert [m["role"] for m in sent[2:]] == ["assistant", "tool"] * 4
+
+
+def test_fast_path_stops_on_missing_file(tmp_path: Path) -> None:
+    cfg = load_config()
+    cfg.llm.api_key = ""
+    cfg.llm.base_url = "http://scripted.invalid/v1"
+    cfg.file_access.workspace_dir = str(tmp_path)
+    runner = WorkflowAgentRunner(config=cfg, project_root=tmp_path)
+    runner._client = ScriptedClient([{"content": "没有找到 app.log。"}, {"content": "没有找到 app.log。"}])
+
+    result = runner.run("搜索到app.log文件，将文件总结，发送给wang990099@163.com")
+    assert "fast-path: file-digest 1/4 steps" in result.tool_trace
+    assert not any(line.startswith("email ") for line in result.tool_trace)
+
+
+def test_fast_path_hands_fuzzy_near_match_to_the_model(tmp_path: Path) -> None:
+    cfg = load_config()
+    cfg.llm.api_key = ""
+    cfg.llm.base_url = "http://scripted.invalid/v1"
+    cfg.email.enabled = False
+    cfg.file_access.workspace_dir = str(tmp_path)
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "r_e_p_o_r_t_old.txt").write_text("old numbers\n", encoding="utf-8")
+    runner = WorkflowAgentRunner(config=cfg, project_root=tmp_path)
+    runner._client = ScriptedClient([{"content": "没有找到 report.txt，请确认文件名。"}] * 2)
+
+    result = runner.run("搜索 report.txt 文件，总结后发送给 boss@corp.com")
+    assert "fast-path: file-digest 1/4 steps" in result.tool_trace
+    assert not any(line.startswith(("file_read ", "email ")) for line in result.tool_trace)
+
+
+def test_direct_answer_skips_llm_for_single_local_tool(tmp_path: Path) -> None:
+    cfg = load_config()
+    cfg.llm.api_key = ""
+    cfg.file_access.workspace_dir = str(tmp_path)
+    runner = WorkflowAgentRunner(config=cfg, project_root=tmp_path)
+    chunks: list[str] = []
+
+    result = runner.run("东京现在几点", stream_writer=chunks.append)
+    assert result.ok
+    assert result.text.startswith("当前时间(Asia/Tokyo)")
+    assert chunks == [result.text]
+    assert result.tool_trace[0].startswith('time args={"timezone": "Asia/Tokyo"}')
+    assert "direct-answer: hits=1 misses=0 hit_ratio=100%" in result.tool_trace
+
+    fallback = runner.run("现在几点了？顺便帮我写一段会议纪要的开头")
+    assert "LLM 不可用" in fallback.text
+    assert runner.direct_stats.misses == 1
+
+
+def test_direct_answer_leaves_non_time_questions_to_the_model(tmp_path: Path) -> None:
+    cfg = load_config()
+    cfg.llm.api_key = ""
+    cfg.llm.base_url = "http://scripted.invalid/v1"
+    cfg.skills.speculate = False
+    cfg.file_access.workspace_dir = str(tmp_path)
+    runner = WorkflowAgentRunner(config=cfg, project_root=tmp_path)
+    for text in ("给我一些时间管理的建议", "I feel tired sometimes", "timeline 怎么写"):
+        assert runner._required_tools(text) == ["time"]
+        runner._client = ScriptedClient(
+            [
+                {"tool_calls": [{"id": "c1", "name": "time", "arguments": "{}"}]},
+                {"content": "模型的回答。"},
+            ]
+        )
+        result = runner.run(text)
+        assert result.ok and result.text == "模型的回答。"
+        assert len(runner._client.calls) == 2
+    assert runner.direct_stats.hits == 0
+
+
+def test_speculative_read_only_tools_overlap_first_completion(tmp_path: Path) -> None:
+    cfg = load_config()
+    cfg.llm.api_key = ""
+    cfg.llm.base_url = "http://scripted.invalid/v1"
+    cfg.skills.direct_answer = False
+    cfg.file_access.workspace_dir = str(tmp_path)
+    runner = WorkflowAgentRunner(config=cfg, project_root=tmp_path)
+    runner._client = ScriptedClient(
+        [
+            {"tool_calls": [{"id": "c1", "name": "time", "arguments": '{"timezone":"Asia/Tokyo"}'}]},
+            {"content": "东京时间已给出。"},
+        ]
+    )
+    result = runner.run("东京现在几点")
+    assert result.ok
+    assert result.tool_trace[0].startswith("time ") and "(speculative)" in result.tool_trace[0]
+    assert "speculation: started=1 used=1 discarded=0" in result.tool_trace
+
+    runner._client = ScriptedClient(
+        [
+            {"tool_calls": [{"id": "c1", "name": "time", "arguments": '{"timezone":"UTC"}'}]},
+            {"content": "UTC 时间已给出。"},
+        ]
+    )
+    result = runner.run("东京现在几点")
+    assert "(speculative)" not in result.tool_trace[0]
+    assert "speculation: started=1 used=0 discarded=1" in result.tool_trace
+    assert runner.speculation_stats.discarded == 1
+
+
+def test_runner_offers_predicted_tool_subset_then_widens(tmp_path: Path) -> None:
+    cfg = load_config()
+    cfg.llm.api_key = ""
+    cfg.llm.base_url = "http://scripted.invalid/v1"
+    cfg.skills.direct_answer = False
+    cfg.file_access.workspace_dir = str(tmp_path)
+    runner = WorkflowAgentRunner(config=cfg, project_root=tmp_path)
+    runner._client = ScriptedClient([{"content": "我不确定。"}, {"content": "还是不确定。"}] * 3)
+
+    result = runner.run("现在几点了")
+    offered = [[t["function"]["name"] for t in call["tools"]] for call in runner._client.calls]
+    assert offered[0] == ["time"]
+    assert len(offered[1]) == 6
+    assert any(line.startswith("prompt-bytes:") and "tools=1,6" in line for line in result.tool_trace)
+
+
+def test_runner_offers_all_tools_when_hint_is_only_a_substring(tmp_path: Path) -> None:
+    cfg = load_config()
+    cfg.llm.api_key = ""
+    cfg.llm.base_url = "http://scripted.invalid/v1"
+    cfg.skills.direct_answer = False
+    cfg.file_access.workspace_dir = str(tmp_path)
+    runner = WorkflowAgentRunner(config=cfg, project_root=tmp_path)
+
+    for request in ("帮我打开 weather_report.csv 看一下", "看看 runtime.log 里有什么报错"):
+        runner._client = ScriptedClient([{"content": "没有找到这个文件。"}] * 6)
+        runner.run(request)
+        assert len(runner._client.calls[0]["tools"]) == 6
+
+
+def test_run_deadline_returns_partial_result_and_drops_slow_tools(tmp_path: Path) -> None:
+    cfg = load_config()
+    cfg.llm.api_key = ""
+    cfg.llm.base_url = "http://scripted.invalid/v1"
+    cfg.skills.timeout_sec = 1
+    cfg.skills.speculate = False
+    cfg.file_access.workspace_dir = str(tmp_path)
+    runner = WorkflowAgentRunner(config=cfg, project_root=tmp_path)
+    runner._client = ScriptedClient(
+        [{"tool_calls": [{"id": "c1", "name": "weather", "arguments": '{"city":"上海"}'}]}, {"content": "迟到的答复"}]
+    )
+    runner.tool_executor.execute = lambda name, args, ctx: time.sleep(3) or SkillResult(ok=True, text="晴")
+
+    started = time.perf_counter()
+    result = runner.run("帮我看看上海天气，顺便说说穿什么")
+    assert time.perf_counter() - started < 2.5
+    assert not result.ok
+    assert "时限" in result.text
+    assert "工具执行超时" in result.tool_trace[0]
+    assert "deadline: exceeded 1s" in result.tool_trace
+    assert len(runner._client.calls) == 1
+
+
+def test_async_run_deadline_cancels_slow_completion(tmp_path: Path) -> None:
+    cfg = load_config()
+    cfg.llm.api_key = ""
+    cfg.llm.base_url = "http://scripted.invalid/v1"
+    cfg.skills.timeout_sec = 1
+    cfg.skills.direct_answer = False
+    cfg.file_access.workspace_dir = str(tmp_path)
+
+    class _SlowClient:
+        def __init__(self) -> None:
+            self.chat = self
+            self.completions = self
+
+        async def create(self, **kwargs):
+            await asyncio.sleep(5)
+
+    runner = AsyncWorkflowAgentRunner(config=cfg, project_root=tmp_path)
+    runner._client = _SlowClient()
+    started = time.perf_counter()
+    result = asyncio.run(runner.run("你好"))
+    assert time.perf_counter() - started < 2.5
+    assert not result.ok and "时限" in result.text
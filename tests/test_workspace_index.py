@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from claw_demo.config.loader import load_config
+from claw_demo.skills.content_index import ContentIndex
+from claw_demo.skills.fuzzy import rank_paths
+from claw_demo.skills.models import SkillContext
+from claw_demo.skills.toolbox import ToolExecutor
+from claw_demo.skills.workspace_index import WorkspaceIndex, build_workspace_index, get_workspace_index
+
+
+def _make_tree(root: Path) -> None:
+    (root / "docs" / "notes").mkdir(parents=True)
+    (root / "docs" / "report_2024.md").write_text("r", encoding="utf-8")
+    (root / "docs" / "notes" / "Report-draft.txt").write_text("d", encoding="utf-8")
+    (root / "readme.md").write_text("x", encoding="utf-8")
+
+
+def test_index_search_matches_basenames_and_filters_subpath(tmp_path: Path) -> None:
+    _make_tree(tmp_path)
+    index = WorkspaceIndex(tmp_path, tmp_path / ".index" / "ws.json")
+    assert index.refresh(force=True)
+
+    assert index.search("report") == ["docs/notes/Report-draft.txt", "docs/report_2024.md"]
+    assert index.search("report", under="docs/notes") == ["docs/notes/Report-draft.txt"]
+    assert index.search("md") == ["docs/report_2024.md", "readme.md"]
+    assert "docs/notes" in index.search("notes")
+    assert not any(path.startswith(".index") for path in index.paths)
+
+
+def test_index_refresh_picks_up_new_files_and_persists(tmp_path: Path) -> None:
+    _make_tree(tmp_path)
+    store = tmp_path / ".index" / "ws.json"
+    index = WorkspaceIndex(tmp_path, store, refresh_sec=0)
+    index.refresh()
+    assert not index.refresh()
+
+    (tmp_path / "docs" / "notes" / "budget.xlsx").write_text("b", encoding="utf-8")
+    assert index.refresh()
+    assert index.search("budget") == ["docs/notes/budget.xlsx"]
+
+    reloaded = WorkspaceIndex(tmp_path, store, refresh_sec=0)
+    assert reloaded.search("budget") == ["docs/notes/budget.xlsx"]
+    assert not reloaded.refresh()
+
+
+def test_file_search_uses_workspace_index(tmp_path: Path) -> None:
+    _make_tree(tmp_path)
+    cfg = load_config()
+    cfg.file_access.allowed_roots = [str(tmp_path)]
+    cfg.file_access.index_root = "./.claw_cache/workspace"
+    ctx = SkillContext(config=cfg, project_root=tmp_path, workspace_root=tmp_path)
+
+    result = ToolExecutor().execute("file_search", {"query": "report", "path": "docs"}, ctx)
+
+    assert result.ok
+    assert "docs/report_2024.md" in result.text
+    assert list((tmp_path / ".claw_cache" / "workspace").glob("*.json"))
+
+
+def test_content_search_reports_line_hits_and_skips_binaries(tmp_path: Path) -> None:
+    _make_tree(tmp_path)
+    (tmp_path / "docs" / "report_2024.md").write_text("# Q3\nrevenue up\n\nRevenue target met\n", encoding="utf-8")
+    (tmp_path / "blob.bin").write_bytes(b"revenue\0\x01\x02")
+    (tmp_path / "big.log").write_text("revenue\n" * 100, encoding="utf-8")
+    cfg = load_config()
+    cfg.file_access.allowed_roots = [str(tmp_path)]
+    cfg.file_access.max_read_bytes = 200
+    ctx = SkillContext(config=cfg, project_root=tmp_path, workspace_root=tmp_path)
+    executor = ToolExecutor()
+
+    result = executor.execute("file_search", {"query": "revenue", "mode": "content"}, ctx)
+    assert result.text.splitlines() == ["docs/report_2024.md:2:revenue up", "docs/report_2024.md:4:Revenue target met"]
+
+    regex = executor.execute("file_search", {"query": r"^#\s*Q\d", "mode": "content", "regex": True}, ctx)
+    assert regex.text == "docs/report_2024.md:1:# Q3"
+
+    bad = executor.execute("file_search", {"query": "(", "mode": "content", "regex": True}, ctx)
+    assert not bad.ok
+
+
+def test_content_search_stops_at_hit_cap(tmp_path: Path) -> None:
+    for i in range(6):
+        (tmp_path / f"f{i}.txt").write_text("todo: a\ntodo: b\n", encoding="utf-8")
+    cfg = load_config()
+    cfg.file_access.allowed_roots = [str(tmp_path)]
+    cfg.file_access.content_search_max_hits = 3
+    ctx = SkillContext(config=cfg, project_root=tmp_path, workspace_root=tmp_path)
+
+    result = ToolExecutor().execute("file_search", {"query": "TODO", "mode": "content"}, ctx)
+
+    assert result.text.splitlines() == ["f0.txt:1:todo: a", "f0.txt:2:todo: b", "f1.txt:1:todo: a"]
+
+
+def test_content_index_narrows_candidates_and_reindexes_changed_files(tmp_path: Path) -> None:
+    (tmp_path / "a.txt").write_text("alpha beta\n", encoding="utf-8")
+    (tmp_path / "b.txt").write_text("gamma delta\n", encoding="utf-8")
+    store = tmp_path / ".index" / "content"
+    index = ContentIndex(tmp_path, store, max_bytes=1024, refresh_sec=0)
+    files = ["a.txt", "b.txt"]
+
+    assert index.update(files) == 2
+    assert index.candidates("BETA", files) == ["a.txt"]
+    assert index.candidates("mm", files) == files
+    assert index.update(files) == 0
+
+    (tmp_path / "b.txt").write_text("gamma beta delta\n", encoding="utf-8")
+    assert index.update(files) == 1
+    assert index.candidates("beta", files) == ["a.txt", "b.txt"]
+
+    (tmp_path / "a.txt").unlink()
+    reloaded = ContentIndex(tmp_path, store, max_bytes=1024, refresh_sec=0)
+    assert reloaded.candidates("beta", files) == ["a.txt", "b.txt"]
+    assert reloaded.update(["b.txt"]) == 0
+    assert reloaded.candidates("beta", files) == ["b.txt"]
+
+
+def test_fuzzy_ranking_prefers_basename_and_contiguous_matches(tmp_path: Path) -> None:
+    paths = ["config/app.yaml", "src/cfg_loader.py", "docs/config_guide.md", "notes/c-o-n-f-i-g.txt"]
+
+    ranked = rank_paths("config", paths, tmp_path, limit=3)
+
+    assert [path for path, _score in ranked] == ["docs/config_guide.md", "config/app.yaml", "notes/c-o-n-f-i-g.txt"]
+    assert ranked[0][1] > ranked[1][1] > ranked[2][1]
+    assert rank_paths("cfgld", paths, tmp_path)[0][0] == "src/cfg_loader.py"
+    assert rank_paths("zzz", paths, tmp_path) == []
+
+
+def test_fuzzy_ranking_puts_exact_stem_first_and_breaks_ties_stably(tmp_path: Path) -> None:
+    paths = [f"pkg/m{i % 10}/module_{i // 1000}_{i % 1000}.py" for i in range(10000)]
+
+    ranked = rank_paths("module_7_42", paths, tmp_path, limit=5)
+
+    assert ranked[0][0] == "pkg/m2/module_7_42.py"
+    assert ranked[0][1] > ranked[1][1]
+    assert [path for path, _score in ranked[1:]] == [
+        "pkg/m0/module_7_420.py",
+        "pkg/m1/module_7_421.py",
+        "pkg/m2/module_7_422.py",
+        "pkg/m3/module_7_423.py",
+    ]
+    assert [p for p, _ in rank_paths("readme", ["b/readme.md", "a/readme.md"], tmp_path)] == ["a/readme.md", "b/readme.md"]
+
+
+def test_file_search_returns_scored_best_match_first(tmp_path: Path) -> None:
+    _make_tree(tmp_path)
+    (tmp_path / "docs" / "archive").mkdir()
+    (tmp_path / "docs" / "archive" / "old_r_e_p_o_r_t.md").write_text("o", encoding="utf-8")
+    cfg = load_config()
+    cfg.file_access.allowed_roots = [str(tmp_path)]
+    ctx = SkillContext(config=cfg, project_root=tmp_path, workspace_root=tmp_path)
+
+    result = ToolExecutor().execute("file_search", {"query": "report"}, ctx)
+
+    lines = result.text.splitlines()
+    assert lines[0].startswith("docs/report_2024.md  (score ")
+    assert lines[-1].startswith("docs/archive/old_r_e_p_o_r_t.md")
+
+
+def _make_ignored_tree(root: Path) -> None:
+    (root / ".git" / "objects").mkdir(parents=True)
+    (root / ".git" / "objects" / "report.pack").write_text("x", encoding="utf-8")
+    (root / "node_modules" / "lib").mkdir(parents=True)
+    (root / "node_modules" / "lib" / "report.js").write_text("x", encoding="utf-8")
+    (root / "build").mkdir()
+    (root / "build" / "report.html").write_text("x", encoding="utf-8")
+    (root / "src").mkdir()
+    (root / "src" / "report.py").write_text("x" * 50, encoding="utf-8")
+    (root / "src" / "report.log").write_text("x", encoding="utf-8")
+    (root / "src" / "keep.log").write_text("x", encoding="utf-8")
+    (root / ".gitignore").write_text("build/\n*.log\n", encoding="utf-8")
+    (root / "src" / ".clawignore").write_text("!keep.log\n", encoding="utf-8")
+
+
+def test_index_prunes_ignored_directories_and_honours_negation(tmp_path: Path) -> None:
+    _make_ignored_tree(tmp_path)
+    cfg = load_config()
+    index = WorkspaceIndex(
+        tmp_path, tmp_path / ".index" / "ws.json", 0, cfg.file_access.ignore_dirs, cfg.file_access.ignore_files
+    )
+    index.refresh(force=True)
+
+    assert index.files() == [".gitignore", "src/.clawignore", "src/keep.log", "src/report.py"]
+
+    (tmp_path / ".gitignore").write_text("*.log\n", encoding="utf-8")
+    assert index.refresh()
+    assert "build/report.html" in index.files()
+
+
+def test_index_reapplies_rules_below_a_new_or_replaced_ignore_file(tmp_path: Path) -> None:
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "debug.log").write_text("x", encoding="utf-8")
+    (tmp_path / "sub" / "main.py").write_text("x", encoding="utf-8")
+    index = WorkspaceIndex(tmp_path, tmp_path / ".index" / "ws.json", 0, [], [".gitignore"])
+    index.refresh(force=True)
+    assert "sub/debug.log" in index.files()
+
+    (tmp_path / ".gitignore").write_text("*.log\n", encoding="utf-8")
+    assert index.refresh()
+    assert index.files() == [".gitignore", "sub/main.py"]
+
+    # Editors usually save by writing a temp file and renaming it over the original.
+    (tmp_path / ".gitignore.tmp").write_text("*.py\n", encoding="utf-8")
+    (tmp_path / ".gitignore.tmp").replace(tmp_path / ".gitignore")
+    assert index.refresh()
+    assert index.files() == [".gitignore", "sub/debug.log"]
+
+    (tmp_path / ".gitignore").unlink()
+    assert index.refresh()
+    assert index.files() == ["sub/debug.log", "sub/main.py"]
+
+
+def test_built_index_applies_configured_ignores_and_is_reused(tmp_path: Path) -> None:
+    _make_ignored_tree(tmp_path)
+    cfg = load_config()
+    cfg.file_access.index_root = "./.index"
+    built = build_workspace_index(cfg, tmp_path, tmp_path)
+    built.refresh(force=True)
+    assert built.files() == [".gitignore", "src/.clawignore", "src/keep.log", "src/report.py"]
+
+    shared = get_workspace_index(cfg, tmp_path, tmp_path)
+    assert shared is not None and shared.paths == built.paths
+    assert not shared.refresh()
+
+
+def test_file_search_filters_by_glob_ext_and_size(tmp_path: Path) -> None:
+    _make_ignored_tree(tmp_path)
+    (tmp_path / "src" / "report_notes.md").write_text("x" * 500, encoding="utf-8")
+    cfg = load_config()
+    cfg.file_access.allowed_roots = [str(tmp_path)]
+    ctx = SkillContext(config=cfg, project_root=tmp_path, workspace_root=tmp_path)
+    executor = ToolExecutor()
+
+    def _paths(args: dict) -> list[str]:
+        text = executor.execute("file_search", {"query": "report", **args}, ctx).text
+        return sorted(line.split("  (score")[0] for line in text.splitlines())
+
+    assert _paths({}) == ["src/report.py", "src/report_notes.md"]
+    assert _paths({"ext": ["md"]}) == ["src/report_notes.md"]
+    assert _paths({"glob": "src/*.py"}) == ["src/report.py"]
+    assert _paths({"min_bytes": 100}) == ["src/report_notes.md"]
+    assert _paths({"max_bytes": 100, "modified_within_days": 1}) == ["src/report.py"]
+
+    cfg.file_access.index_enabled = False
+    assert _paths({}) == ["src/report.py", "src/report_notes.md"]